@@ -11,27 +11,71 @@ une liste de mots parasites pour affiner l'analyse SEO.
 Caractéristiques Principales:
 - Entrée d'URL et de mots-clés pour l'audit.
 - Extraction et analyse de contenu HTML d'une page web.
-- Affichage des détails de l'audit incluant les liens internes/externes, le pourcentage d'images avec attribut alt, et les mots-clés.
+- Affichage des détails de l'audit dans un tableau triable (une ligne par page) : liens internes/externes, 
+  pourcentage d'images avec attribut alt, mots-clés, présence des mots-clés de l'utilisateur parmi les 3 premiers
+  et nombre de mots-clés ou expressions ciblés trouvés dans le texte.
 - Fonctionnalité pour sauvegarder le rapport d'audit.
 - Interface pour mettre à jour une liste de mots parasites.
 
 Modules Externes Requis:
 - tkinter : Pour l'interface utilisateur graphique.
-- projet : Contient les classes personnalisées UrlAudit, HtmlAnalyser, et TextAnalyser pour diverses analyses.
+- projet : Contient les classes personnalisées UrlAudit, HtmlAnalyser, PageDocument et TextAnalyser pour diverses analyses.
+- crawler : Exploration du site sur plusieurs niveaux.
+- stockage : Résultats des audits précédents, pour ne pas réanalyser les pages inchangées.
+- registre_parasites : Listes de mots parasites chargées une seule fois en mémoire.
+- corpus (optionnel, NumPy/SciPy) : Classement TF-IDF des mots-clés de toutes les pages du site.
+- cibles : Recherche en une passe des mots-clés et expressions de l'utilisateur dans chaque page.
+- rapports : Rapports d'audit enregistrés page par page dans une base SQLite, relus pour l'historique et exportables.
+- instrumentation : Mesure optionnelle des temps de chaque étape de l'audit et profil cProfile.
 
 Utilisation:
 Exécuter ce script lancera l'application avec Tkinter. L'utilisateur peut interagir avec l'interface graphique pour entrer des données et recevoir des rapports.
 """
 #######################################################################################
 # Import Standard
+import importlib.util
+from operator import itemgetter
 import os
+import queue
+import threading
+import time
 #######################################################################################
 # Import Spécifique
-from projet import UrlAudit, HtmlAnalyser, TextAnalyser
+from cibles import BilanCibles, DetecteurCibles, formater_cibles
+from crawler import Crawler
+import instrumentation
+from projet import UrlAudit, precharger, recuperateur_plusieurs
+from rapports import BaseRapports
+from registre_parasites import registre_partage
+from stockage import MagasinResultats
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 #######################################################################################
 
+# NumPy/SciPy absents : le classement TF-IDF du site est indisponible. Le module corpus
+# n'est importé qu'au lancement d'un audit qui le demande, pour ne pas retarder l'ouverture de la fenêtre.
+TFIDF_DISPONIBLE = all(importlib.util.find_spec(module) for module in ("numpy", "scipy"))
+# Nombre maximal de pages récupérées (analysées seulement, avec le moteur asynchrone) en parallèle.
+NB_WORKERS = 8
+# Intervalle (en ms) entre deux lectures de la file de résultats par la boucle Tk.
+DELAI_SONDAGE_MS = 100
+# Nombre maximal de messages traités à chaque lecture, pour ne pas figer l'interface.
+MESSAGES_PAR_SONDAGE = 2000
+# Nombre de lignes du tableau des résultats : seules les lignes visibles existent dans le widget.
+LIGNES_VISIBLES = 25
+# Intervalle minimal (en ms) entre deux tris du tableau pendant l'analyse.
+DELAI_RAFRAICHISSEMENT_MS = 1000
+# Colonnes du tableau des résultats : clé du résumé de page, titre et largeur en pixels.
+COLONNES_TABLEAU = [
+    ("url", "URL", 360),
+    ("nb_liens_internes", "Liens internes", 100),
+    ("nb_liens_externes", "Liens externes", 100),
+    ("percent_alt", "Alt (%)", 70),
+    ("mots_cles", "Mots-clés", 220),
+    ("presence_mots_cles", "Mots-clés présents", 120),
+    ("nb_cibles_trouvees", "Cibles trouvées", 110),
+]
+
 
 class App:
     """
@@ -50,114 +94,629 @@ class App:
         self.master = master
         master.title("Audit Websites")
         self.menu_bar = tk.Menu(master)
-        file_menu = tk.Menu(self.menu_bar, tearoff=0)
-        file_menu.add_command(label="Mots parasites", command=self.update_badwords)
-        file_menu.add_command(label="Sauvegarder Rapport", command=self.save)
-        self.menu_bar.add_cascade(label="Fichier", menu=file_menu)
+        self.file_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.file_menu.add_command(label="Mots parasites", command=self.update_badwords)
+        self.file_menu.add_command(label="Sauvegarder Rapport", command=self.save)
+        self.file_menu.add_command(label="Historique des audits", command=self.show_history)
+        self.file_menu.add_command(label="Sauvegarder Mesures", command=self.save_measures)
+        self.file_menu.add_command(label="Sauvegarder Profil", command=self.save_profile)
+        self.menu_bar.add_cascade(label="Fichier", menu=self.file_menu)
         self.master.config(menu=self.menu_bar)
         self.label_url = tk.Label(master, text="Entrer l'URL à auditer :")
         self.entry_url = tk.Entry(master)
         self.label_keywords = tk.Label(master, text="Entrer les mots-clés souhaiter pour le SEO :")
         self.entry_keywords = tk.Entry(master)
+        self.label_depth = tk.Label(master, text="Profondeur maximale :")
+        self.spin_depth = tk.Spinbox(master, from_=1, to=10, width=5)
+        self.label_max_pages = tk.Label(master, text="Nombre maximal de pages :")
+        self.spin_max_pages = tk.Spinbox(master, from_=1, to=100000, width=8)
+        self.spin_max_pages.delete(0, tk.END)
+        self.spin_max_pages.insert(0, "500")
+        self.use_cache = tk.BooleanVar(value=True)
+        self.refresh_cache = tk.BooleanVar(value=False)
+        self.use_cache_check = tk.Checkbutton(master, text="Utiliser le cache", variable=self.use_cache)
+        self.refresh_cache_check = tk.Checkbutton(master, text="Forcer le rafraîchissement", variable=self.refresh_cache)
+        self.site_ranking = tk.BooleanVar(value=False)
+        self.site_ranking_check = tk.Checkbutton(master, text="Mots-clés distinctifs du site (TF-IDF)",
+                                                 variable=self.site_ranking,
+                                                 state=tk.NORMAL if TFIDF_DISPONIBLE else tk.DISABLED)
+        self.measure_times = tk.BooleanVar(value=False)
+        self.profile_run = tk.BooleanVar(value=False)
+        self.measure_times_check = tk.Checkbutton(master, text="Mesurer les temps", variable=self.measure_times)
+        self.profile_run_check = tk.Checkbutton(master, text="Profiler l'audit (cProfile)", variable=self.profile_run)
         self.analyse_btn = tk.Button(master, text="Analyser", command=self.analyse)
+        self.cancel_btn = tk.Button(master, text="Annuler", command=self.annuler, state=tk.DISABLED)
+        self.progress_bar = ttk.Progressbar(master, mode="determinate", length=300)
+        self.progress_label = tk.Label(master, text="")
         self.label_url.pack()
         self.entry_url.pack()
         self.label_keywords.pack()
         self.entry_keywords.pack()
+        self.label_depth.pack()
+        self.spin_depth.pack()
+        self.label_max_pages.pack()
+        self.spin_max_pages.pack()
+        self.use_cache_check.pack()
+        self.refresh_cache_check.pack()
+        self.site_ranking_check.pack()
+        self.measure_times_check.pack()
+        self.profile_run_check.pack()
         self.analyse_btn.pack()
+        self.cancel_btn.pack()
+        self.progress_bar.pack()
+        self.progress_label.pack()
+        self.results_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.nb_pages_total = 0
+        self.nb_pages_faites = 0
+        self.nb_echecs = 0
+        self.results_store = None
+        self.reports = None
+        self.current_audit = None
+        # Vrai pendant une analyse : l'historique ne peut pas remplacer le tableau de l'audit en cours.
+        self.running = False
+        self.measures = None
+        # Lignes du tableau (voir ligne_tableau), triées en mémoire ; le widget n'affiche que LIGNES_VISIBLES d'entre elles.
+        self.rows = []
+        # Audit relu depuis l'historique : ses lignes ne sont pas en mémoire, seules les lignes
+        # visibles sont lues dans la base des rapports, déjà triées (voir BaseRapports.pages).
+        self.history_audit = None
+        self.history_count = 0
+        self.first_row = 0
+        self.sort_column = None
+        self.sort_reverse = False
+        self.sort_pending = False
+        self.last_sort = 0
         self.second_frame = tk.Frame(master)
         self.details_label = tk.Label(self.second_frame, text="Détails de l'audit :")
-        self.details_text = tk.Text(self.second_frame)
+        self.table_frame = tk.Frame(self.second_frame)
+        self.table = ttk.Treeview(self.table_frame, columns=[key for key, _, _ in COLONNES_TABLEAU],
+                                  show="headings", height=LIGNES_VISIBLES)
+        for index, (key, title, width) in enumerate(COLONNES_TABLEAU):
+            self.table.heading(key, text=title, command=lambda index=index: self.trier(index))
+            self.table.column(key, width=width, stretch=key in ("url", "mots_cles"))
+        # La barre de défilement parcourt self.rows et non le widget, qui ne contient que les lignes visibles.
+        self.table_scrollbar = ttk.Scrollbar(self.table_frame, orient=tk.VERTICAL, command=self.defiler)
+        self.table.bind("<MouseWheel>", self.molette)
+        self.table.bind("<Button-4>", self.molette)
+        self.table.bind("<Button-5>", self.molette)
+        self.view_label = tk.Label(self.second_frame, text="")
+        self.sections_text = tk.Text(self.second_frame, height=8)
         self.details_label.pack()
-        self.details_text.pack(fill=tk.BOTH, expand=True)
+        self.table.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.table_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.table_frame.pack(fill=tk.X)
+        self.view_label.pack()
+        self.sections_text.pack(fill=tk.BOTH, expand=True)
 
 
     def analyse(self):
         """
         Lance l'analyse de l'URL saisie par l'utilisateur. 
-        Récupère le HTML de l'URL, extrait les liens internes et externes, 
-        et affiche des détails comme le pourcentage d'images avec un attribut alt, 
-        et la présence de mots-clés définis par l'utilisateur.
+        La récupération et l'analyse des pages se font en arrière-plan : 
+        chaque page est enregistrée dans la base des rapports et signalée à l'interface 
+        par une file lue périodiquement avec after(), pour que la fenêtre reste réactive.
         """
-        try:
-            self.details_text.delete("1.0", tk.END)
-        except:
-            pass
         url = self.entry_url.get()
         user_keywords = set(self.entry_keywords.get().lower().split(','))
         try:
-            html_main = UrlAudit.recuperer_html(url)
-        except Exception as e:
-            messagebox.showerror(f"Erreur", "Impossible de se connecter à la page demandée {url} \n Erreur :{e}")
+            crawl_options = {
+                "profondeur_max": int(self.spin_depth.get()),
+                "nb_pages_max": int(self.spin_max_pages.get()),
+                "tfidf": self.site_ranking.get(),
+            }
+        except ValueError:
+            messagebox.showerror("Erreur", "La profondeur et le nombre de pages doivent être des nombres entiers")
             return
-        domain = UrlAudit.extraire_nom_domaine(url)
-        links_main = HtmlAnalyser.extraire_attributs(html_main, 'a', 'href')
-        internal_links, external_links = UrlAudit.classifier_par_domaine(domain, links_main)
-        badwords = TextAnalyser.recuperer_parasites("parasites.csv")
-        for link in internal_links:
-            try:
-                html = UrlAudit.recuperer_html(link)
-            except Exception as e:
-                print(f"Impossible de se connecter à la page {e}")
-                continue
-            html_cleaned = HtmlAnalyser.nettoyer_html(html)
-            occurrences = TextAnalyser.compter_occurrences(html_cleaned)
-            found_keywords = TextAnalyser.retirer_parasites(occurrences, badwords)
-            self.affichage_details(url=link, user_keywords=user_keywords, keywords=found_keywords, html=html)
+        cache_options = {"utiliser_cache": self.use_cache.get(), "rafraichir": self.refresh_cache.get()}
+        measure_options = {"mesures": self.measure_times.get() or self.profile_run.get(), "profil": self.profile_run.get()}
+        if self.results_store is None:
+            self.results_store = MagasinResultats()
+        if self.reports is None:
+            self.reports = BaseRapports()
+        self.current_audit = self.reports.nouvel_audit(url, user_keywords)
+        self.history_audit = None
+        self.rows = []
+        self.first_row = 0
+        self.sections_text.delete("1.0", tk.END)
+        self.afficher_lignes()
+        # Une file et un évènement neufs par analyse : une analyse annulée
+        # qui termine en retard ne peut pas écrire dans le rapport suivant.
+        self.results_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.nb_pages_total = 0
+        self.nb_pages_faites = 0
+        self.nb_echecs = 0
+        self.progress_bar.config(value=0, maximum=1)
+        self.progress_label.config(text="Récupération de la page principale...")
+        self.running = True
+        self.analyse_btn.config(state=tk.DISABLED)
+        self.file_menu.entryconfig("Historique des audits", state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
         self.second_frame.pack(fill=tk.BOTH, expand=True)
+        thread = threading.Thread(
+            target=self.auditer_site,
+            args=(url, user_keywords, crawl_options, cache_options, measure_options, self.current_audit,
+                  self.results_queue, self.cancel_event),
+            daemon=True
+        )
+        thread.start()
+        self.master.after(DELAI_SONDAGE_MS, self.sonder_resultats, self.results_queue)
 
 
-    def affichage_details(self, url, user_keywords, keywords, html):
+    def auditer_site(self, url, user_keywords, crawl_options, cache_options, measure_options, audit,
+                     results_queue, cancel_event):
         """
-        Affiche les détails de l'audit pour une URL spécifique.
+        Explore le site à partir de la page principale (voir crawler.Crawler) et audite 
+        chaque page interne trouvée avec un pool borné de threads. Le résumé de chaque page 
+        est enregistré dans la base des rapports et transmis au tableau dès qu'il est produit. Exécutée hors de la 
+        boucle Tk : ne touche à aucun widget et communique uniquement par la file de résultats.
+        Une erreur est signalée par un message "erreur" ; le message "fin" est toujours envoyé.
 
         Args:
-            url (str): L'URL de la page analysée.
-            user_keywords (list): Ensemble de mots-clés fournis par l'utilisateur.
-            keywords (list): Mots-clés trouvés dans la page.
-            html (str): Le contenu HTML de la page.
-        """
-        percent_alt_img = HtmlAnalyser.percent_attributs(html, 'img', 'alt')
-        links = HtmlAnalyser.extraire_attributs(html, 'a', 'href')
-        sub_internal_links, sub_external_links = UrlAudit.classifier_par_domaine(url, links)
-        nb_internal_links = len(sub_internal_links)
-        nb_external_links = len(sub_external_links)
-        three_first_keywords = list(keywords.keys())[:3]
-        user_keywords_in_page = any([word in three_first_keywords for word in user_keywords])
-        details = (
-            f"Détails pour l'URL : {url}\n"
-            f"Nombre de liens internes : {nb_internal_links}\n"
-            f"Nombre de liens externes : {nb_external_links}\n"
-            f"Pourcentage d'images avec attribut alt : {percent_alt_img} %\n"
-            f"Les 3 premiers mots-clés : {', '.join(three_first_keywords)}\n"
-            f"Présence de mots-clés : {'Oui' if user_keywords_in_page else 'Non'}\n"
+            url (str): L'URL de la page principale.
+            user_keywords (set): Ensemble de mots-clés fournis par l'utilisateur.
+            crawl_options (dict): Profondeur et nombre de pages maximaux de l'exploration, 
+                et si le classement TF-IDF du site doit être calculé à la fin.
+            cache_options (dict): Options de cache transmises à UrlAudit.recuperer_page.
+            measure_options (dict): Si les temps de chaque étape sont mesurés, et si l'audit est profilé.
+            audit (int): L'identifiant de l'audit dans la base des rapports.
+            results_queue (queue.Queue): File où sont déposés les messages pour l'interface.
+            cancel_event (threading.Event): Évènement positionné lorsque l'utilisateur annule.
+        """
+        try:
+            badwords = registre_partage().mots()
+            badwords_print = MagasinResultats.empreinte_parasites(badwords)
+            corpus = None
+            if crawl_options["tfidf"]:
+                from corpus import CorpusSite
+                corpus = CorpusSite(badwords)
+            # Les mots-clés (et expressions) de l'utilisateur sont recherchés dans tout le texte de chaque page.
+            detector = DetecteurCibles(user_keywords)
+            if not detector.cibles:
+                detector = None
+            keywords_report = BilanCibles(detector.cibles) if detector is not None else None
+            # Pages internes en échec (list.append est sûr entre threads), listées à la fin du rapport.
+            failures = []
+            # La page principale n'est pas comptée dans le rapport : seules ses pages internes le sont.
+            crawler = Crawler(
+                profondeur_max=crawl_options["profondeur_max"],
+                nb_pages_max=crawl_options["nb_pages_max"] + 1,
+                nb_workers=NB_WORKERS,
+                recuperer=lambda link: UrlAudit.recuperer_page(link, **cache_options),
+                annulation=cancel_event,
+                recuperer_plusieurs=recuperateur_plusieurs(**cache_options)
             )
-        self.details_text.insert(tk.END, details + "\n\n")
+
+            def traiter(link, html, depth):
+                result = UrlAudit.analyser_html(link, html, badwords, magasin=self.results_store,
+                                                empreinte_parasites=badwords_print,
+                                                reutiliser=not cache_options["rafraichir"], detecteur=detector)
+                if depth > 0:
+                    summary = UrlAudit.resumer_page(result, user_keywords)
+                    if keywords_report is not None:
+                        keywords_report.ajouter(summary["cibles"])
+                    self.reports.ajouter_page(audit, summary, depth)
+                    results_queue.put(("page", self.ligne_tableau(summary)))
+                    if corpus is not None:
+                        corpus.ajouter(link, result["occurrences"])
+                return result["liens"]
+
+            def echec(link, depth, error):
+                if depth == 0:
+                    results_queue.put(("erreur", f"Impossible de se connecter à la page demandée {link} \n Erreur :{error}"))
+                else:
+                    failures.append((link, depth, error))
+                    results_queue.put(("echec", link))
+
+            def progression(depth, nb_pages):
+                if depth > 0:
+                    results_queue.put(("total", nb_pages))
+
+            if measure_options["mesures"]:
+                instrumentation.activer(profil=measure_options["profil"])
+            try:
+                crawler.parcourir(url, traiter, echec=echec, progression=progression)
+            finally:
+                measures = instrumentation.desactiver()
+            if failures:
+                self.reports.ajouter_section(audit, "Échecs", self.construire_echecs(failures))
+            if keywords_report is not None and keywords_report.nb_pages:
+                self.reports.ajouter_section(audit, "Mots-clés ciblés", keywords_report.rapport())
+            if corpus is not None and corpus.urls and not cancel_event.is_set():
+                self.reports.ajouter_section(audit, "Mots-clés distinctifs du site (TF-IDF)",
+                                             self.construire_classement(corpus))
+            if measures is not None:
+                self.reports.ajouter_section(audit, "Mesures", measures.rapport())
+                results_queue.put(("mesures", measures))
+            self.reports.terminer_audit(audit, "annulé" if cancel_event.is_set() else "terminé")
+        except Exception as error:
+            # Une erreur imprévue (base des rapports, classement...) ne doit pas laisser
+            # l'interface bloquée : elle est signalée puis l'analyse est terminée.
+            results_queue.put(("erreur", f"L'analyse a été interrompue par une erreur :\n{error}"))
+            try:
+                self.reports.terminer_audit(audit, "échec")
+            except Exception:
+                pass
+        finally:
+            results_queue.put(("fin", None))
+
+
+    def sonder_resultats(self, results_queue):
+        """
+        Lit les messages déposés par les threads d'analyse et met à jour l'interface.
+        Les pages reçues sont ajoutées au tableau par lots ; pendant l'analyse, le tableau 
+        est retrié au plus une fois par DELAI_RAFRAICHISSEMENT_MS.
+        Se reprogramme avec after() tant que l'analyse n'est pas terminée.
+
+        :param results_queue: La file de résultats de l'analyse en cours.
+        """
+        nb_rows = len(self.rows)
+        for _ in range(MESSAGES_PAR_SONDAGE):
+            try:
+                kind, content = results_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "total":
+                self.nb_pages_total += content
+                self.progress_bar.config(maximum=max(self.nb_pages_total, 1))
+            elif kind == "page":
+                self.nb_pages_faites += 1
+                self.rows.append(content)
+            elif kind == "echec":
+                self.nb_pages_faites += 1
+                self.nb_echecs += 1
+            elif kind == "mesures":
+                self.measures = content
+            elif kind == "erreur":
+                messagebox.showerror("Erreur", content)
+            elif kind == "fin":
+                self.fin_analyse()
+                return
+        self.progress_bar.config(value=self.nb_pages_faites)
+        if self.nb_pages_total:
+            self.progress_label.config(text=f"{self.nb_pages_faites} / {self.nb_pages_total} pages analysées"
+                                            f"{self.texte_echecs()}")
+        if len(self.rows) > nb_rows:
+            self.sort_pending = self.sort_column is not None
+            if self.sort_pending and (time.monotonic() - self.last_sort) * 1000 >= DELAI_RAFRAICHISSEMENT_MS:
+                self.trier_lignes()
+            self.afficher_lignes()
+        self.master.after(DELAI_SONDAGE_MS, self.sonder_resultats, results_queue)
+
+
+    def fin_analyse(self):
+        """
+        Remet l'interface dans son état initial une fois l'analyse terminée ou annulée.
+        """
+        self.progress_bar.config(value=self.nb_pages_faites)
+        state = "annulée" if self.cancel_event.is_set() else "terminée"
+        self.progress_label.config(text=f"Analyse {state} : {self.nb_pages_faites} / {self.nb_pages_total} pages analysées"
+                                        f"{self.texte_echecs()}")
+        self.running = False
+        self.analyse_btn.config(state=tk.NORMAL)
+        self.file_menu.entryconfig("Historique des audits", state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        if self.sort_pending:
+            self.trier_lignes()
+        self.afficher_lignes()
+        self.afficher_sections()
+
+
+    def texte_echecs(self):
+        """
+        Returns:
+            str: Le nombre de pages en échec de l'analyse en cours, à ajouter à la progression (vide sans échec).
+        """
+        return f", dont {self.nb_echecs} en échec (voir la section Échecs)" if self.nb_echecs else ""
+
+
+    def annuler(self):
+        """
+        Demande l'arrêt de l'analyse en cours. Les pages déjà en cours de 
+        récupération se terminent, les autres ne sont pas lancées.
+        """
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.progress_label.config(text="Annulation en cours...")
+
+
+    @staticmethod
+    def construire_details(summary):
+        """
+        Construit le bloc de détails de l'audit pour une URL spécifique.
+
+        Args:
+            summary (dict): Le résumé de la page, produit par UrlAudit.resumer_page
+                ou relu dans la base des rapports.
+
+        Returns:
+            str: Le bloc de détails à afficher dans le rapport.
+        """
+        return (
+            f"Détails pour l'URL : {summary['url']}\n"
+            f"Nombre de liens internes : {summary['nb_liens_internes']}\n"
+            f"Nombre de liens externes : {summary['nb_liens_externes']}\n"
+            f"Pourcentage d'images avec attribut alt : {summary['percent_alt']} %\n"
+            f"Les 3 premiers mots-clés : {', '.join(summary['mots_cles'])}\n"
+            f"Présence de mots-clés : {'Oui' if summary['presence_mots_cles'] else 'Non'}\n"
+            + (f"Cibles : {formater_cibles(summary['cibles'])}\n" if summary["cibles"] else "")
+            )
+
+
+    @staticmethod
+    def construire_classement(corpus):
+        """
+        Construit la section du rapport listant les mots-clés distinctifs (TF-IDF) de chaque page.
+
+        Args:
+            corpus (CorpusSite): Les occurrences de toutes les pages auditées.
+
+        Returns:
+            str: La section à afficher à la fin du rapport.
+        """
+        lines = ["Mots-clés distinctifs du site (TF-IDF) :"]
+        for url, terms in corpus.meilleurs_termes(3).items():
+            lines.append(f"{url} : {', '.join(term for term, _ in terms)}")
+        return "\n".join(lines) + "\n"
+
+
+    @staticmethod
+    def construire_echecs(failures):
+        """
+        Construit la section du rapport listant les pages qui n'ont pas pu être récupérées ou analysées.
+
+        Args:
+            failures (list): Les échecs de l'audit, sous forme de triplets (url, profondeur, erreur).
+
+        Returns:
+            str: La section à afficher à la fin du rapport.
+        """
+        lines = [f"Pages en échec ({len(failures)}) :"]
+        for url, depth, error in failures:
+            lines.append(f"{url} (niveau {depth}) : {error}")
+        return "\n".join(lines) + "\n"
+
+
+    @staticmethod
+    def ligne_tableau(summary):
+        """
+        Construit la ligne du tableau des résultats d'une page.
+
+        Args:
+            summary (dict): Le résumé de la page, produit par UrlAudit.resumer_page
+                ou relu dans la base des rapports.
+
+        Returns:
+            tuple: Les valeurs des COLONNES_TABLEAU, non formatées pour pouvoir être triées.
+        """
+        return (summary["url"], summary["nb_liens_internes"], summary["nb_liens_externes"],
+                summary["percent_alt"], ", ".join(summary["mots_cles"]), bool(summary["presence_mots_cles"]),
+                summary["nb_cibles_trouvees"] or 0)
+
+
+    def afficher_lignes(self):
+        """
+        Affiche dans le tableau les LIGNES_VISIBLES lignes à partir de first_row : 
+        le widget ne contient jamais plus de lignes que celles qui sont visibles, 
+        quel que soit le nombre de pages du rapport.
+        """
+        total = self.nb_lignes()
+        self.first_row = max(0, min(self.first_row, total - LIGNES_VISIBLES))
+        last = min(self.first_row + LIGNES_VISIBLES, total)
+        self.table.delete(*self.table.get_children())
+        for row in self.lignes(self.first_row, last):
+            self.table.insert("", tk.END, values=row[:5] + ("Oui" if row[5] else "Non",) + row[6:])
+        if total:
+            self.table_scrollbar.set(self.first_row / total, last / total)
+        else:
+            self.table_scrollbar.set(0, 1)
+        self.view_label.config(text=f"Pages {min(self.first_row + 1, total)} à {last} sur {total}")
+
+
+    def nb_lignes(self):
+        """
+        :return: Le nombre de lignes du tableau, en mémoire ou dans l'audit relu depuis l'historique.
+        """
+        return self.history_count if self.history_audit is not None else len(self.rows)
+
+
+    def lignes(self, first, last):
+        """
+        Retourne les lignes du tableau d'indices first à last (exclu), dans l'ordre de tri choisi. 
+        Pour un audit relu depuis l'historique, seules ces lignes sont lues dans la base des rapports.
+
+        :param first: L'indice de la première ligne.
+        :param last: L'indice qui suit la dernière ligne.
+        :return: Les lignes (voir ligne_tableau).
+        """
+        if self.history_audit is None:
+            return self.rows[first:last]
+        column = COLONNES_TABLEAU[self.sort_column][0] if self.sort_column is not None else None
+        summaries = self.reports.pages(self.history_audit, first, last - first, tri=column,
+                                       decroissant=self.sort_reverse)
+        return [self.ligne_tableau(summary) for summary in summaries]
+
+
+    def defiler(self, action, amount, unit=None):
+        """
+        Fait défiler le tableau ; appelée par la barre de défilement.
+
+        :param action: "moveto" (amount est alors la position, entre 0 et 1) ou "scroll".
+        :param amount: La position ou le nombre d'unités de défilement.
+        :param unit: "units" (une ligne) ou "pages" (LIGNES_VISIBLES lignes).
+        """
+        if action == "moveto":
+            self.first_row = int(float(amount) * self.nb_lignes())
+        else:
+            self.first_row += int(amount) * (LIGNES_VISIBLES if unit == "pages" else 1)
+        self.afficher_lignes()
+
+
+    def molette(self, event):
+        """
+        Fait défiler le tableau avec la molette de la souris.
+
+        :param event: L'évènement MouseWheel (Windows, macOS) ou Button-4/5 (X11).
+        """
+        direction = -1 if event.num == 4 or event.delta > 0 else 1
+        self.defiler("scroll", 3 * direction, "units")
+        return "break"
+
+
+    def trier(self, column):
+        """
+        Trie le tableau sur une colonne ; un second clic sur la même colonne inverse l'ordre.
+
+        :param column: L'indice de la colonne dans COLONNES_TABLEAU.
+        """
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = column, False
+        for index, (key, title, _) in enumerate(COLONNES_TABLEAU):
+            arrow = (" ▼" if self.sort_reverse else " ▲") if index == column else ""
+            self.table.heading(key, text=title + arrow)
+        self.trier_lignes()
+        self.first_row = 0
+        self.afficher_lignes()
+
+
+    def trier_lignes(self):
+        """
+        Trie les lignes en mémoire selon la colonne choisie, sans relire le widget. 
+        Le tri est stable et les pages reçues depuis le dernier tri sont à la fin : 
+        le retri pendant l'analyse reste rapide. Un audit relu depuis l'historique est trié
+        par la base des rapports à chaque lecture (voir lignes).
+        """
+        self.rows.sort(key=itemgetter(self.sort_column), reverse=self.sort_reverse)
+        self.sort_pending = False
+        self.last_sort = time.monotonic()
+
+
+    def afficher_sections(self):
+        """
+        Affiche sous le tableau les sections de fin d'audit (échecs, TF-IDF, mesures) de l'audit affiché.
+        """
+        self.sections_text.delete("1.0", tk.END)
+        for _, content in self.reports.sections(self.current_audit):
+            self.sections_text.insert(tk.END, content + "\n\n")
+
+
+    def show_history(self):
+        """
+        Ouvre la liste des audits enregistrés dans la base des rapports ;
+        un double-clic charge le rapport de l'audit choisi dans le tableau.
+        Indisponible pendant une analyse, dont le tableau et les sections seraient remplacés.
+        """
+        if self.reports is None:
+            self.reports = BaseRapports()
+        audits = self.reports.audits()
+        history_window = tk.Toplevel(self.master)
+        history_window.title("Historique des audits")
+        listbox = tk.Listbox(history_window, width=90, height=15)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for audit in audits:
+            date = time.strftime("%Y-%m-%d %H:%M", time.localtime(audit["debut"]))
+            listbox.insert(tk.END, f"{date}  {audit['url_depart']}  ({audit['nb_pages']} pages, {audit['statut']})")
+
+        def open_audit(event):
+            selection = listbox.curselection()
+            if not selection:
+                return
+            # Fenêtre ouverte avant le lancement d'une analyse : l'audit en cours garde le tableau.
+            if self.running:
+                messagebox.showerror("Erreur", "Impossible d'ouvrir un audit pendant une analyse")
+                return
+            audit = audits[selection[0]]
+            self.current_audit = audit["id"]
+            self.history_audit = audit["id"]
+            self.history_count = self.reports.compter_pages(audit["id"])
+            self.rows = []
+            self.first_row = 0
+            self.second_frame.pack(fill=tk.BOTH, expand=True)
+            self.afficher_lignes()
+            self.afficher_sections()
+            history_window.destroy()
+
+        listbox.bind("<Double-Button-1>", open_audit)
 
 
     def save(self):
         """
-        Sauvegarde le rapport d'audit dans un fichier texte. 
+        Sauvegarde le rapport d'audit affiché, au format choisi d'après l'extension du fichier
+        (texte, CSV, JSON ou HTML). Les pages sont relues au fil de la base des rapports.
         Permet à l'utilisateur de choisir l'emplacement et le nom du fichier.
         """
-        if len(self.details_text.get("1.0", tk.END)) == 1:
+        if self.current_audit is None or not self.reports.compter_pages(self.current_audit):
             messagebox.showerror("Erreur", "Aucun rapport d'audit n'est disponible pour sauvegarde")
             return
         filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text file", ".txt"), ("All Files", ".*")],
+            filetypes=[("Text file", ".txt"), ("CSV file", ".csv"), ("JSON file", ".json"),
+                       ("HTML file", ".html"), ("All Files", ".*")],
             initialdir=os.getcwd(),
             title="Sauvegarder le rapport d'audit"
         )
 
         if not filename:
             return
-        with open(filename, 'w') as file:
-            report_content = self.details_text.get("1.0", tk.END)
-            file.write(report_content)
+        extension = os.path.splitext(filename)[1].lower()
+        with open(filename, 'w', encoding='utf-8', newline='') as file:
+            if extension == ".csv":
+                self.reports.exporter_csv(self.current_audit, file)
+            elif extension == ".json":
+                self.reports.exporter_json(self.current_audit, file)
+            elif extension in (".html", ".htm"):
+                self.reports.exporter_html(self.current_audit, file)
+            else:
+                for summary in self.reports.parcourir_pages(self.current_audit):
+                    file.write(self.construire_details(summary) + "\n\n")
+                for _, content in self.reports.sections(self.current_audit):
+                    file.write(content + "\n\n")
         messagebox.showinfo("Sauvegarde", "Le rapport a été sauvegardé avec succès !")
 
 
+    def save_measures(self):
+        """
+        Sauvegarde les mesures de temps de la dernière analyse au format JSON.
+        """
+        if self.measures is None:
+            messagebox.showerror("Erreur", "Aucune mesure n'est disponible : cocher « Mesurer les temps » avant l'analyse")
+            return
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON file", ".json"), ("All Files", ".*")],
+            initialdir=os.getcwd(),
+            title="Sauvegarder les mesures"
+        )
+        if not filename:
+            return
+        self.measures.ecrire_json(filename)
+        messagebox.showinfo("Sauvegarde", "Les mesures ont été sauvegardées avec succès !")
+
+
+    def save_profile(self):
+        """
+        Sauvegarde le profil cProfile de la dernière analyse (lisible avec pstats ou snakeviz).
+        """
+        if self.measures is None or not self.measures.profil:
+            messagebox.showerror("Erreur", "Aucun profil n'est disponible : cocher « Profiler l'audit » avant l'analyse")
+            return
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".prof",
+            filetypes=[("Profil cProfile", ".prof"), ("All Files", ".*")],
+            initialdir=os.getcwd(),
+            title="Sauvegarder le profil"
+        )
+        if not filename:
+            return
+        if not self.measures.ecrire_profil(filename):
+            messagebox.showerror("Erreur", "Aucune page n'a été profilée")
+            return
+        messagebox.showinfo("Sauvegarde", "Le profil a été sauvegardé avec succès !")
+
+
     def update_badwords(self):
         """
         Permet à l'utilisateur de mettre à jour la liste des mots parasites. 
@@ -166,7 +725,7 @@ class App:
         edit_window = tk.Toplevel(self.master)
         edit_window.title("Mise à jour des Mots parasites")
         try:
-            with open("parasites.csv", 'r') as f:
+            with open(registre_partage().chemin("parasites"), 'r', encoding='utf-8') as f:
                 current_badwords = f.read().splitlines()
         except FileNotFoundError:
             messagebox.showerror("Erreur", "Le fichier parasites.csv est introuvable")
@@ -181,15 +740,14 @@ class App:
 
     def save_badwords(self, edit_text, edit_window):
         """
-        Sauvegarde la liste mise à jour des mots parasites dans un fichier.
+        Sauvegarde la liste mise à jour des mots parasites dans son fichier 
+        et met à jour le registre en mémoire, sans relecture du disque.
 
         :param edit_text: Le widget Text contenant la liste mise à jour.
         :param edit_window: La fenêtre d'édition où la liste est modifiée.
         """
         updated_badwords = edit_text.get("1.0", tk.END).strip().split("\n")
-        with open("parasites.csv", 'w') as f:
-            for word in updated_badwords:
-                f.write(word + "\n")
+        registre_partage().mettre_a_jour("parasites", updated_badwords)
         edit_window.destroy()
         messagebox.showinfo("Sauvegarde", "Les mots parasites ont été sauvegardés avec succès !")
 
@@ -197,4 +755,6 @@ class App:
 if __name__ == "__main__":
     root = tk.Tk()
     app = App(root)
+    # requests, BeautifulSoup et le moteur de récupération sont chargés pendant que la fenêtre s'affiche.
+    threading.Thread(target=precharger, name="prechargement", daemon=True).start()
     root.mainloop()
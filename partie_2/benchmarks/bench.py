@@ -0,0 +1,322 @@
+"""
+Benchmarks des analyses de texte, de HTML et de l'exploration d'un site.
+
+Pour chaque scénario de page synthétique (voir generateurs), mesure le temps et le pic
+de mémoire de TextAnalyser.compter_occurrences, TextAnalyser.retirer_parasites,
+HtmlAnalyser.nettoyer_html, HtmlAnalyser.extraire_attributs et HtmlAnalyser.percent_attributs,
+puis explore un site généré, servi en local (voir serveur), comme appui.App.analyse.
+Mesure aussi le temps d'import des modules de l'application dans un interpréteur neuf
+(python -X importtime), et les dépendances externes que chacun charge.
+
+Les résultats sont enregistrés en JSON ; --comparer signale les régressions par rapport
+à un enregistrement précédent.
+
+Exemples :
+    python benchmarks/bench.py --sortie avant.json
+    python benchmarks/bench.py --scenarios 1M,10M --comparer avant.json
+    python benchmarks/bench.py --scenarios "" --pages 0 --imports projet,appui
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+DOSSIER_APPLICATION = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DOSSIER_APPLICATION)
+from crawler import Crawler
+from generateurs import MOTS_PARASITES, generer_page, generer_site
+from projet import HtmlAnalyser, TextAnalyser, UrlAudit
+from registre_parasites import registre_partage
+from serveur import ServeurSite
+###################################################################
+
+# Scénarios de pages : taille du texte, nombre de liens, nombre d'images.
+SCENARIOS = {
+    "10k": (10_000, 100, 50),
+    "100k": (100_000, 1_000, 500),
+    "1M": (1_000_000, 10_000, 2_000),
+    "10M": (10_000_000, 20_000, 10_000),
+}
+SCENARIOS_PAR_DEFAUT = "10k,100k,1M"
+REPETITIONS = 5
+# Au-delà de cette durée cumulée (en secondes), une mesure n'est plus répétée.
+DUREE_MAX = 5
+# Modules de l'application dont le temps d'import est mesuré.
+IMPORTS_PAR_DEFAUT = "texte,urls,liens,projet,crawler,cli,appui,distribue"
+# Dépendances externes dont le chargement à l'import est signalé.
+MODULES_LOURDS = ["requests", "bs4", "lxml", "aiohttp", "numpy", "scipy"]
+# Ralentissement (temps mesuré / temps de référence) à partir duquel une mesure est une régression.
+SEUIL_REGRESSION = 1.10
+
+
+def mesurer(fonction, repetitions=REPETITIONS, duree_max=DUREE_MAX):
+    """
+    Mesure le temps d'exécution et le pic de mémoire d'une fonction sans argument.
+    Le temps est mesuré sans tracemalloc, qui ralentit fortement les allocations ;
+    le pic de mémoire est mesuré lors d'une exécution supplémentaire.
+
+    Args:
+        fonction (callable): La fonction à mesurer.
+        repetitions (int): Le nombre maximal d'exécutions chronométrées.
+        duree_max (float): La durée cumulée au-delà de laquelle les exécutions s'arrêtent.
+
+    Returns:
+        dict: Le nombre d'exécutions, les temps minimal et moyen (secondes) et le pic de mémoire (octets).
+    """
+    temps = []
+    while len(temps) < repetitions and sum(temps) < duree_max:
+        debut = time.perf_counter()
+        fonction()
+        temps.append(time.perf_counter() - debut)
+    tracemalloc.start()
+    try:
+        fonction()
+        pic = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "repetitions": len(temps),
+        "temps_min": min(temps),
+        "temps_moyen": sum(temps) / len(temps),
+        "pic_memoire": pic,
+    }
+
+
+def benchmarks_page(nom, taille_texte, nb_liens, nb_images, parasites, repetitions):
+    """
+    Mesure les analyses de texte et de HTML sur une page synthétique.
+
+    Args:
+        nom (str): Le nom du scénario.
+        taille_texte (int): La taille du texte de la page, en caractères.
+        nb_liens (int): Le nombre de liens de la page.
+        nb_images (int): Le nombre d'images de la page.
+        parasites (set): Les mots parasites.
+        repetitions (int): Le nombre maximal d'exécutions de chaque mesure.
+
+    Returns:
+        list: Un résultat par fonction mesurée.
+    """
+    html = generer_page(taille_texte, nb_liens, nb_images)
+    texte = HtmlAnalyser.nettoyer_html(html)
+    occurrences = TextAnalyser.compter_occurrences(texte)
+    octets_html = len(html.encode("utf-8"))
+    octets_texte = len(texte.encode("utf-8"))
+    mesures = [
+        ("compter_occurrences", octets_texte, lambda: TextAnalyser.compter_occurrences(texte)),
+        ("retirer_parasites", len(occurrences), lambda: TextAnalyser.retirer_parasites(occurrences, parasites)),
+        ("nettoyer_html", octets_html, lambda: HtmlAnalyser.nettoyer_html(html)),
+        ("extraire_attributs", octets_html, lambda: HtmlAnalyser.extraire_attributs(html, "a", "href")),
+        ("percent_attributs", octets_html, lambda: HtmlAnalyser.percent_attributs(html, "img", "alt")),
+    ]
+    resultats = []
+    for fonction, taille, appel in mesures:
+        resultat = {"nom": fonction, "scenario": nom, "taille": taille}
+        resultat.update(mesurer(appel, repetitions))
+        # La taille de retirer_parasites est un nombre de mots distincts, pas d'octets.
+        unite = "mots/s" if fonction == "retirer_parasites" else "Mo/s"
+        diviseur = 1 if fonction == "retirer_parasites" else 1_000_000
+        resultat["debit"] = taille / diviseur / resultat["temps_min"]
+        resultat["unite"] = unite
+        resultats.append(resultat)
+        print(f"{nom:>5} {fonction:<20} {resultat['temps_min'] * 1000:10.2f} ms "
+              f"{resultat['debit']:12.2f} {unite:<6} {resultat['pic_memoire'] / 1_000_000:8.2f} Mo", file=sys.stderr)
+    return resultats
+
+
+def benchmark_exploration(nb_pages, liens_par_page, latence, nb_workers, debit, parasites):
+    """
+    Explore un site généré servi en local, comme appui.App.analyse : récupération des pages
+    par le Crawler et analyse de chaque page par UrlAudit.analyser_html, sans cache.
+
+    Args:
+        nb_pages (int): Le nombre de pages du site.
+        liens_par_page (int): Le nombre de pages filles de chaque page.
+        latence (float): La latence du serveur, en secondes.
+        nb_workers (int): Le nombre de pages récupérées en parallèle.
+        debit (float): Le débit maximal par hôte (None pour ne pas limiter).
+        parasites (set): Les mots parasites.
+
+    Returns:
+        dict: Le temps d'exploration, le nombre de pages analysées par seconde (pages en échec exclues)
+            et le pic de mémoire.
+    """
+    # Import local : le banc d'essai lui-même ne charge requests que pour l'exploration.
+    import reseau
+    site = generer_site(nb_pages, liens_par_page)
+    reseau.configurer(cache=None)
+    profondeur_max = nb_pages  # largement suffisant pour atteindre toutes les pages
+    with ServeurSite(site, latence) as serveur:
+        def explorer():
+            # Une page de plus pour le lien de navigation /contact, absent du site (404).
+            crawler = Crawler(profondeur_max=profondeur_max, nb_pages_max=nb_pages + 1, nb_workers=nb_workers,
+                              requetes_par_seconde=debit,
+                              recuperer=lambda url: UrlAudit.recuperer_page(url, utiliser_cache=False))
+            pages = []
+            echecs = []
+
+            def traiter(url, html, profondeur):
+                pages.append(url)
+                return UrlAudit.analyser_html(url, html, parasites)["liens"]
+
+            # Les pages en échec (/contact) ne comptent pas dans le débit : seules les pages analysées sont comptées.
+            crawler.parcourir(serveur.url, traiter, echec=lambda url, profondeur, erreur: echecs.append(url))
+            if len(pages) != nb_pages:
+                raise RuntimeError(f"{len(pages)} pages analysées sur {nb_pages} ({len(echecs)} en échec)")
+
+        resultat = {"nom": "exploration", "scenario": f"{nb_pages}p-{latence * 1000:g}ms", "taille": nb_pages}
+        resultat.update(mesurer(explorer, repetitions=1))
+    resultat["debit"] = nb_pages / resultat["temps_min"]
+    resultat["unite"] = "pages analysées/s"
+    print(f"exploration de {nb_pages} pages {resultat['temps_min']:10.2f} s {resultat['debit']:10.2f} pages analysées/s "
+          f"{resultat['pic_memoire'] / 1_000_000:8.2f} Mo", file=sys.stderr)
+    return resultat
+
+
+def benchmark_import(module, repetitions):
+    """
+    Mesure le temps d'import d'un module de l'application dans un interpréteur neuf, avec
+    python -X importtime : chaque exécution part d'un interpréteur sans aucun module importé.
+
+    Args:
+        module (str): Le nom du module.
+        repetitions (int): Le nombre d'exécutions.
+
+    Returns:
+        dict: Les temps minimal et moyen de l'import (secondes, cumul des sous-modules)
+            et les dépendances externes chargées par l'import.
+    """
+    temps = []
+    charges = set()
+    for _ in range(repetitions):
+        execution = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=DOSSIER_APPLICATION, capture_output=True, text=True, check=True)
+        # Lignes de la forme "import time:  self [us] | cumulative | nom", le nom indenté selon la profondeur.
+        for ligne in execution.stderr.splitlines():
+            if not ligne.startswith("import time:") or "|" not in ligne:
+                continue
+            _, cumul, nom = ligne[len("import time:"):].split("|")
+            nom = nom.strip()
+            if nom.split(".")[0] in MODULES_LOURDS:
+                charges.add(nom.split(".")[0])
+            if nom == module:
+                temps.append(int(cumul) / 1_000_000)
+    resultat = {
+        "nom": "import",
+        "scenario": module,
+        "repetitions": len(temps),
+        "temps_min": min(temps),
+        "temps_moyen": sum(temps) / len(temps),
+        "modules_lourds": sorted(charges),
+    }
+    print(f"import {module:<14} {resultat['temps_min'] * 1000:10.2f} ms "
+          f"{', '.join(resultat['modules_lourds']) or '-'}", file=sys.stderr)
+    return resultat
+
+
+def comparer(resultats, reference, seuil=SEUIL_REGRESSION):
+    """
+    Compare des résultats à ceux d'un enregistrement précédent.
+
+    Args:
+        resultats (list): Les résultats de l'exécution courante.
+        reference (list): Les résultats de référence.
+        seuil (float): Le ralentissement à partir duquel une mesure est une régression.
+
+    Returns:
+        list: Les régressions, sous forme de (nom, scénario, ratio des temps minimaux).
+    """
+    temps_reference = {(r["nom"], r["scenario"]): r["temps_min"] for r in reference}
+    regressions = []
+    for resultat in resultats:
+        cle = (resultat["nom"], resultat["scenario"])
+        if cle not in temps_reference:
+            continue
+        ratio = resultat["temps_min"] / temps_reference[cle]
+        print(f"{cle[1]:>12} {cle[0]:<20} x{ratio:.2f}", file=sys.stderr)
+        if ratio >= seuil:
+            regressions.append((cle[0], cle[1], ratio))
+    return regressions
+
+
+def creer_parser():
+    """
+    Construit l'analyseur des arguments de la ligne de commande.
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur des arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de l'audit SEO.")
+    parser.add_argument("--scenarios", default=SCENARIOS_PAR_DEFAUT,
+                        help=f"tailles de page mesurées, parmi {','.join(SCENARIOS)} (vide pour aucune)")
+    parser.add_argument("--repetitions", type=int, default=REPETITIONS, help="nombre maximal d'exécutions par mesure")
+    parser.add_argument("--pages", type=int, default=200, help="nombre de pages du site exploré (0 pour ne pas explorer)")
+    parser.add_argument("--liens-par-page", type=int, default=10, help="nombre de pages filles de chaque page du site")
+    parser.add_argument("--latence", type=float, default=20, help="latence du serveur local, en millisecondes")
+    parser.add_argument("--workers", type=int, default=8, help="nombre de pages récupérées en parallèle")
+    parser.add_argument("--debit", type=float, default=None,
+                        help="débit maximal par hôte, en requêtes par seconde (par défaut sans limite)")
+    parser.add_argument("--imports", default=IMPORTS_PAR_DEFAUT,
+                        help="modules dont le temps d'import est mesuré, séparés par des virgules (vide pour aucun)")
+    parser.add_argument("-o", "--sortie", default="bench_resultats.json", help="fichier JSON des résultats")
+    parser.add_argument("--comparer", help="fichier JSON de résultats de référence")
+    parser.add_argument("--seuil", type=float, default=SEUIL_REGRESSION,
+                        help="ralentissement signalé comme régression (1.10 : 10 %% plus lent)")
+    return parser
+
+
+def main(arguments=None):
+    """
+    Point d'entrée des benchmarks.
+
+    Args:
+        arguments (list, optional): Les arguments à analyser, par défaut ceux de sys.argv.
+
+    Returns:
+        int: 0, ou 1 si --comparer a détecté une régression.
+    """
+    parser = creer_parser()
+    options = parser.parse_args(arguments)
+    scenarios = [nom for nom in options.scenarios.split(",") if nom]
+    inconnus = [nom for nom in scenarios if nom not in SCENARIOS]
+    if inconnus:
+        parser.error(f"scénarios inconnus : {', '.join(inconnus)}")
+    parasites = registre_partage().mots() | frozenset(MOTS_PARASITES)
+    resultats = []
+    for nom in scenarios:
+        resultats.extend(benchmarks_page(nom, *SCENARIOS[nom], parasites, options.repetitions))
+    if options.pages:
+        resultats.append(benchmark_exploration(options.pages, options.liens_par_page, options.latence / 1000,
+                                               options.workers, options.debit, parasites))
+    for module in (nom for nom in options.imports.split(",") if nom):
+        resultats.append(benchmark_import(module, options.repetitions))
+    rapport = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "nb_coeurs": os.cpu_count(),
+        "resultats": resultats,
+    }
+    with open(options.sortie, "w", encoding="utf-8") as f:
+        json.dump(rapport, f, indent=2, ensure_ascii=False)
+    if options.comparer:
+        with open(options.comparer, encoding="utf-8") as f:
+            regressions = comparer(resultats, json.load(f)["resultats"], options.seuil)
+        for nom, scenario, ratio in regressions:
+            print(f"Régression : {nom} ({scenario}) {ratio:.2f} fois plus lent", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
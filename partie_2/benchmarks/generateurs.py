@@ -0,0 +1,130 @@
+"""
+Générateurs de pages et de sites HTML synthétiques pour les benchmarks.
+
+Les textes suivent une distribution de type Zipf (quelques mots très fréquents, une longue
+traîne de mots rares) sur un vocabulaire mêlant mots parasites et mots inventés, pour que
+le comptage et le retrait des mots parasites travaillent sur des données réalistes.
+Toutes les générations sont déterministes pour une graine donnée.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import random
+###################################################################
+
+MOTS_PARASITES = ["le", "la", "les", "un", "une", "de", "des", "et", "à", "en", "du", "pour", "dans", "sur"]
+TAILLE_VOCABULAIRE = 5000
+
+
+def vocabulaire(taille=TAILLE_VOCABULAIRE, graine=0):
+    """
+    Construit un vocabulaire de mots inventés, précédé des mots parasites les plus courants.
+
+    Args:
+        taille (int): Le nombre de mots inventés.
+        graine (int): La graine du générateur aléatoire.
+
+    Returns:
+        list: Les mots, du plus fréquent au moins fréquent.
+    """
+    aleatoire = random.Random(graine)
+    lettres = "abcdefghijklmnopqrstuvwxyzéèà"
+    mots = {"".join(aleatoire.choice(lettres) for _ in range(aleatoire.randint(3, 10))) for _ in range(taille * 2)}
+    return MOTS_PARASITES + sorted(mots)[:taille]
+
+
+def generer_texte(taille, graine=0):
+    """
+    Génère un texte d'environ taille caractères.
+
+    Args:
+        taille (int): La taille visée, en caractères.
+        graine (int): La graine du générateur aléatoire.
+
+    Returns:
+        str: Le texte généré, en phrases séparées par des points.
+    """
+    aleatoire = random.Random(graine)
+    mots = vocabulaire(graine=graine)
+    poids = [1 / rang for rang in range(1, len(mots) + 1)]
+    morceaux = []
+    longueur = 0
+    while longueur < taille:
+        phrase = " ".join(aleatoire.choices(mots, poids, k=aleatoire.randint(5, 20))).capitalize() + ". "
+        morceaux.append(phrase)
+        longueur += len(phrase)
+    return "".join(morceaux)
+
+
+def generer_page(taille_texte, nb_liens, nb_images, domaine="exemple.test", liens_internes=None,
+                 proportion_externes=0.2, proportion_alt=0.5, graine=0):
+    """
+    Génère une page HTML complète.
+
+    Args:
+        taille_texte (int): La taille du texte visible, en caractères.
+        nb_liens (int): Le nombre de liens de la page (hors liens_internes).
+        nb_images (int): Le nombre d'images.
+        domaine (str): Le domaine des liens internes générés.
+        liens_internes (list, optional): Des href à insérer en plus (navigation d'un site généré).
+        proportion_externes (float): La proportion de liens vers un autre domaine.
+        proportion_alt (float): La proportion d'images avec un attribut alt.
+        graine (int): La graine du générateur aléatoire.
+
+    Returns:
+        str: Le code HTML de la page.
+    """
+    aleatoire = random.Random(graine)
+    texte = generer_texte(taille_texte, graine)
+    paragraphes = [texte[i:i + 2000] for i in range(0, len(texte), 2000)] or [""]
+    liens = []
+    for i in range(nb_liens):
+        if aleatoire.random() < proportion_externes:
+            liens.append(f'<a href="https://externe{i % 50}.test/page{i}">lien externe {i}</a>')
+        else:
+            liens.append(f'<a href="https://{domaine}/article/{i}?ref=nav#haut">article {i}</a>')
+    for href in liens_internes or []:
+        liens.append(f'<a href="{href}">{href}</a>')
+    images = [
+        f'<img src="/img/{i}.png" alt="illustration {i}">' if aleatoire.random() < proportion_alt
+        else f'<img src="/img/{i}.png">'
+        for i in range(nb_images)
+    ]
+    corps = []
+    # Liens et images sont répartis entre les paragraphes, comme dans une vraie page.
+    for i, paragraphe in enumerate(paragraphes):
+        corps.append(f"<p>{paragraphe}</p>")
+        corps.extend(liens[i::len(paragraphes)])
+        corps.extend(images[i::len(paragraphes)])
+    return (
+        "<!DOCTYPE html><html><head><title>Page synthétique</title>"
+        "<style>body { font-family: sans-serif; }</style>"
+        "<script>var suivi = 'ne pas compter';</script></head><body>"
+        "<nav><a href=\"/\">accueil</a> <a href=\"/contact\">contact</a></nav>"
+        + "\n".join(corps) +
+        "<footer>mentions légales</footer></body></html>"
+    )
+
+
+def generer_site(nb_pages, liens_par_page=10, taille_texte=5000, nb_images=5, graine=0):
+    """
+    Génère un site sur plusieurs niveaux : la page d'accueil mène à liens_par_page pages,
+    qui mènent chacune à liens_par_page pages, etc. jusqu'à nb_pages pages au total.
+    Chaque page renvoie aussi vers l'accueil, comme une barre de navigation.
+
+    Args:
+        nb_pages (int): Le nombre total de pages.
+        liens_par_page (int): Le nombre de pages filles de chaque page.
+        taille_texte (int): La taille du texte de chaque page, en caractères.
+        nb_images (int): Le nombre d'images de chaque page.
+        graine (int): La graine du générateur aléatoire.
+
+    Returns:
+        dict: Le code HTML de chaque page, indexé par chemin ("/", "/page/1"...).
+    """
+    chemins = ["/"] + [f"/page/{i}" for i in range(1, nb_pages)]
+    site = {}
+    for i, chemin in enumerate(chemins):
+        enfants = chemins[i * liens_par_page + 1:(i + 1) * liens_par_page + 1]
+        site[chemin] = generer_page(taille_texte, 0, nb_images, liens_internes=enfants + ["/"], graine=graine + i)
+    return site
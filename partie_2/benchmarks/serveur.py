@@ -0,0 +1,109 @@
+"""
+Serveur HTTP local, multi-thread, qui sert un site généré (voir generateurs.generer_site).
+
+Une latence configurable est ajoutée à chaque réponse pour simuler un serveur distant.
+Les pages portent un ETag, pour que le cache HTTP (voir cache.CacheHttp) puisse les revalider.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import threading
+import time
+###################################################################
+
+
+class ServeurSite:
+    """
+    Site généré servi sur 127.0.0.1, dans un thread. Utilisable comme gestionnaire de contexte.
+    """
+    def __init__(self, pages, latence=0.0, port=0):
+        """
+        Args:
+            pages (dict): Le code HTML de chaque page, indexé par chemin.
+            latence (float): Délai ajouté avant chaque réponse, en secondes.
+            port (int): Le port d'écoute (0 pour un port libre choisi par le système).
+        """
+        self.pages = {chemin: html.encode("utf-8") for chemin, html in pages.items()}
+        self.etags = {chemin: '"' + hashlib.md5(corps).hexdigest() + '"' for chemin, corps in self.pages.items()}
+        self.latence = latence
+        self.nb_requetes = 0
+        self._verrou = threading.Lock()
+        self._serveur = ThreadingHTTPServer(("127.0.0.1", port), self._gestionnaire())
+        self._serveur.daemon_threads = True
+        self._thread = None
+
+    def _gestionnaire(self):
+        """
+        Construit la classe qui traite les requêtes, liée à ce site.
+
+        Returns:
+            type: Une sous-classe de BaseHTTPRequestHandler.
+        """
+        site = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with site._verrou:
+                    site.nb_requetes += 1
+                if site.latence:
+                    time.sleep(site.latence)
+                chemin = self.path.split("?", 1)[0]
+                corps = site.pages.get(chemin)
+                if corps is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = site.etags[chemin]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(corps)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Gestionnaire
+
+    @property
+    def url(self):
+        """
+        Returns:
+            str: L'URL de la page d'accueil du site.
+        """
+        hote, port = self._serveur.server_address[:2]
+        return f"http://{hote}:{port}/"
+
+    def demarrer(self):
+        """
+        Démarre le serveur dans un thread.
+        """
+        self._thread = threading.Thread(target=self._serveur.serve_forever, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        """
+        Arrête le serveur et libère le port.
+        """
+        self._serveur.shutdown()
+        self._serveur.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        self.demarrer()
+        return self
+
+    def __exit__(self, *exc):
+        self.arreter()
@@ -0,0 +1,163 @@
+"""
+Cache HTTP persistant sur disque.
+
+Les réponses sont stockées dans une base SQLite, indexées par URL normalisée, avec leurs
+validateurs (ETag, Last-Modified). Lors d'un nouvel audit, la page est redemandée avec une
+requête conditionnelle : une réponse 304 réutilise le corps en cache sans le retélécharger.
+
+La taille totale des corps stockés est bornée : au-delà, les entrées les moins récemment
+utilisées sont supprimées (LRU). Le total est tenu à jour dans la base elle-même, dans la
+transaction de chaque écriture : plusieurs processus peuvent partager le même fichier.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import namedtuple
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from urls import normaliser_url
+###################################################################
+
+DOSSIER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "audit_websites")
+TAILLE_MAX = 500 * 1024 * 1024
+
+Entree = namedtuple("Entree", ["url", "etag", "last_modified", "corps"])
+
+
+class CacheHttp:
+    """
+    Cache de réponses HTTP sur disque, borné en taille, partageable entre threads.
+    """
+    def __init__(self, chemin=None, taille_max=TAILLE_MAX):
+        """
+        Args:
+            chemin (str, optional): Le fichier SQLite du cache. Par défaut dans DOSSIER_CACHE.
+            taille_max (int): Taille maximale cumulée des corps stockés, en octets.
+        """
+        if chemin is None:
+            os.makedirs(DOSSIER_CACHE, exist_ok=True)
+            chemin = os.path.join(DOSSIER_CACHE, "http.sqlite")
+        self.chemin = chemin
+        self.taille_max = taille_max
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False, timeout=30)
+        with self._connexion:
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS reponses ("
+                "cle TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, "
+                "corps TEXT, taille INTEGER, dernier_acces REAL)"
+            )
+            self._connexion.execute("CREATE INDEX IF NOT EXISTS reponses_acces ON reponses (dernier_acces)")
+            # Taille totale des corps, partagée par tous les processus qui utilisent le fichier.
+            self._connexion.execute("CREATE TABLE IF NOT EXISTS compteurs (nom TEXT PRIMARY KEY, valeur INTEGER)")
+            self._connexion.execute(
+                "INSERT OR IGNORE INTO compteurs SELECT 'taille_totale', COALESCE(SUM(taille), 0) FROM reponses"
+            )
+
+    def taille_totale(self):
+        """
+        Returns:
+            int: La taille cumulée des corps stockés, en octets.
+        """
+        with self._verrou:
+            return self._connexion.execute("SELECT valeur FROM compteurs WHERE nom = 'taille_totale'").fetchone()[0]
+
+    @staticmethod
+    def cle(url):
+        """
+        Calcule la clé de cache d'une URL.
+
+        Args:
+            url (str): L'URL de la page.
+
+        Returns:
+            str: L'empreinte SHA-256 de l'URL normalisée.
+        """
+        return hashlib.sha256(normaliser_url(url).encode("utf-8")).hexdigest()
+
+    def lire(self, url):
+        """
+        Retourne l'entrée en cache d'une URL et la marque comme récemment utilisée.
+
+        Args:
+            url (str): L'URL de la page.
+
+        Returns:
+            Entree: L'entrée en cache, ou None si l'URL n'est pas en cache.
+        """
+        cle = self.cle(url)
+        with self._verrou, self._connexion:
+            ligne = self._connexion.execute(
+                "SELECT url, etag, last_modified, corps FROM reponses WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is None:
+                return None
+            self._connexion.execute("UPDATE reponses SET dernier_acces = ? WHERE cle = ?", (time.time(), cle))
+        return Entree(*ligne)
+
+    def ecrire(self, url, etag, last_modified, corps):
+        """
+        Enregistre (ou remplace) la réponse d'une URL, puis évince si la taille maximale est dépassée.
+
+        Args:
+            url (str): L'URL de la page.
+            etag (str): L'en-tête ETag de la réponse, ou None.
+            last_modified (str): L'en-tête Last-Modified de la réponse, ou None.
+            corps (str): Le code HTML de la page.
+        """
+        cle = self.cle(url)
+        taille = len(corps.encode("utf-8"))
+        with self._verrou, self._connexion:
+            # BEGIN IMMEDIATE : la base est verrouillée en écriture dès la lecture de l'ancienne taille,
+            # un autre processus ne peut pas modifier le total entre la lecture et la mise à jour.
+            self._connexion.execute("BEGIN IMMEDIATE")
+            ancienne = self._connexion.execute("SELECT taille FROM reponses WHERE cle = ?", (cle,)).fetchone()
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO reponses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cle, url, etag, last_modified, corps, taille, time.time())
+            )
+            self._connexion.execute("UPDATE compteurs SET valeur = valeur + ? WHERE nom = 'taille_totale'",
+                                    (taille - (ancienne[0] if ancienne else 0),))
+            taille_totale = self._connexion.execute(
+                "SELECT valeur FROM compteurs WHERE nom = 'taille_totale'"
+            ).fetchone()[0]
+            if taille_totale > self.taille_max:
+                self._evincer(taille_totale)
+
+    def _evincer(self, taille_totale):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à repasser sous la taille maximale.
+        Doit être appelée verrou pris, dans une transaction.
+
+        Args:
+            taille_totale (int): La taille cumulée actuelle des corps stockés.
+        """
+        curseur = self._connexion.execute("SELECT cle, taille FROM reponses ORDER BY dernier_acces")
+        a_supprimer = []
+        for cle, taille in curseur:
+            if taille_totale <= self.taille_max:
+                break
+            a_supprimer.append((cle,))
+            taille_totale -= taille
+        self._connexion.executemany("DELETE FROM reponses WHERE cle = ?", a_supprimer)
+        self._connexion.execute("UPDATE compteurs SET valeur = ? WHERE nom = 'taille_totale'", (taille_totale,))
+
+    def vider(self):
+        """
+        Supprime toutes les entrées du cache.
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute("DELETE FROM reponses")
+            self._connexion.execute("UPDATE compteurs SET valeur = 0 WHERE nom = 'taille_totale'")
+
+    def fermer(self):
+        """
+        Ferme la base du cache.
+        """
+        self._connexion.close()
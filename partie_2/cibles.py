@@ -0,0 +1,217 @@
+"""
+Recherche des mots-clés et expressions ciblés par l'utilisateur dans le texte des pages.
+
+Les cibles ("audit", "audit seo", "référencement naturel"...) sont découpées en mots comme
+le texte des pages (voir texte.TextAnalyser.compter_mots), puis compilées une seule fois en un
+automate d'Aho-Corasick dont l'alphabet est l'ensemble des mots : le texte d'une page est
+parcouru en une seule passe, et le coût du parcours ne dépend pas du nombre de cibles.
+
+Pour chaque cible et chaque page : nombre d'occurrences, densité, position du premier
+mot de la première occurrence, présence dans le titre et dans les intertitres (h1 à h6).
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import deque
+import hashlib
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from texte import MOTIF_MOT
+###################################################################
+
+
+class DetecteurCibles:
+    """
+    Automate d'Aho-Corasick sur les mots, construit une fois pour toutes les pages d'un audit.
+    """
+    def __init__(self, cibles):
+        """
+        Args:
+            cibles (iterable): Les mots-clés et expressions ciblés. La casse, la ponctuation et
+                les espaces sont ignorés ; les doublons et les cibles sans mot sont écartés.
+        """
+        self.cibles = []
+        self.longueurs = []
+        # États de l'automate : transitions par mot, lien d'échec et indices des cibles reconnues.
+        self._transitions = [{}]
+        self._sorties = [()]
+        connues = set()
+        for cible in cibles:
+            mots = MOTIF_MOT.findall(cible.lower())
+            expression = " ".join(mots)
+            if not mots or expression in connues:
+                continue
+            connues.add(expression)
+            etat = 0
+            for mot in mots:
+                suivant = self._transitions[etat].get(mot)
+                if suivant is None:
+                    suivant = self._transitions[etat][mot] = len(self._transitions)
+                    self._transitions.append({})
+                    self._sorties.append(())
+                etat = suivant
+            self._sorties[etat] += (len(self.cibles),)
+            self.cibles.append(expression)
+            self.longueurs.append(len(mots))
+        self._echecs = self._construire_echecs()
+        self.empreinte = hashlib.sha256("\n".join(sorted(self.cibles)).encode("utf-8")).hexdigest()
+
+    def _construire_echecs(self):
+        """
+        Calcule les liens d'échec par un parcours en largeur du trie, et complète les sorties
+        de chaque état avec celles de son lien d'échec (cibles qui en terminent une autre).
+
+        Returns:
+            list: Le lien d'échec de chaque état.
+        """
+        echecs = [0] * len(self._transitions)
+        file = deque(self._transitions[0].values())
+        while file:
+            etat = file.popleft()
+            for mot, suivant in self._transitions[etat].items():
+                file.append(suivant)
+                repli = echecs[etat]
+                while repli and mot not in self._transitions[repli]:
+                    repli = echecs[repli]
+                echecs[suivant] = self._transitions[repli].get(mot, 0)
+                self._sorties[suivant] += self._sorties[echecs[suivant]]
+        return echecs
+
+    def correspondances(self, mots):
+        """
+        Parcourt une suite de mots et produit chaque occurrence de chaque cible.
+
+        Args:
+            mots (iterable): Les mots du texte, en minuscules.
+
+        Yields:
+            tuple: L'indice de la cible dans self.cibles et la position de son dernier mot.
+        """
+        transitions, echecs, sorties = self._transitions, self._echecs, self._sorties
+        etat = 0
+        for position, mot in enumerate(mots):
+            while etat and mot not in transitions[etat]:
+                etat = echecs[etat]
+            etat = transitions[etat].get(mot, 0)
+            for indice in sorties[etat]:
+                yield indice, position
+
+    def trouver(self, texte):
+        """
+        Args:
+            texte (str): Un texte court (titre, intertitre...).
+
+        Returns:
+            set: Les indices des cibles présentes dans le texte.
+        """
+        return {indice for indice, _ in self.correspondances(MOTIF_MOT.findall(texte.lower()))}
+
+    def analyser(self, texte, titre="", intertitres=()):
+        """
+        Recherche toutes les cibles dans le texte d'une page.
+
+        Args:
+            texte (str): Le texte visible de la page.
+            titre (str): Le texte de la balise <title>.
+            intertitres (iterable): Les textes des intertitres (h1 à h6). Chacun est parcouru
+                séparément : une expression ne peut pas commencer dans un intertitre et finir dans le suivant.
+
+        Returns:
+            dict: Pour chaque cible, ses statistiques sur la page : "occurrences", "densite"
+                (pourcentage des mots de la page couverts par la cible), "premiere_position"
+                (rang du premier mot de la première occurrence, None si la cible est absente),
+                "dans_titre" et "dans_intertitres".
+        """
+        mots = MOTIF_MOT.findall(texte.lower())
+        occurrences = [0] * len(self.cibles)
+        premieres = [None] * len(self.cibles)
+        for indice, position in self.correspondances(mots):
+            if not occurrences[indice]:
+                premieres[indice] = position - self.longueurs[indice] + 1
+            occurrences[indice] += 1
+        dans_titre = self.trouver(titre) if titre else set()
+        dans_intertitres = set()
+        for intertitre in intertitres:
+            dans_intertitres |= self.trouver(intertitre)
+        nb_mots = len(mots)
+        return {
+            cible: {
+                "occurrences": occurrences[indice],
+                "densite": round(occurrences[indice] * self.longueurs[indice] / nb_mots * 100, 2) if nb_mots else 0,
+                "premiere_position": premieres[indice],
+                "dans_titre": indice in dans_titre,
+                "dans_intertitres": indice in dans_intertitres,
+            }
+            for indice, cible in enumerate(self.cibles)
+        }
+
+
+def formater_cibles(cibles_page):
+    """
+    Met en forme les statistiques des cibles d'une page sur une ligne, pour les rapports.
+
+    Args:
+        cibles_page (dict): Les statistiques de la page (voir DetecteurCibles.analyser).
+
+    Returns:
+        str: Pour chaque cible, ses occurrences et sa densité, suivies de (titre) et (intertitres)
+            si elle y apparaît.
+    """
+    morceaux = []
+    for cible, stats in cibles_page.items():
+        emplacements = "".join(f" ({nom})" for nom, present in (("titre", stats["dans_titre"]),
+                                                               ("intertitres", stats["dans_intertitres"])) if present)
+        morceaux.append(f"{cible} : {stats['occurrences']} ({stats['densite']} %){emplacements}")
+    return ", ".join(morceaux)
+
+
+class BilanCibles:
+    """
+    Statistiques des cibles sur l'ensemble des pages d'un site.
+    """
+    def __init__(self, cibles):
+        """
+        Args:
+            cibles (list): Les cibles de l'audit (DetecteurCibles.cibles).
+        """
+        self.cibles = list(cibles)
+        self.nb_pages = 0
+        self._totaux = {cible: {"pages": 0, "occurrences": 0, "densite": 0, "titre": 0, "intertitres": 0}
+                        for cible in self.cibles}
+        self._verrou = threading.Lock()
+
+    def ajouter(self, cibles_page):
+        """
+        Ajoute les statistiques d'une page. Peut être appelée depuis plusieurs threads.
+
+        Args:
+            cibles_page (dict): Les statistiques de la page (voir DetecteurCibles.analyser).
+        """
+        with self._verrou:
+            self.nb_pages += 1
+            for cible, stats in cibles_page.items():
+                totaux = self._totaux[cible]
+                totaux["pages"] += stats["occurrences"] > 0
+                totaux["occurrences"] += stats["occurrences"]
+                totaux["densite"] += stats["densite"]
+                totaux["titre"] += stats["dans_titre"]
+                totaux["intertitres"] += stats["dans_intertitres"]
+
+    def rapport(self):
+        """
+        Returns:
+            str: Une ligne par cible : pages où elle apparaît, occurrences, densité moyenne,
+                pages où elle est dans le titre et dans les intertitres.
+        """
+        lignes = [f"Mots-clés ciblés ({self.nb_pages} pages) :"]
+        for cible in self.cibles:
+            totaux = self._totaux[cible]
+            densite = totaux["densite"] / self.nb_pages if self.nb_pages else 0
+            lignes.append(
+                f"{cible} : {totaux['pages']} pages, {totaux['occurrences']} occurrences, "
+                f"densité moyenne {densite:.2f} %, titre : {totaux['titre']} pages, "
+                f"intertitres : {totaux['intertitres']} pages"
+            )
+        return "\n".join(lignes) + "\n"
@@ -0,0 +1,252 @@
+"""
+Audit de sites web en ligne de commande, sans interface graphique.
+
+Lit une liste d'URL de départ (une par ligne, dans un fichier ou sur l'entrée standard),
+explore chaque site comme l'application Tkinter (voir appui.App.analyse) et écrit un
+enregistrement par page, au format JSON Lines ou CSV, au fur et à mesure de l'audit :
+le rapport n'est jamais conservé en mémoire. La synthèse de chaque site (voir
+pipeline.AgregatSite) est écrite sur la sortie d'erreur à la fin de son audit.
+
+Exemples :
+    python cli.py sites.txt --mots-cles "audit,seo" --format csv --sortie rapport.csv
+    python cli.py sites.txt --cibles expressions.txt > rapport.jsonl
+    cat sites.txt | python cli.py --profondeur 2 --concurrence 16 > rapport.jsonl
+
+Les pages sont récupérées par le moteur asynchrone si aiohttp est installé, sinon par le
+client requests ; --moteur impose l'un ou l'autre (voir projet.configurer_reseau).
+
+Codes de sortie :
+    0 : toutes les pages ont été auditées ;
+    1 : certaines pages n'ont pas pu être récupérées ou analysées ;
+    2 : arguments invalides ;
+    3 : aucune page de départ n'a pu être récupérée ;
+    130 : audit interrompu (Ctrl+C).
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import argparse
+import csv
+import json
+import sys
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from cibles import DetecteurCibles
+from crawler import Crawler
+import instrumentation
+from pipeline import AgregatSite, PipelineAnalyse
+from projet import UrlAudit, configurer_reseau, formater_synthese, recuperateur_plusieurs
+import reglages_reseau
+from registre_parasites import RegistreParasites, registre_partage
+from stockage import MagasinResultats
+###################################################################
+
+CODE_OK = 0
+CODE_ECHECS_PARTIELS = 1
+CODE_ARGUMENTS = 2
+CODE_ECHEC_TOTAL = 3
+CODE_INTERRUPTION = 130
+
+COLONNES = ["site", "url", "profondeur", "nb_liens_internes", "nb_liens_externes",
+            "percent_alt", "mots_cles", "presence_mots_cles", "nb_cibles_trouvees", "cibles"]
+
+
+class EcrivainRapport:
+    """
+    Écrit les enregistrements du rapport un par un, depuis plusieurs threads.
+    """
+    def __init__(self, fichier, format_sortie):
+        """
+        Args:
+            fichier (file): Le fichier texte de sortie.
+            format_sortie (str): "jsonl" ou "csv".
+        """
+        self.fichier = fichier
+        self.format_sortie = format_sortie
+        self._verrou = threading.Lock()
+        if format_sortie == "csv":
+            self._csv = csv.DictWriter(fichier, fieldnames=COLONNES)
+            self._csv.writeheader()
+
+    def ecrire(self, enregistrement):
+        """
+        Écrit un enregistrement et vide le tampon, pour qu'il soit lisible immédiatement en aval.
+
+        Args:
+            enregistrement (dict): L'enregistrement d'une page (voir COLONNES).
+        """
+        with self._verrou:
+            if self.format_sortie == "csv":
+                self._csv.writerow(dict(enregistrement, mots_cles=", ".join(enregistrement["mots_cles"]),
+                                        cibles=json.dumps(enregistrement["cibles"], ensure_ascii=False)))
+            else:
+                self.fichier.write(json.dumps(enregistrement, ensure_ascii=False) + "\n")
+            self.fichier.flush()
+
+
+def lire_urls(fichier):
+    """
+    Lit les URL de départ, en ignorant les lignes vides et les commentaires (#).
+
+    Args:
+        fichier (file): Le fichier texte contenant une URL par ligne.
+
+    Yields:
+        str: Chaque URL de départ.
+    """
+    for ligne in fichier:
+        ligne = ligne.strip()
+        if ligne and not ligne.startswith("#"):
+            yield ligne
+
+
+def creer_parser():
+    """
+    Construit l'analyseur des arguments de la ligne de commande.
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur des arguments.
+    """
+    parser = argparse.ArgumentParser(description="Audit SEO de sites web, une ligne de rapport par page.")
+    parser.add_argument("urls", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default=sys.stdin,
+                        help="fichier des URL de départ, une par ligne (par défaut l'entrée standard)")
+    parser.add_argument("-o", "--sortie", type=argparse.FileType("w", encoding="utf-8"), default=sys.stdout,
+                        help="fichier du rapport (par défaut la sortie standard)")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv"], default="jsonl", help="format du rapport")
+    parser.add_argument("-k", "--mots-cles", default="", help="mots-clés souhaités pour le SEO, séparés par des virgules")
+    parser.add_argument("--cibles", type=argparse.FileType("r", encoding="utf-8"),
+                        help="fichier de mots-clés et expressions ciblés, un par ligne, recherchés en plus de --mots-cles")
+    parser.add_argument("-p", "--parasites", help="fichier CSV des mots parasites (par défaut parasites.csv)")
+    parser.add_argument("-c", "--concurrence", type=int, default=8, help="nombre de pages récupérées en parallèle (analysées en parallèle avec aiohttp, "
+                             "qui récupère toutes les pages d'un niveau à la fois)")
+    parser.add_argument("--moteur", choices=reglages_reseau.MOTEURS, default="auto",
+                        help="client de récupération des pages : auto (aiohttp s'il est installé), async ou requests")
+    parser.add_argument("--processus", type=int, default=0,
+                        help="nombre de processus d'analyse (0 : analyse dans les threads de récupération)")
+    parser.add_argument("-d", "--profondeur", type=int, default=1, help="profondeur maximale d'exploration")
+    parser.add_argument("-n", "--pages-max", type=int, default=500, help="nombre maximal de pages par site")
+    parser.add_argument("--inclure-depart", action="store_true", help="inclure la page de départ dans le rapport")
+    parser.add_argument("--sans-cache", action="store_true", help="ne pas utiliser le cache HTTP ni les résultats stockés")
+    parser.add_argument("--rafraichir", action="store_true", help="retélécharger et réanalyser toutes les pages")
+    parser.add_argument("--mesures", help="fichier JSON où enregistrer les temps de chaque étape de l'audit")
+    parser.add_argument("--profil", help="fichier où enregistrer le profil cProfile de l'audit")
+    return parser
+
+
+def auditer(url_depart, options, mots_parasites, mots_cles_utilisateur, detecteur, ecrivain, magasin, pipeline):
+    """
+    Audite un site et écrit un enregistrement par page, puis la synthèse du site sur la sortie d'erreur.
+
+    Returns:
+        tuple: Le nombre de pages en échec et un booléen indiquant si la page de départ a été récupérée.
+    """
+    echecs = []
+    agregat = AgregatSite()
+    depart_recupere = threading.Event()
+    empreinte = MagasinResultats.empreinte_parasites(mots_parasites) if magasin is not None else None
+    cache_options = {"utiliser_cache": not options.sans_cache, "rafraichir": options.rafraichir}
+    # La page de départ n'est pas comptée dans le nombre maximal de pages, comme dans l'application.
+    crawler = Crawler(
+        profondeur_max=options.profondeur,
+        nb_pages_max=options.pages_max + (0 if options.inclure_depart else 1),
+        nb_workers=options.concurrence,
+        recuperer=lambda url: UrlAudit.recuperer_page(url, **cache_options),
+        recuperer_plusieurs=recuperateur_plusieurs(**cache_options)
+    )
+
+    def traiter(url, html, profondeur):
+        if profondeur == 0:
+            depart_recupere.set()
+        if pipeline is not None:
+            resultat = pipeline.analyser(url, html)
+            if "erreur" in resultat:
+                raise ValueError(resultat["erreur"])
+        else:
+            resultat = UrlAudit.analyser_html(url, html, mots_parasites, magasin=magasin, empreinte_parasites=empreinte,
+                                              reutiliser=not options.rafraichir, detecteur=detecteur)
+        agregat.ajouter(resultat)
+        if profondeur > 0 or options.inclure_depart:
+            valeurs = dict(UrlAudit.resumer_page(resultat, mots_cles_utilisateur), site=url_depart, profondeur=profondeur)
+            ecrivain.ecrire({colonne: valeurs[colonne] for colonne in COLONNES})
+        return resultat["liens"]
+
+    def echec(url, profondeur, erreur):
+        echecs.append(url)
+        agregat.ajouter({"url": url, "erreur": str(erreur)})
+        print(f"{url} : {erreur}", file=sys.stderr)
+
+    crawler.parcourir(url_depart, traiter, echec=echec)
+    print(formater_synthese(url_depart, agregat.synthese()), file=sys.stderr)
+    return len(echecs), depart_recupere.is_set()
+
+
+def main(arguments=None):
+    """
+    Point d'entrée de la ligne de commande.
+
+    Args:
+        arguments (list, optional): Les arguments à analyser, par défaut ceux de sys.argv.
+
+    Returns:
+        int: Le code de sortie.
+    """
+    parser = creer_parser()
+    options = parser.parse_args(arguments)
+    if options.concurrence < 1 or options.profondeur < 0 or options.pages_max < 1 or options.processus < 0:
+        parser.error("--concurrence et --pages-max doivent être positifs, --profondeur et --processus au moins nuls")
+    if options.parasites:
+        registre = RegistreParasites()
+        try:
+            registre.enregistrer("parasites", options.parasites)
+        except OSError as e:
+            parser.error(f"fichier de mots parasites illisible : {e}")
+        mots_parasites = registre.mots()
+    else:
+        mots_parasites = registre_partage().mots()
+    mots_cles_utilisateur = {mot.strip().lower() for mot in options.mots_cles.split(",") if mot.strip()}
+    cibles = list(mots_cles_utilisateur)
+    if options.cibles:
+        cibles.extend(ligne.strip() for ligne in options.cibles if ligne.strip())
+    detecteur = DetecteurCibles(cibles) if cibles else None
+    magasin = None if options.sans_cache or options.processus else MagasinResultats()
+    pipeline = None
+    if options.processus:
+        pipeline = PipelineAnalyse(mots_parasites, options.processus, detecteur=detecteur)
+    try:
+        configurer_reseau(options.moteur)
+    except ImportError:
+        parser.error("--moteur async nécessite aiohttp")
+    ecrivain = EcrivainRapport(options.sortie, options.format)
+    if options.mesures or options.profil:
+        instrumentation.activer(profil=bool(options.profil))
+    nb_sites, nb_sites_ko, nb_echecs = 0, 0, 0
+    try:
+        for url_depart in lire_urls(options.urls):
+            nb_sites += 1
+            echecs, depart_recupere = auditer(url_depart, options, mots_parasites, mots_cles_utilisateur, detecteur,
+                                              ecrivain, magasin, pipeline)
+            nb_echecs += echecs
+            nb_sites_ko += not depart_recupere
+    except KeyboardInterrupt:
+        return CODE_INTERRUPTION
+    finally:
+        if pipeline is not None:
+            pipeline.fermer()
+        mesures = instrumentation.desactiver()
+        if mesures is not None:
+            if options.mesures:
+                mesures.ecrire_json(options.mesures)
+            if options.profil and not mesures.ecrire_profil(options.profil):
+                print("Aucune page n'a été profilée", file=sys.stderr)
+    if nb_sites == 0:
+        print("Aucune URL de départ fournie", file=sys.stderr)
+        return CODE_ARGUMENTS
+    if nb_sites_ko == nb_sites:
+        return CODE_ECHEC_TOTAL
+    return CODE_ECHECS_PARTIELS if nb_echecs else CODE_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
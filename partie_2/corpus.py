@@ -0,0 +1,122 @@
+"""
+Analyse de l'ensemble des pages d'un site après exploration.
+
+Les mots les plus fréquents d'une page sont souvent ceux de la navigation et du pied de page,
+communs à tout le site. Le CorpusSite classe plutôt les mots de chaque page par TF-IDF :
+un mot fréquent dans la page mais rare sur le reste du site est distinctif de cette page.
+
+Les occurrences de chaque page (voir TextAnalyser.compter_mots) sont accumulées dans une
+matrice creuse pages x termes (SciPy CSR) ; le TF-IDF et la sélection des meilleurs termes
+de chaque page sont calculés en une seule série d'opérations vectorisées NumPy.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from array import array
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import numpy as np
+from scipy import sparse
+###################################################################
+
+
+class CorpusSite:
+    """
+    Matrice creuse des occurrences de mots des pages d'un site, alimentée page par page.
+    """
+    def __init__(self, parasites=frozenset()):
+        """
+        Args:
+            parasites (set): Un ensemble de mots à ne pas prendre en compte.
+        """
+        self.parasites = parasites
+        self.urls = []
+        self.termes = []
+        self._vocabulaire = {}
+        # Tableaux compacts de la future matrice CSR, remplis au fil des pages.
+        self._indices = array('q')
+        self._donnees = array('d')
+        self._debuts_lignes = array('q', [0])
+        self._verrou = threading.Lock()
+
+    def ajouter(self, url, occurrences):
+        """
+        Ajoute une page au corpus. Peut être appelée depuis plusieurs threads.
+
+        Args:
+            url (str): L'URL de la page.
+            occurrences (dict): Les occurrences des mots de la page.
+        """
+        with self._verrou:
+            vocabulaire = self._vocabulaire
+            for mot, nb in occurrences.items():
+                if mot in self.parasites:
+                    continue
+                colonne = vocabulaire.get(mot)
+                if colonne is None:
+                    colonne = vocabulaire[mot] = len(self.termes)
+                    self.termes.append(mot)
+                self._indices.append(colonne)
+                self._donnees.append(nb)
+            self._debuts_lignes.append(len(self._indices))
+            self.urls.append(url)
+
+    def matrice(self):
+        """
+        Construit la matrice des occurrences.
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrice (nombre de pages, nombre de termes) des occurrences.
+        """
+        with self._verrou:
+            return sparse.csr_matrix(
+                (np.frombuffer(self._donnees, dtype=np.float64).copy(),
+                 np.frombuffer(self._indices, dtype=np.int64).copy(),
+                 np.frombuffer(self._debuts_lignes, dtype=np.int64).copy()),
+                shape=(len(self.urls), len(self.termes))
+            )
+
+    def tfidf(self):
+        """
+        Calcule la matrice TF-IDF du corpus : fréquence logarithmique (1 + log(tf)),
+        IDF lissé (log((1 + n) / (1 + df)) + 1), puis normalisation L2 de chaque page.
+
+        Returns:
+            scipy.sparse.csr_matrix: La matrice TF-IDF, de même forme que matrice().
+        """
+        poids = self.matrice()
+        nb_pages = poids.shape[0]
+        frequences_documents = np.bincount(poids.indices, minlength=poids.shape[1])
+        idf = np.log((1 + nb_pages) / (1 + frequences_documents)) + 1
+        poids.data = (1 + np.log(poids.data)) * idf[poids.indices]
+        normes = np.sqrt(np.asarray(poids.multiply(poids).sum(axis=1)).ravel())
+        longueurs = np.diff(poids.indptr)
+        # Les pages sans aucun terme (vides ou uniquement des mots parasites) n'ont rien à normaliser.
+        normes[longueurs == 0] = 1
+        poids.data /= np.repeat(normes, longueurs)
+        return poids
+
+    def meilleurs_termes(self, k=3):
+        """
+        Retourne les k termes les plus distinctifs de chaque page.
+
+        Args:
+            k (int): Le nombre de termes par page.
+
+        Returns:
+            dict: Pour chaque URL, la liste des couples (terme, score) par score décroissant.
+        """
+        poids = self.tfidf()
+        lignes = np.repeat(np.arange(poids.shape[0]), np.diff(poids.indptr))
+        # Tri global par page puis par score décroissant, puis rang de chaque terme dans sa page.
+        ordre = np.lexsort((-poids.data, lignes))
+        lignes_triees = lignes[ordre]
+        rangs = np.arange(len(ordre)) - poids.indptr[lignes_triees]
+        gardes = ordre[rangs < k]
+        termes = np.array(self.termes, dtype=object)
+        resultats = {url: [] for url in self.urls}
+        for ligne, terme, score in zip(lignes[gardes], termes[poids.indices[gardes]], poids.data[gardes]):
+            resultats[self.urls[ligne]].append((terme, float(score)))
+        return resultats
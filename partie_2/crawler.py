@@ -0,0 +1,396 @@
+"""
+Exploration d'un site web sur plusieurs niveaux.
+
+Le Crawler parcourt un site en largeur à partir d'une page de départ :
+- les liens sont résolus par rapport à la page qui les contient (urljoin), puis normalisés
+  (fragment retiré, requête triée) pour que chaque URL ne soit récupérée qu'une seule fois ;
+- seules les pages du même domaine que la page de départ (sous-domaines compris, voir liens) sont suivies ;
+- les redirections sont suivies : les liens d'une page sont résolus par rapport à son URL finale ;
+- la profondeur et le nombre de pages sont bornés ;
+- le fichier robots.txt de chaque hôte est respecté, ainsi qu'un débit maximal de requêtes par hôte.
+
+Les pages d'un même niveau sont récupérées en parallèle par un pool de threads. Avec le moteur
+asynchrone (voir moteur_async), toutes les pages d'un niveau sont demandées d'un coup et
+restent en vol ensemble : le pool de threads ne sert plus qu'à leur traitement.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import instrumentation
+from projet import UrlAudit
+import reglages_reseau
+from urls import normaliser_url
+###################################################################
+
+PROFONDEUR_MAX = 1
+NB_PAGES_MAX = 500
+NB_WORKERS = 8
+REQUETES_PAR_SECONDE = 10
+SCHEMAS_SUIVIS = {"http", "https"}
+# Taille lue d'un robots.txt, en octets : la suite est ignorée, comme le fait Googlebot au-delà de 500 Kio.
+TAILLE_MAX_ROBOTS = 500 * 1024
+
+
+class RobotsTxt:
+    """
+    Règles robots.txt des hôtes visités, téléchargées une fois par hôte. Chaque origine a son
+    propre verrou : le téléchargement d'un robots.txt lent ne retient pas les autres hôtes.
+    """
+    def __init__(self, user_agent=None):
+        """
+        Args:
+            user_agent (str, optional): Le User-Agent pour lequel les règles sont évaluées.
+                Par défaut celui des clients HTTP (voir reglages_reseau).
+        """
+        self.user_agent = user_agent or reglages_reseau.USER_AGENT
+        self._regles = {}
+        self._verrous = {}
+        self._verrou = threading.Lock()
+
+    def _regles_hote(self, url):
+        """
+        Retourne les règles de l'hôte d'une URL, en les téléchargeant à la première demande.
+
+        Args:
+            url (str): Une URL de l'hôte.
+
+        Returns:
+            RobotFileParser: Les règles de l'hôte.
+        """
+        morceaux = urlsplit(url)
+        origine = f"{morceaux.scheme}://{morceaux.netloc}"
+        regles = self._regles.get(origine)
+        if regles is not None:
+            return regles
+        # Le verrou global ne protège que le dictionnaire des verrous ; le téléchargement
+        # se fait sous le verrou de l'origine, pour qu'il n'ait lieu qu'une fois.
+        with self._verrou:
+            verrou_origine = self._verrous.setdefault(origine, threading.Lock())
+        with verrou_origine:
+            regles = self._regles.get(origine)
+            if regles is None:
+                regles = self._telecharger(origine + "/robots.txt")
+                self._regles[origine] = regles
+            return regles
+
+    @staticmethod
+    def _telecharger(url_robots):
+        """
+        Télécharge et lit un robots.txt, dont seuls les TAILLE_MAX_ROBOTS premiers octets sont lus.
+
+        Args:
+            url_robots (str): L'URL du fichier robots.txt.
+
+        Returns:
+            RobotFileParser: Les règles du fichier.
+        """
+        regles = RobotFileParser(url_robots)
+        # Mêmes conventions que RobotFileParser.read() : accès refusé sur 401/403,
+        # tout autorisé si le fichier est absent ou inaccessible.
+        try:
+            import reseau
+            with reseau.client_partage().get(url_robots, stream=True) as response:
+                if response.status_code in (401, 403):
+                    regles.disallow_all = True
+                elif response.status_code >= 400:
+                    regles.allow_all = True
+                else:
+                    corps = bytearray()
+                    for bloc in response.iter_content(reglages_reseau.TAILLE_BLOC):
+                        corps += bloc
+                        if len(corps) > TAILLE_MAX_ROBOTS:
+                            # La dernière ligne, coupée, est ignorée avec la suite du fichier.
+                            corps = corps[:corps.rfind(b"\n", 0, TAILLE_MAX_ROBOTS) + 1]
+                            break
+                    texte = bytes(corps).decode(response.encoding or "utf-8", errors="replace")
+                    regles.parse(texte.splitlines())
+        except Exception:
+            regles.allow_all = True
+        return regles
+
+    def autorise(self, url):
+        """
+        Indique si une URL peut être explorée.
+
+        Args:
+            url (str): L'URL à explorer.
+
+        Returns:
+            bool: Vrai si robots.txt autorise l'accès.
+        """
+        return self._regles_hote(url).can_fetch(self.user_agent, url)
+
+    def delai(self, url):
+        """
+        Retourne le Crawl-delay demandé par l'hôte d'une URL.
+
+        Args:
+            url (str): Une URL de l'hôte.
+
+        Returns:
+            float: Le délai en secondes, 0 si aucun n'est demandé.
+        """
+        return self._regles_hote(url).crawl_delay(self.user_agent) or 0
+
+
+class LimiteurHotes:
+    """
+    Espace les requêtes envoyées à un même hôte d'un intervalle minimal.
+    """
+    def __init__(self):
+        self._prochain_creneau = {}
+        self._verrou = threading.Lock()
+
+    def reserver(self, hote, intervalle):
+        """
+        Réserve le prochain créneau libre de l'hôte, sans attendre.
+
+        Args:
+            hote (str): L'hôte à interroger.
+            intervalle (float): L'intervalle minimal entre deux requêtes, en secondes.
+
+        Returns:
+            float: L'attente avant le créneau réservé, en secondes.
+        """
+        with self._verrou:
+            maintenant = time.monotonic()
+            creneau = max(maintenant, self._prochain_creneau.get(hote, 0))
+            self._prochain_creneau[hote] = creneau + intervalle
+        return creneau - maintenant
+
+    def attendre(self, hote, intervalle):
+        """
+        Réserve le prochain créneau libre de l'hôte et attend qu'il arrive.
+
+        Args:
+            hote (str): L'hôte à interroger.
+            intervalle (float): L'intervalle minimal entre deux requêtes, en secondes.
+        """
+        attente = self.reserver(hote, intervalle)
+        if attente > 0:
+            time.sleep(attente)
+
+
+class Crawler:
+    """
+    Exploration en largeur d'un site, bornée en profondeur et en nombre de pages.
+    """
+    def __init__(self, profondeur_max=PROFONDEUR_MAX, nb_pages_max=NB_PAGES_MAX, nb_workers=NB_WORKERS,
+                 requetes_par_seconde=REQUETES_PAR_SECONDE, respecter_robots=True,
+                 recuperer=UrlAudit.recuperer_page, annulation=None, recuperer_plusieurs=None):
+        """
+        Args:
+            profondeur_max (int): Profondeur maximale, la page de départ étant au niveau 0.
+            nb_pages_max (int): Nombre maximal de pages récupérées.
+            nb_workers (int): Nombre de pages récupérées en parallèle.
+            requetes_par_seconde (float): Débit maximal par hôte (None pour ne pas limiter).
+            respecter_robots (bool): Si vrai, les URL interdites par robots.txt ne sont pas récupérées.
+            recuperer (callable): Fonction qui retourne une URL récupérée, sous forme de reseau.Reponse
+                ou directement de code HTML (l'URL finale est alors l'URL demandée).
+            annulation (threading.Event, optional): Évènement qui interrompt l'exploration.
+            recuperer_plusieurs (callable, optional): Fonction appelée avec (urls, attente) qui récupère
+                toutes les URL à la fois et produit, dans leur ordre d'arrivée, des couples (url, Reponse
+                ou exception) ; attente(url) donne le délai avant d'envoyer la requête (voir
+                projet.recuperateur_plusieurs). Si elle est fournie, elle remplace recuperer.
+        """
+        self.profondeur_max = profondeur_max
+        self.nb_pages_max = nb_pages_max
+        self.nb_workers = nb_workers
+        self.intervalle = 1 / requetes_par_seconde if requetes_par_seconde else 0
+        self.robots = RobotsTxt() if respecter_robots else None
+        self.recuperer = recuperer
+        self.annulation = annulation or threading.Event()
+        self.recuperer_plusieurs = recuperer_plusieurs
+        self.limiteur = LimiteurHotes()
+
+    @staticmethod
+    def resoudre_liens(url_page, liens):
+        """
+        Transforme les href d'une page en URL absolues normalisées, en ignorant
+        les liens qui ne mènent pas à une page web (mailto:, tel:, javascript:...)
+        et ceux qui ne forment pas une URL valide (http://[bad/x, port non numérique...).
+
+        Args:
+            url_page (str): L'URL de la page qui contient les liens.
+            liens (list): Les valeurs brutes des attributs href.
+
+        Returns:
+            list: Les URL absolues normalisées, sans doublon, dans l'ordre d'apparition.
+        """
+        urls = {}
+        for lien in liens:
+            try:
+                absolue = urljoin(url_page, lien.strip())
+                if urlsplit(absolue).scheme in SCHEMAS_SUIVIS:
+                    urls.setdefault(normaliser_url(absolue), None)
+            except ValueError:
+                # Un href mal formé ne doit pas interrompre toute l'exploration.
+                continue
+        return list(urls)
+
+    def _intervalle(self, url):
+        """
+        Vérifie qu'une URL peut être explorée et retourne l'intervalle à respecter entre deux requêtes à son hôte.
+
+        Returns:
+            float: L'intervalle en secondes (0 pour ne pas limiter).
+
+        Raises:
+            PermissionError: Si robots.txt interdit l'URL.
+        """
+        if self.robots is not None and not self.robots.autorise(url):
+            raise PermissionError(f"Exploration interdite par robots.txt : {url}")
+        return max(self.intervalle, self.robots.delai(url) if self.robots is not None else 0)
+
+    @staticmethod
+    def _traiter_page(url, page, profondeur, traiter):
+        """
+        Traite une page récupérée.
+
+        Returns:
+            tuple: L'URL finale de la page après redirections et ses href.
+        """
+        if isinstance(page, str):
+            html = page
+        else:
+            url, html = page.url_finale, page.html
+        return url, traiter(url, html, profondeur) or []
+
+    def _visiter(self, url, profondeur, traiter, echec):
+        """
+        Récupère et traite une page. Exécutée par un thread du pool.
+
+        Returns:
+            tuple: L'URL finale de la page après redirections et ses href (liste vide
+                en cas d'échec ou d'annulation).
+        """
+        if self.annulation.is_set():
+            return url, []
+        try:
+            intervalle = self._intervalle(url)
+            if intervalle:
+                self.limiteur.attendre(urlsplit(url).netloc, intervalle)
+            # La mesure de la page commence après l'attente du limiteur de débit.
+            with instrumentation.page(url):
+                return self._traiter_page(url, self.recuperer(url), profondeur, traiter)
+        except Exception as e:
+            if echec is not None:
+                echec(url, profondeur, e)
+            return url, []
+
+    def _analyser(self, url, page, profondeur, traiter, echec):
+        """
+        Traite une page déjà récupérée par recuperer_plusieurs. Exécutée par un thread du pool.
+
+        Returns:
+            tuple: L'URL finale de la page après redirections et ses href (liste vide
+                en cas d'échec ou d'annulation).
+        """
+        if self.annulation.is_set():
+            return url, []
+        try:
+            # Le téléchargement s'est fait dans la boucle du moteur : seul le traitement est mesuré.
+            with instrumentation.page(url):
+                instrumentation.ajouter_octets(page.octets)
+                return self._traiter_page(url, page, profondeur, traiter)
+        except Exception as e:
+            if echec is not None:
+                echec(url, profondeur, e)
+            return url, []
+
+    def _visiter_niveau(self, executor, niveau, profondeur, traiter, echec):
+        """
+        Récupère toutes les pages d'un niveau avec recuperer_plusieurs, et confie chaque page
+        au pool de threads dès son arrivée.
+
+        Returns:
+            list: Pour chaque page, son URL finale et ses href (liste vide en cas d'échec ou d'annulation).
+        """
+        resultats = []
+        intervalles = {}
+
+        def demandes():
+            for url in niveau:
+                if self.annulation.is_set():
+                    return
+                try:
+                    intervalles[url] = self._intervalle(url)
+                except Exception as e:
+                    if echec is not None:
+                        echec(url, profondeur, e)
+                    resultats.append((url, []))
+                    continue
+                yield url
+
+        def attente(url):
+            intervalle = intervalles.pop(url, 0)
+            return self.limiteur.reserver(urlsplit(url).netloc, intervalle) if intervalle else 0
+
+        futurs = []
+        for url, page in self.recuperer_plusieurs(demandes(), attente):
+            if isinstance(page, BaseException):
+                if echec is not None:
+                    echec(url, profondeur, page)
+                resultats.append((url, []))
+            else:
+                futurs.append(executor.submit(self._analyser, url, page, profondeur, traiter, echec))
+        resultats.extend(futur.result() for futur in futurs)
+        return resultats
+
+    def parcourir(self, url_depart, traiter, echec=None, progression=None):
+        """
+        Explore le site à partir d'une page de départ.
+
+        Args:
+            url_depart (str): L'URL de la page de départ.
+            traiter (callable): Appelée dans un thread du pool avec (url finale, html, profondeur)
+                pour chaque page récupérée ; doit retourner la liste des href de la page.
+            echec (callable, optional): Appelée avec (url, profondeur, exception) pour chaque page en échec.
+            progression (callable, optional): Appelée avec (profondeur, nombre de pages)
+                à chaque fois qu'un niveau est planifié.
+
+        Returns:
+            int: Le nombre de pages planifiées.
+        """
+        depart = normaliser_url(url_depart)
+        domaine = UrlAudit.extraire_nom_domaine(depart)
+        visites = {depart}
+        niveau = [depart]
+        nb_planifiees = 0
+        with ThreadPoolExecutor(max_workers=self.nb_workers) as executor:
+            for profondeur in range(self.profondeur_max + 1):
+                niveau = niveau[:self.nb_pages_max - nb_planifiees]
+                if not niveau or self.annulation.is_set():
+                    break
+                nb_planifiees += len(niveau)
+                if progression is not None:
+                    progression(profondeur, len(niveau))
+                if self.recuperer_plusieurs is not None:
+                    liens_par_page = self._visiter_niveau(executor, niveau, profondeur, traiter, echec)
+                else:
+                    liens_par_page = executor.map(self._visiter, niveau, repeat(profondeur), repeat(traiter),
+                                                  repeat(echec))
+                suivant = []
+                for url, liens in liens_par_page:
+                    if profondeur == 0:
+                        # Le site exploré est celui de la page de départ après redirections (exemple.fr -> www.exemple.fr).
+                        domaine = UrlAudit.extraire_nom_domaine(url)
+                    visites.add(normaliser_url(url))
+                    if profondeur == self.profondeur_max:
+                        continue
+                    internes, _ = UrlAudit.classifier_par_domaine(domaine, self.resoudre_liens(url, liens))
+                    for lien in internes:
+                        if lien not in visites:
+                            visites.add(lien)
+                            suivant.append(lien)
+                niveau = suivant
+        return nb_planifiees
@@ -0,0 +1,374 @@
+"""
+Audit réparti sur plusieurs processus, sur une ou plusieurs machines.
+
+- Le coordinateur enregistre un audit dans la frontière partagée (voir frontiere),
+  avec sa page de départ.
+- Chaque travailleur réserve des URL dans la frontière, les récupère et les analyse
+  comme l'application (UrlAudit.analyser_html, UrlAudit.resumer_page), puis y dépose
+  le résumé de la page et ses liens internes. Les travailleurs peuvent être lancés,
+  arrêtés ou perdus à tout moment : une URL réservée par un travailleur disparu est
+  reprise par un autre à l'expiration de son bail. Un travailleur actif renouvelle
+  régulièrement le bail des pages qu'il traite encore.
+- Une fois la frontière vide, le coordinateur fusionne les résultats de tous les
+  travailleurs en un seul rapport de site dans la base des rapports (voir rapports).
+
+Exemples :
+    python distribue.py lancer https://exemple.fr -k "audit seo" -d 3 -n 10000 --frontiere /partage/frontiere.sqlite
+    python distribue.py travailleur --frontiere /partage/frontiere.sqlite --threads 16
+    python distribue.py fusionner 1 --frontiere /partage/frontiere.sqlite --sortie rapport.csv
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import argparse
+import os
+import socket
+import sys
+import threading
+from urllib.parse import urlsplit
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from cibles import BilanCibles, DetecteurCibles
+from crawler import REQUETES_PAR_SECONDE, Crawler, LimiteurHotes, RobotsTxt
+from frontiere import DUREE_BAIL, FrontiereSqlite
+from projet import UrlAudit
+from rapports import BaseRapports
+from registre_parasites import registre_partage
+from reponses import ErreurRecuperation
+from stockage import MagasinResultats
+###################################################################
+
+NB_THREADS = 8
+# Intervalle (en secondes) entre deux consultations d'une frontière momentanément vide.
+DELAI_ATTENTE = 1.0
+
+
+class Travailleur:
+    """
+    Explore les URL d'une frontière partagée avec un pool de threads, jusqu'à ce qu'elle soit vide.
+    """
+    def __init__(self, frontiere, nom=None, nb_threads=NB_THREADS, duree_bail=DUREE_BAIL,
+                 requetes_par_seconde=REQUETES_PAR_SECONDE, respecter_robots=True,
+                 recuperer=UrlAudit.recuperer_page, magasin=None, parasites=None):
+        """
+        Args:
+            frontiere (FrontiereSqlite | FrontiereMemoire): La frontière partagée.
+            nom (str, optional): Le nom du travailleur dans la frontière. Par défaut machine:pid.
+            nb_threads (int): Nombre de pages explorées en parallèle.
+            duree_bail (float): Durée du bail de chaque URL réservée, en secondes. Le bail est
+                renouvelé tant que la page est traitée.
+            requetes_par_seconde (float): Débit maximal par hôte pour ce travailleur (None pour ne pas limiter).
+            respecter_robots (bool): Si vrai, les URL interdites par robots.txt ne sont pas récupérées.
+            recuperer (callable): Fonction qui retourne la reponses.Reponse d'une URL.
+            magasin (MagasinResultats, optional): Les résultats précédents, pour ne pas réanalyser les pages inchangées.
+            parasites (set, optional): Les mots parasites. Par défaut ceux du registre partagé.
+        """
+        self.frontiere = frontiere
+        self.nom = nom or f"{socket.gethostname()}:{os.getpid()}"
+        self.nb_threads = nb_threads
+        self.duree_bail = duree_bail
+        self.intervalle = 1 / requetes_par_seconde if requetes_par_seconde else 0
+        self.robots = RobotsTxt() if respecter_robots else None
+        self.limiteur = LimiteurHotes()
+        self.recuperer = recuperer
+        self.magasin = magasin
+        self.parasites = parasites if parasites is not None else registre_partage().mots()
+        self.empreinte_parasites = MagasinResultats.empreinte_parasites(self.parasites) if magasin is not None else None
+        self.arret = threading.Event()
+        self.nb_pages = 0
+        self._audits = {}
+        # Pages réservées en cours de traitement, dont le bail est renouvelé par _renouveler_baux.
+        self._en_cours = set()
+        self._verrou = threading.Lock()
+
+    def _parametres(self, audit):
+        """
+        Retourne les mots-clés et le détecteur de cibles d'un audit, lus une fois par travailleur.
+
+        Returns:
+            tuple: L'ensemble des mots-clés et le DetecteurCibles (None sans mot-clé).
+        """
+        with self._verrou:
+            parametres = self._audits.get(audit)
+            if parametres is None:
+                mots_cles = set(self.frontiere.audit(audit)["mots_cles"])
+                detecteur = DetecteurCibles(mots_cles)
+                parametres = self._audits[audit] = (mots_cles, detecteur if detecteur.cibles else None)
+            return parametres
+
+    def traiter(self, tache):
+        """
+        Récupère, analyse et termine une URL réservée, ou signale son échec à la frontière.
+
+        Args:
+            tache (Tache): L'URL réservée.
+        """
+        with self._verrou:
+            self._en_cours.add(tache)
+        try:
+            self._traiter(tache)
+        finally:
+            with self._verrou:
+                self._en_cours.discard(tache)
+
+    def _traiter(self, tache):
+        """
+        Voir traiter.
+        """
+        try:
+            if self.robots is not None and not self.robots.autorise(tache.url):
+                raise PermissionError(f"Exploration interdite par robots.txt : {tache.url}")
+            intervalle = max(self.intervalle, self.robots.delai(tache.url) if self.robots is not None else 0)
+            if intervalle:
+                self.limiteur.attendre(urlsplit(tache.url).netloc, intervalle)
+            reponse = self.recuperer(tache.url)
+            mots_cles, detecteur = self._parametres(tache.audit)
+            resultat = UrlAudit.analyser_html(reponse.url_finale, reponse.html, self.parasites, magasin=self.magasin,
+                                              empreinte_parasites=self.empreinte_parasites, detecteur=detecteur)
+            # Le domaine exploré est fixé par la page de départ, après redirections (comme dans Crawler.parcourir).
+            domaine = UrlAudit.extraire_nom_domaine(reponse.url_finale) if tache.profondeur == 0 else tache.domaine
+            internes, _ = UrlAudit.classifier_par_domaine(domaine, Crawler.resoudre_liens(reponse.url_finale,
+                                                                                          resultat["liens"]))
+            terminee = self.frontiere.terminer(tache, self.nom, UrlAudit.resumer_page(resultat, mots_cles), internes,
+                                               domaine if tache.profondeur == 0 else None)
+        except Exception as e:
+            # Une page absente ou interdite ne sera pas obtenue en réessayant ; les 429 et 5xx, si.
+            statut = getattr(e, "statut", None)
+            definitif = isinstance(e, PermissionError) or (
+                isinstance(e, ErreurRecuperation) and statut is not None and statut < 500 and statut != 429)
+            self.frontiere.echouer(tache, self.nom, f"{type(e).__name__} : {e}", definitif)
+            return
+        # Un résultat tardif, dont le bail a été repris par un autre travailleur, n'est pas compté.
+        if terminee:
+            with self._verrou:
+                self.nb_pages += 1
+
+    def _renouveler_baux(self, fin):
+        """
+        Renouvelle le bail des pages en cours de traitement, trois fois par durée de bail,
+        pour qu'une page lente ne soit pas reprise par un autre travailleur.
+
+        Args:
+            fin (threading.Event): Évènement positionné quand tous les threads du travailleur sont arrêtés.
+        """
+        while not fin.wait(self.duree_bail / 3):
+            with self._verrou:
+                taches = list(self._en_cours)
+            for tache in taches:
+                try:
+                    self.frontiere.renouveler(tache, self.nom, self.duree_bail)
+                except Exception as e:
+                    print(f"Impossible de renouveler le bail de {tache.url} : {e}", file=sys.stderr)
+
+    def _boucle(self, attendre):
+        """
+        Réserve et traite une URL après l'autre. Exécutée par chaque thread du travailleur.
+        """
+        while not self.arret.is_set():
+            taches = self.frontiere.reserver(self.nom, 1, self.duree_bail)
+            if not taches:
+                # Les URL réservées par les autres travailleurs peuvent encore ajouter des liens.
+                if not attendre and not self.frontiere.en_attente():
+                    return
+                self.arret.wait(DELAI_ATTENTE)
+                continue
+            for tache in taches:
+                self.traiter(tache)
+
+    def executer(self, attendre=False):
+        """
+        Explore les URL de la frontière jusqu'à ce qu'elle soit vide, ou jusqu'à arreter().
+
+        Args:
+            attendre (bool): Si vrai, le travailleur attend les audits suivants au lieu de s'arrêter.
+
+        Returns:
+            int: Le nombre de pages terminées par ce travailleur.
+        """
+        threads = [threading.Thread(target=self._boucle, args=(attendre,), name=f"travailleur-{i}", daemon=True)
+                   for i in range(self.nb_threads)]
+        fin = threading.Event()
+        renouvellement = threading.Thread(target=self._renouveler_baux, args=(fin,), name="travailleur-baux",
+                                          daemon=True)
+        renouvellement.start()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            fin.set()
+        return self.nb_pages
+
+    def arreter(self):
+        """
+        Demande l'arrêt du travailleur : les pages en cours se terminent, aucune autre n'est réservée.
+        """
+        self.arret.set()
+
+
+class Coordinateur:
+    """
+    Lance les audits dans la frontière partagée et fusionne leurs résultats en rapports de site.
+    """
+    def __init__(self, frontiere, rapports=None):
+        """
+        Args:
+            frontiere (FrontiereSqlite | FrontiereMemoire): La frontière partagée.
+            rapports (BaseRapports, optional): La base des rapports. Par défaut celle de l'application.
+        """
+        self.frontiere = frontiere
+        self.rapports = rapports
+
+    def lancer(self, url_depart, mots_cles=(), profondeur_max=1, nb_pages_max=500):
+        """
+        Enregistre un audit dans la frontière. La page de départ n'est pas comptée dans
+        le nombre maximal de pages, comme dans l'application.
+
+        Returns:
+            int: L'identifiant de l'audit dans la frontière.
+        """
+        return self.frontiere.creer_audit(url_depart, mots_cles, profondeur_max, nb_pages_max + 1)
+
+    def attendre(self, audit, annulation=None):
+        """
+        Attend que toutes les URL de l'audit soient terminées ou en échec.
+
+        Args:
+            audit (int): L'identifiant de l'audit dans la frontière.
+            annulation (threading.Event, optional): Évènement qui interrompt l'attente.
+
+        Returns:
+            bool: Vrai si l'audit est terminé.
+        """
+        annulation = annulation or threading.Event()
+        while self.frontiere.en_attente(audit):
+            if annulation.wait(DELAI_ATTENTE):
+                return False
+        return True
+
+    def fusionner(self, audit):
+        """
+        Construit le rapport du site à partir des résultats de tous les travailleurs :
+        une page par URL terminée (la page de départ exceptée, comme dans l'application),
+        puis les sections des mots-clés ciblés, des pages en échec et de la répartition du travail.
+
+        Args:
+            audit (int): L'identifiant de l'audit dans la frontière.
+
+        Returns:
+            int: L'identifiant du rapport dans la base des rapports.
+        """
+        if self.rapports is None:
+            self.rapports = BaseRapports()
+        infos = self.frontiere.audit(audit)
+        rapport = self.rapports.nouvel_audit(infos["url_depart"], set(infos["mots_cles"]))
+        bilan = None
+        pages_par_travailleur = {}
+        for _, profondeur, travailleur, resume in self.frontiere.resultats(audit):
+            pages_par_travailleur[travailleur] = pages_par_travailleur.get(travailleur, 0) + 1
+            if profondeur == 0:
+                continue
+            self.rapports.ajouter_page(rapport, resume, profondeur)
+            if resume.get("cibles") is not None:
+                if bilan is None:
+                    bilan = BilanCibles(list(resume["cibles"]))
+                bilan.ajouter(resume["cibles"])
+        if bilan is not None:
+            self.rapports.ajouter_section(rapport, "Mots-clés ciblés", bilan.rapport())
+        echecs = self.frontiere.echecs(audit)
+        if echecs:
+            self.rapports.ajouter_section(rapport, "Pages en échec", "Pages en échec :\n" + "".join(
+                f"{url} : {erreur}\n" for url, erreur in echecs))
+        self.rapports.ajouter_section(rapport, "Travailleurs", "Pages terminées par travailleur :\n" + "".join(
+            f"{travailleur} : {nb}\n" for travailleur, nb in sorted(pages_par_travailleur.items())))
+        self.rapports.terminer_audit(rapport, "incomplet" if self.frontiere.en_attente(audit) else "terminé")
+        return rapport
+
+
+def creer_parser():
+    """
+    Construit l'analyseur des arguments de la ligne de commande.
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur des arguments.
+    """
+    parser = argparse.ArgumentParser(description="Audit SEO réparti sur plusieurs processus et machines.")
+    parser.add_argument("--frontiere", help="fichier SQLite de la frontière partagée (par défaut dans le dossier du cache)")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+    lancer = commandes.add_parser("lancer", help="enregistrer un audit dans la frontière")
+    lancer.add_argument("url", help="URL de la page de départ")
+    lancer.add_argument("-k", "--mots-cles", default="", help="mots-clés souhaités pour le SEO, séparés par des virgules")
+    lancer.add_argument("-d", "--profondeur", type=int, default=1, help="profondeur maximale d'exploration")
+    lancer.add_argument("-n", "--pages-max", type=int, default=500, help="nombre maximal de pages")
+    travailleur = commandes.add_parser("travailleur", help="explorer les URL de la frontière")
+    travailleur.add_argument("-t", "--threads", type=int, default=NB_THREADS, help="nombre de pages explorées en parallèle")
+    travailleur.add_argument("--nom", help="nom du travailleur (par défaut machine:pid)")
+    travailleur.add_argument("--bail", type=float, default=DUREE_BAIL, help="durée du bail d'une URL, en secondes")
+    travailleur.add_argument("--attendre", action="store_true", help="attendre de nouveaux audits au lieu de s'arrêter")
+    travailleur.add_argument("--sans-cache", action="store_true", help="ne pas réutiliser les résultats stockés")
+    etat = commandes.add_parser("etat", help="afficher l'avancement d'un audit")
+    etat.add_argument("audit", type=int, help="identifiant de l'audit dans la frontière")
+    fusionner = commandes.add_parser("fusionner", help="construire le rapport du site")
+    fusionner.add_argument("audit", type=int, help="identifiant de l'audit dans la frontière")
+    fusionner.add_argument("--rapports", help="fichier SQLite des rapports (par défaut celui de l'application)")
+    fusionner.add_argument("--attendre", action="store_true", help="attendre la fin de l'exploration")
+    fusionner.add_argument("-o", "--sortie", help="fichier où exporter le rapport (.csv, .json ou .html)")
+    return parser
+
+
+def main(arguments=None):
+    """
+    Point d'entrée de la ligne de commande.
+
+    Args:
+        arguments (list, optional): Les arguments à analyser, par défaut ceux de sys.argv.
+
+    Returns:
+        int: Le code de sortie.
+    """
+    parser = creer_parser()
+    options = parser.parse_args(arguments)
+    frontiere = FrontiereSqlite(options.frontiere)
+    try:
+        if options.commande == "lancer":
+            mots_cles = {mot.strip().lower() for mot in options.mots_cles.split(",") if mot.strip()}
+            audit = Coordinateur(frontiere).lancer(options.url, mots_cles, options.profondeur, options.pages_max)
+            print(audit)
+        elif options.commande == "travailleur":
+            magasin = None if options.sans_cache else MagasinResultats()
+            travailleur = Travailleur(frontiere, options.nom, options.threads, options.bail, magasin=magasin)
+            try:
+                nb_pages = travailleur.executer(options.attendre)
+            except KeyboardInterrupt:
+                travailleur.arreter()
+                return 130
+            print(f"{travailleur.nom} : {nb_pages} pages terminées", file=sys.stderr)
+        elif options.commande == "etat":
+            if frontiere.audit(options.audit) is None:
+                parser.error(f"audit inconnu : {options.audit}")
+            print(", ".join(f"{etat} : {nb}" for etat, nb in frontiere.etat(options.audit).items()))
+        else:
+            if frontiere.audit(options.audit) is None:
+                parser.error(f"audit inconnu : {options.audit}")
+            coordinateur = Coordinateur(frontiere, BaseRapports(options.rapports))
+            if options.attendre:
+                coordinateur.attendre(options.audit)
+            rapport = coordinateur.fusionner(options.audit)
+            if options.sortie:
+                extension = os.path.splitext(options.sortie)[1].lower()
+                exporter = {".csv": coordinateur.rapports.exporter_csv, ".json": coordinateur.rapports.exporter_json,
+                            ".html": coordinateur.rapports.exporter_html}.get(extension)
+                if exporter is None:
+                    parser.error("--sortie doit avoir l'extension .csv, .json ou .html")
+                with open(options.sortie, "w", encoding="utf-8", newline="") as fichier:
+                    exporter(rapport, fichier)
+            print(rapport)
+    finally:
+        frontiere.fermer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
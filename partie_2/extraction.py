@@ -0,0 +1,198 @@
+"""
+Extraction en flux du contenu d'une page HTML.
+
+Ce module fournit un extracteur incrémental, basé sur html.parser.HTMLParser de la
+bibliothèque standard, qui est alimenté bloc par bloc (par exemple directement depuis
+la réponse HTTP) et met à jour au fil de l'eau :
+- le comptage des mots du texte visible,
+- les valeurs d'attributs suivis (par défaut a/href et img/alt),
+- le nombre de balises suivies (pour la couverture d'attributs).
+
+Le document n'est jamais conservé en mémoire : seuls les compteurs et les listes
+d'attributs grossissent, la mémoire de pointe ne dépend donc pas de la taille de la page.
+Les résultats sont identiques à ceux de HtmlAnalyser (backend html.parser) et de
+TextAnalyser.compter_occurrences.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import Counter
+import codecs
+from html.parser import HTMLParser
+import re
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from reponses import ErreurRecuperation
+from texte import MOTIF_MOT
+###################################################################
+
+# Mot éventuellement coupé en fin de bloc : il peut continuer dans le bloc suivant.
+MOTIF_FIN_MOT = re.compile(r'\w+$')
+# Balises dont le texte n'est pas considéré comme visible par BeautifulSoup.get_text().
+BALISES_IGNOREES = {"script", "style", "template"}
+ATTRIBUTS_SUIVIS = (("a", "href"), ("img", "alt"))
+TAILLE_BLOC = 64 * 1024
+
+
+class ExtracteurFlux(HTMLParser):
+    """
+    Extracteur HTML incrémental en une seule passe.
+
+    S'utilise comme un HTMLParser : appeler feed() pour chaque bloc reçu, puis close().
+    Les résultats sont ensuite disponibles via compter_occurrences(),
+    extraire_attributs() et percent_attributs().
+    """
+    def __init__(self, attributs=ATTRIBUTS_SUIVIS):
+        """
+        Args:
+            attributs (iterable): Couples (balise, attribut) dont les valeurs doivent être collectées.
+        """
+        super().__init__(convert_charrefs=True)
+        self.occurrences = Counter()
+        self.valeurs = {couple: [] for couple in attributs}
+        self.nb_balises = {balise: 0 for balise, _ in attributs}
+        self._attributs_par_balise = {}
+        for balise, attribut in attributs:
+            self._attributs_par_balise.setdefault(balise, []).append(attribut)
+        self._profondeur_ignoree = 0
+        self._reste = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BALISES_IGNOREES:
+            self._profondeur_ignoree += 1
+        attributs = self._attributs_par_balise.get(tag)
+        if attributs is None:
+            return
+        self.nb_balises[tag] += 1
+        # Comme BeautifulSoup : en cas d'attribut dupliqué la dernière valeur l'emporte,
+        # et un attribut sans valeur vaut la chaîne vide.
+        valeurs = {nom: valeur if valeur is not None else "" for nom, valeur in attrs}
+        for attribut in attributs:
+            if attribut in valeurs:
+                self.valeurs[(tag, attribut)].append(valeurs[attribut])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in BALISES_IGNOREES:
+            self._profondeur_ignoree -= 1
+
+    def handle_endtag(self, tag):
+        if tag in BALISES_IGNOREES and self._profondeur_ignoree:
+            self._profondeur_ignoree -= 1
+
+    def handle_data(self, data):
+        if not self._profondeur_ignoree:
+            self._ajouter_texte(data)
+
+    def unknown_decl(self, data):
+        # Les sections CDATA font partie du texte renvoyé par get_text().
+        if data.startswith("CDATA[") and not self._profondeur_ignoree:
+            self._ajouter_texte(data[len("CDATA["):])
+
+    def _ajouter_texte(self, data):
+        """
+        Compte les mots d'un fragment de texte. Le texte des balises successives est
+        concaténé sans séparateur par get_text() : le dernier mot du fragment est donc
+        gardé de côté tant qu'on ne sait pas s'il se poursuit dans le fragment suivant.
+
+        Args:
+            data (str): Le fragment de texte visible.
+        """
+        texte = self._reste + data
+        fin = MOTIF_FIN_MOT.search(texte)
+        if fin:
+            self._reste = texte[fin.start():]
+            texte = texte[:fin.start()]
+        else:
+            self._reste = ""
+        self.occurrences.update(MOTIF_MOT.findall(texte.lower()))
+
+    def close(self):
+        super().close()
+        if self._reste:
+            self.occurrences.update(MOTIF_MOT.findall(self._reste.lower()))
+            self._reste = ""
+
+    def alimenter(self, blocs):
+        """
+        Alimente l'extracteur avec une suite de blocs de texte puis le ferme.
+
+        Args:
+            blocs (iterable): Les blocs de code HTML, dans l'ordre.
+
+        Returns:
+            ExtracteurFlux: L'extracteur lui-même, pour chaîner les appels.
+        """
+        for bloc in blocs:
+            self.feed(bloc)
+        self.close()
+        return self
+
+    def compter_occurrences(self):
+        """
+        Retourne les occurrences des mots du texte visible.
+
+        Returns:
+            dict: Mots et nombre d'occurrences, classés comme TextAnalyser.compter_occurrences.
+        """
+        return dict(sorted(self.occurrences.items(), key=lambda item: item[1], reverse=True))
+
+    def extraire_attributs(self, balise, attribut):
+        """
+        Retourne les valeurs collectées pour un attribut suivi.
+
+        Args:
+            balise (str): Le type de balise HTML.
+            attribut (str): L'attribut suivi.
+
+        Returns:
+            list: Une liste des valeurs de l'attribut pour chaque balise trouvée.
+        """
+        return self.valeurs[(balise, attribut)]
+
+    def percent_attributs(self, balise, attribut):
+        """
+        Calcule le pourcentage de balises d'un type donné qui portent un attribut suivi.
+
+        Args:
+            balise (str): Le type de balise HTML.
+            attribut (str): L'attribut suivi.
+
+        Returns:
+            float: Le pourcentage d'occurrence de l'attribut.
+        """
+        total = self.nb_balises[balise]
+        if total == 0:
+            return 0
+        return len(self.valeurs[(balise, attribut)]) / total * 100
+
+    @staticmethod
+    def depuis_url(url, attributs=ATTRIBUTS_SUIVIS, taille_bloc=TAILLE_BLOC):
+        """
+        Télécharge une page en flux et l'analyse au fur et à mesure de la réception.
+
+        Args:
+            url (str): L'URL de la page web.
+            attributs (iterable): Couples (balise, attribut) à collecter.
+            taille_bloc (int): Taille des blocs lus sur la connexion, en octets.
+
+        Returns:
+            ExtracteurFlux: L'extracteur fermé, contenant les résultats.
+
+        Raises:
+            ErreurRecuperation: Si le serveur ne répond pas par un succès (2xx) : la page
+                d'erreur n'est pas analysée comme la page demandée.
+        """
+        # Import local : requests n'est chargé que si une page est réellement téléchargée.
+        import reseau
+        extracteur = ExtracteurFlux(attributs)
+        with reseau.client_partage().get(url, stream=True) as response:
+            if not 200 <= response.status_code < 300:
+                raise ErreurRecuperation(url, f"HTTP {response.status_code} {response.reason}", response.status_code)
+            decodeur = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            for bloc in response.iter_content(chunk_size=taille_bloc):
+                extracteur.feed(decodeur.decode(bloc))
+            extracteur.feed(decodeur.decode(b"", final=True))
+        extracteur.close()
+        return extracteur
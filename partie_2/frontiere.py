@@ -0,0 +1,531 @@
+"""
+Frontière d'exploration persistante, partagée par des travailleurs répartis (voir distribue).
+
+La frontière contient, pour chaque audit, les URL à explorer et leur état :
+a_faire -> en_cours (réservée par un travailleur, avec un bail) -> fait ou echec.
+Un travailleur qui réserve une URL obtient un bail de durée limitée : s'il s'arrête
+(plantage, machine perdue) sans terminer la page, le bail expire et l'URL est de
+nouveau réservable par un autre travailleur, dans la limite d'un nombre de tentatives.
+Un travailleur renouvelle le bail des pages longues à traiter (renouveler). Seul le détenteur
+du bail en cours (même travailleur, même tentative) peut terminer la page, la signaler en
+échec ou renouveler son bail : un travailleur dont le bail a été repris par un autre ne
+peut plus modifier la page, et son résultat tardif est ignoré.
+
+La frontière stocke aussi le résumé de chaque page terminée (voir UrlAudit.resumer_page),
+relu par le coordinateur pour construire le rapport du site.
+
+Deux implémentations, avec les mêmes méthodes :
+- FrontiereSqlite : un fichier SQLite (mode WAL), partagé par plusieurs processus d'une
+  même machine, ou de plusieurs machines via un système de fichiers partagé qui
+  respecte les verrous ;
+- FrontiereMemoire : en mémoire, pour un seul processus (tests, petites explorations).
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import namedtuple
+from contextlib import contextmanager
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from cache import DOSSIER_CACHE
+from urls import normaliser_url
+###################################################################
+
+A_FAIRE = "a_faire"
+EN_COURS = "en_cours"
+FAIT = "fait"
+ECHEC = "echec"
+# Durée (en secondes) pendant laquelle une URL réservée n'est pas proposée aux autres travailleurs.
+DUREE_BAIL = 300
+# Nombre maximal de réservations d'une même URL (échecs et baux expirés compris).
+NB_TENTATIVES = 3
+# Nombre de résultats lus à la fois par FrontiereSqlite.resultats.
+TAILLE_LECTURE = 500
+ERREUR_BAIL = "bail expiré sans résultat"
+
+# URL réservée par un travailleur ; domaine est le domaine exploré par l'audit,
+# tentative le numéro de la réservation, qui identifie le bail.
+Tache = namedtuple("Tache", ["audit", "url", "profondeur", "domaine", "tentative"])
+
+
+class FrontiereSqlite:
+    """
+    Frontière stockée dans une base SQLite, partageable entre threads et entre processus.
+    """
+    def __init__(self, chemin=None, nb_tentatives=NB_TENTATIVES):
+        """
+        Args:
+            chemin (str, optional): Le fichier SQLite de la frontière. Par défaut dans le dossier du cache.
+            nb_tentatives (int): Nombre maximal de réservations d'une même URL.
+        """
+        if chemin is None:
+            os.makedirs(DOSSIER_CACHE, exist_ok=True)
+            chemin = os.path.join(DOSSIER_CACHE, "frontiere.sqlite")
+        self.chemin = chemin
+        self.nb_tentatives = nb_tentatives
+        self._verrou = threading.Lock()
+        # Transactions explicites (BEGIN IMMEDIATE) : une réservation verrouille la base
+        # en écriture dès sa lecture, deux processus ne peuvent pas réserver la même URL.
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False, timeout=30, isolation_level=None)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction() as connexion:
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS audits ("
+                "id INTEGER PRIMARY KEY, url_depart TEXT, domaine TEXT, mots_cles TEXT, "
+                "profondeur_max INTEGER, nb_pages_max INTEGER, nb_planifiees INTEGER, debut REAL)"
+            )
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS taches ("
+                "audit INTEGER, url TEXT, profondeur INTEGER, etat TEXT, travailleur TEXT, bail REAL, "
+                "tentatives INTEGER DEFAULT 0, erreur TEXT, PRIMARY KEY (audit, url))"
+            )
+            connexion.execute("CREATE INDEX IF NOT EXISTS taches_etat ON taches (etat, profondeur)")
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultats ("
+                "audit INTEGER, url TEXT, profondeur INTEGER, travailleur TEXT, resume TEXT, PRIMARY KEY (audit, url))"
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Exécute un bloc dans une transaction BEGIN IMMEDIATE, verrou du thread pris.
+
+        Yields:
+            sqlite3.Connection: La connexion à utiliser dans le bloc.
+        """
+        with self._verrou:
+            self._connexion.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connexion
+            except BaseException:
+                self._connexion.execute("ROLLBACK")
+                raise
+            self._connexion.execute("COMMIT")
+
+    def creer_audit(self, url_depart, mots_cles=(), profondeur_max=1, nb_pages_max=500):
+        """
+        Enregistre un nouvel audit et place sa page de départ dans la frontière.
+
+        Args:
+            url_depart (str): L'URL de la page de départ.
+            mots_cles (iterable): Les mots-clés et expressions ciblés par l'utilisateur.
+            profondeur_max (int): Profondeur maximale, la page de départ étant au niveau 0.
+            nb_pages_max (int): Nombre maximal de pages planifiées, page de départ comprise.
+
+        Returns:
+            int: L'identifiant de l'audit.
+        """
+        depart = normaliser_url(url_depart)
+        with self._transaction() as connexion:
+            audit = connexion.execute(
+                "INSERT INTO audits (url_depart, domaine, mots_cles, profondeur_max, nb_pages_max, nb_planifiees, debut) "
+                "VALUES (?, NULL, ?, ?, ?, 1, ?)",
+                (depart, json.dumps(sorted(mots_cles), ensure_ascii=False), profondeur_max, nb_pages_max, time.time())
+            ).lastrowid
+            connexion.execute("INSERT INTO taches (audit, url, profondeur, etat) VALUES (?, ?, 0, ?)",
+                              (audit, depart, A_FAIRE))
+        return audit
+
+    def audit(self, audit):
+        """
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Returns:
+            dict: id, url_depart, domaine (None tant que la page de départ n'est pas terminée),
+                mots_cles, profondeur_max, nb_pages_max, nb_planifiees et debut ; None si l'audit est inconnu.
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT id, url_depart, domaine, mots_cles, profondeur_max, nb_pages_max, nb_planifiees, debut "
+                "FROM audits WHERE id = ?", (audit,)
+            ).fetchone()
+        if ligne is None:
+            return None
+        cles = ["id", "url_depart", "domaine", "mots_cles", "profondeur_max", "nb_pages_max", "nb_planifiees", "debut"]
+        infos = dict(zip(cles, ligne))
+        infos["mots_cles"] = json.loads(infos["mots_cles"])
+        return infos
+
+    def reserver(self, travailleur, nb=1, duree_bail=DUREE_BAIL):
+        """
+        Réserve des URL à explorer, les moins profondes d'abord. Les URL dont le bail a expiré
+        sont de nouveau réservables ; celles qui ont épuisé leurs tentatives passent en échec.
+
+        Args:
+            travailleur (str): Le nom du travailleur qui réserve.
+            nb (int): Nombre maximal d'URL réservées.
+            duree_bail (float): Durée du bail, en secondes.
+
+        Returns:
+            list: Les Tache réservées, vide s'il n'y a rien à explorer pour le moment.
+        """
+        maintenant = time.time()
+        with self._transaction() as connexion:
+            connexion.execute(
+                "UPDATE taches SET etat = ?, erreur = ?, bail = NULL WHERE etat = ? AND bail < ? AND tentatives >= ?",
+                (ECHEC, ERREUR_BAIL, EN_COURS, maintenant, self.nb_tentatives)
+            )
+            lignes = connexion.execute(
+                "SELECT t.rowid, t.audit, t.url, t.profondeur, a.domaine, t.tentatives + 1 "
+                "FROM taches t JOIN audits a ON a.id = t.audit "
+                "WHERE t.etat = ? OR (t.etat = ? AND t.bail < ?) ORDER BY t.profondeur LIMIT ?",
+                (A_FAIRE, EN_COURS, maintenant, nb)
+            ).fetchall()
+            connexion.executemany(
+                "UPDATE taches SET etat = ?, travailleur = ?, bail = ?, tentatives = tentatives + 1 WHERE rowid = ?",
+                [(EN_COURS, travailleur, maintenant + duree_bail, ligne[0]) for ligne in lignes]
+            )
+        return [Tache(*ligne[1:]) for ligne in lignes]
+
+    def terminer(self, tache, travailleur, resume, liens, domaine=None):
+        """
+        Enregistre le résultat d'une page et ajoute ses liens internes à la frontière,
+        dans la limite de la profondeur et du nombre de pages de l'audit.
+
+        Args:
+            tache (Tache): L'URL réservée.
+            travailleur (str): Le nom du travailleur.
+            resume (dict): Le résumé de la page (voir UrlAudit.resumer_page).
+            liens (list): Les URL absolues normalisées des liens internes de la page.
+            domaine (str, optional): Le domaine exploré, fixé par la page de départ (après redirections).
+
+        Returns:
+            bool: Faux si le travailleur ne détient plus le bail : rien n'est alors enregistré.
+        """
+        with self._transaction() as connexion:
+            if not connexion.execute(
+                "UPDATE taches SET etat = ?, bail = NULL, erreur = NULL "
+                "WHERE audit = ? AND url = ? AND etat = ? AND travailleur = ? AND tentatives = ?",
+                (FAIT, tache.audit, tache.url, EN_COURS, travailleur, tache.tentative)
+            ).rowcount:
+                return False
+            connexion.execute("INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?, ?)",
+                              (tache.audit, tache.url, tache.profondeur, travailleur,
+                               json.dumps(resume, ensure_ascii=False)))
+            if domaine is not None:
+                connexion.execute("UPDATE audits SET domaine = ? WHERE id = ?", (domaine, tache.audit))
+            profondeur_max, nb_pages_max, nb_planifiees = connexion.execute(
+                "SELECT profondeur_max, nb_pages_max, nb_planifiees FROM audits WHERE id = ?", (tache.audit,)
+            ).fetchone()
+            if tache.profondeur >= profondeur_max:
+                return True
+            nb_ajoutees = 0
+            for lien in liens:
+                if nb_planifiees + nb_ajoutees >= nb_pages_max:
+                    break
+                nb_ajoutees += connexion.execute(
+                    "INSERT OR IGNORE INTO taches (audit, url, profondeur, etat) VALUES (?, ?, ?, ?)",
+                    (tache.audit, lien, tache.profondeur + 1, A_FAIRE)
+                ).rowcount
+            if nb_ajoutees:
+                connexion.execute("UPDATE audits SET nb_planifiees = nb_planifiees + ? WHERE id = ?",
+                                  (nb_ajoutees, tache.audit))
+        return True
+
+    def echouer(self, tache, travailleur, erreur, definitif=False):
+        """
+        Signale l'échec d'une page : elle est remise dans la frontière, sauf si l'échec
+        est définitif ou si elle a épuisé ses tentatives.
+
+        Args:
+            tache (Tache): L'URL réservée.
+            travailleur (str): Le nom du travailleur.
+            erreur (str): La cause de l'échec.
+            definitif (bool): Si vrai, la page n'est pas retentée (404, robots.txt...).
+
+        Returns:
+            bool: Faux si le travailleur ne détient plus le bail : l'échec est alors ignoré.
+        """
+        with self._transaction() as connexion:
+            return connexion.execute(
+                "UPDATE taches SET etat = CASE WHEN ? OR tentatives >= ? THEN ? ELSE ? END, erreur = ?, bail = NULL "
+                "WHERE audit = ? AND url = ? AND etat = ? AND travailleur = ? AND tentatives = ?",
+                (definitif, self.nb_tentatives, ECHEC, A_FAIRE, erreur, tache.audit, tache.url,
+                 EN_COURS, travailleur, tache.tentative)
+            ).rowcount > 0
+
+    def renouveler(self, tache, travailleur, duree_bail=DUREE_BAIL):
+        """
+        Prolonge le bail d'une page encore en cours de traitement.
+
+        Args:
+            tache (Tache): L'URL réservée.
+            travailleur (str): Le nom du travailleur.
+            duree_bail (float): Durée du nouveau bail à partir de maintenant, en secondes.
+
+        Returns:
+            bool: Faux si le travailleur ne détient plus le bail (repris par un autre travailleur).
+        """
+        with self._transaction() as connexion:
+            return connexion.execute(
+                "UPDATE taches SET bail = ? WHERE audit = ? AND url = ? AND etat = ? AND travailleur = ? AND tentatives = ?",
+                (time.time() + duree_bail, tache.audit, tache.url, EN_COURS, travailleur, tache.tentative)
+            ).rowcount > 0
+
+    def etat(self, audit):
+        """
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Returns:
+            dict: Le nombre d'URL dans chaque état (a_faire, en_cours, fait, echec).
+        """
+        with self._verrou:
+            lignes = self._connexion.execute("SELECT etat, COUNT(*) FROM taches WHERE audit = ? GROUP BY etat",
+                                             (audit,)).fetchall()
+        return dict({A_FAIRE: 0, EN_COURS: 0, FAIT: 0, ECHEC: 0}, **dict(lignes))
+
+    def en_attente(self, audit=None):
+        """
+        Args:
+            audit (int, optional): L'identifiant d'un audit ; par défaut tous les audits.
+
+        Returns:
+            bool: Vrai s'il reste des URL à explorer ou en cours d'exploration : de nouvelles URL
+                peuvent encore être ajoutées à la frontière.
+        """
+        requete = "SELECT 1 FROM taches WHERE etat IN (?, ?)"
+        parametres = (A_FAIRE, EN_COURS)
+        if audit is not None:
+            requete += " AND audit = ?"
+            parametres += (audit,)
+        with self._verrou:
+            return self._connexion.execute(requete + " LIMIT 1", parametres).fetchone() is not None
+
+    def resultats(self, audit):
+        """
+        Parcourt les résultats d'un audit au fil d'un curseur, sur une connexion dédiée.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Yields:
+            tuple: L'URL, la profondeur, le travailleur et le résumé de chaque page terminée.
+        """
+        connexion = sqlite3.connect(self.chemin, timeout=30)
+        try:
+            curseur = connexion.execute(
+                "SELECT url, profondeur, travailleur, resume FROM resultats WHERE audit = ? ORDER BY profondeur, url",
+                (audit,)
+            )
+            while True:
+                lignes = curseur.fetchmany(TAILLE_LECTURE)
+                if not lignes:
+                    break
+                for url, profondeur, travailleur, resume in lignes:
+                    yield url, profondeur, travailleur, json.loads(resume)
+        finally:
+            connexion.close()
+
+    def echecs(self, audit):
+        """
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Returns:
+            list: Les couples (url, cause de l'échec) des pages en échec.
+        """
+        with self._verrou:
+            return self._connexion.execute("SELECT url, erreur FROM taches WHERE audit = ? AND etat = ? ORDER BY url",
+                                           (audit, ECHEC)).fetchall()
+
+    def fermer(self):
+        """
+        Ferme la base de la frontière.
+        """
+        self._connexion.close()
+
+
+class FrontiereMemoire:
+    """
+    Frontière en mémoire, avec les mêmes méthodes que FrontiereSqlite, pour un seul processus.
+    """
+    def __init__(self, nb_tentatives=NB_TENTATIVES):
+        """
+        Args:
+            nb_tentatives (int): Nombre maximal de réservations d'une même URL.
+        """
+        self.nb_tentatives = nb_tentatives
+        self._audits = {}
+        self._taches = {}
+        self._resultats = {}
+        # URL à faire, par profondeur croissante, et URL réservées (pour l'expiration des baux).
+        self._a_faire = []
+        self._en_cours = set()
+        self._compteur = itertools.count()
+        self._verrou = threading.Lock()
+
+    def _planifier(self, audit, url, profondeur):
+        """
+        Ajoute une URL à faire si elle n'est pas déjà connue. Doit être appelée verrou pris.
+
+        Returns:
+            bool: Vrai si l'URL a été ajoutée.
+        """
+        cle = (audit, url)
+        if cle in self._taches:
+            return False
+        self._taches[cle] = {"profondeur": profondeur, "etat": A_FAIRE, "travailleur": None,
+                             "bail": None, "tentatives": 0, "erreur": None}
+        heapq.heappush(self._a_faire, (profondeur, next(self._compteur), cle))
+        return True
+
+    def creer_audit(self, url_depart, mots_cles=(), profondeur_max=1, nb_pages_max=500):
+        """
+        Voir FrontiereSqlite.creer_audit.
+        """
+        depart = normaliser_url(url_depart)
+        with self._verrou:
+            audit = len(self._audits) + 1
+            self._audits[audit] = {"id": audit, "url_depart": depart, "domaine": None,
+                                   "mots_cles": sorted(mots_cles), "profondeur_max": profondeur_max,
+                                   "nb_pages_max": nb_pages_max, "nb_planifiees": 1, "debut": time.time()}
+            self._planifier(audit, depart, 0)
+        return audit
+
+    def audit(self, audit):
+        """
+        Voir FrontiereSqlite.audit.
+        """
+        with self._verrou:
+            infos = self._audits.get(audit)
+            return dict(infos) if infos is not None else None
+
+    def reserver(self, travailleur, nb=1, duree_bail=DUREE_BAIL):
+        """
+        Voir FrontiereSqlite.reserver.
+        """
+        maintenant = time.time()
+        taches = []
+        with self._verrou:
+            for cle in [cle for cle in self._en_cours if self._taches[cle]["bail"] < maintenant]:
+                self._en_cours.discard(cle)
+                tache = self._taches[cle]
+                tache["bail"] = None
+                if tache["tentatives"] >= self.nb_tentatives:
+                    tache["etat"], tache["erreur"] = ECHEC, ERREUR_BAIL
+                else:
+                    tache["etat"] = A_FAIRE
+                    heapq.heappush(self._a_faire, (tache["profondeur"], next(self._compteur), cle))
+            while self._a_faire and len(taches) < nb:
+                _, _, cle = heapq.heappop(self._a_faire)
+                tache = self._taches[cle]
+                if tache["etat"] != A_FAIRE:
+                    continue
+                tache.update(etat=EN_COURS, travailleur=travailleur, bail=maintenant + duree_bail,
+                             tentatives=tache["tentatives"] + 1)
+                self._en_cours.add(cle)
+                taches.append(Tache(cle[0], cle[1], tache["profondeur"], self._audits[cle[0]]["domaine"],
+                                    tache["tentatives"]))
+        return taches
+
+    def _detient_bail(self, tache, travailleur):
+        """
+        Indique si un travailleur détient le bail en cours d'une URL. Doit être appelée verrou pris.
+        """
+        etat = self._taches.get((tache.audit, tache.url))
+        return (etat is not None and etat["etat"] == EN_COURS and etat["travailleur"] == travailleur
+                and etat["tentatives"] == tache.tentative)
+
+    def terminer(self, tache, travailleur, resume, liens, domaine=None):
+        """
+        Voir FrontiereSqlite.terminer.
+        """
+        cle = (tache.audit, tache.url)
+        with self._verrou:
+            if not self._detient_bail(tache, travailleur):
+                return False
+            self._en_cours.discard(cle)
+            self._taches[cle].update(etat=FAIT, bail=None, erreur=None)
+            self._resultats[cle] = (tache.profondeur, travailleur, resume)
+            infos = self._audits[tache.audit]
+            if domaine is not None:
+                infos["domaine"] = domaine
+            if tache.profondeur >= infos["profondeur_max"]:
+                return True
+            for lien in liens:
+                if infos["nb_planifiees"] >= infos["nb_pages_max"]:
+                    break
+                infos["nb_planifiees"] += self._planifier(tache.audit, lien, tache.profondeur + 1)
+        return True
+
+    def echouer(self, tache, travailleur, erreur, definitif=False):
+        """
+        Voir FrontiereSqlite.echouer.
+        """
+        cle = (tache.audit, tache.url)
+        with self._verrou:
+            if not self._detient_bail(tache, travailleur):
+                return False
+            self._en_cours.discard(cle)
+            etat = self._taches[cle]
+            etat.update(bail=None, erreur=erreur)
+            if definitif or etat["tentatives"] >= self.nb_tentatives:
+                etat["etat"] = ECHEC
+            else:
+                etat["etat"] = A_FAIRE
+                heapq.heappush(self._a_faire, (etat["profondeur"], next(self._compteur), cle))
+        return True
+
+    def renouveler(self, tache, travailleur, duree_bail=DUREE_BAIL):
+        """
+        Voir FrontiereSqlite.renouveler.
+        """
+        with self._verrou:
+            if not self._detient_bail(tache, travailleur):
+                return False
+            self._taches[(tache.audit, tache.url)]["bail"] = time.time() + duree_bail
+        return True
+
+    def etat(self, audit):
+        """
+        Voir FrontiereSqlite.etat.
+        """
+        compte = {A_FAIRE: 0, EN_COURS: 0, FAIT: 0, ECHEC: 0}
+        with self._verrou:
+            for (audit_tache, _), tache in self._taches.items():
+                if audit_tache == audit:
+                    compte[tache["etat"]] += 1
+        return compte
+
+    def en_attente(self, audit=None):
+        """
+        Voir FrontiereSqlite.en_attente.
+        """
+        with self._verrou:
+            return any(tache["etat"] in (A_FAIRE, EN_COURS) and (audit is None or audit_tache == audit)
+                       for (audit_tache, _), tache in self._taches.items())
+
+    def resultats(self, audit):
+        """
+        Voir FrontiereSqlite.resultats.
+        """
+        with self._verrou:
+            lignes = sorted((profondeur, url, travailleur, resume)
+                            for (audit_resultat, url), (profondeur, travailleur, resume) in self._resultats.items()
+                            if audit_resultat == audit)
+        for profondeur, url, travailleur, resume in lignes:
+            yield url, profondeur, travailleur, resume
+
+    def echecs(self, audit):
+        """
+        Voir FrontiereSqlite.echecs.
+        """
+        with self._verrou:
+            return sorted((url, tache["erreur"]) for (audit_tache, url), tache in self._taches.items()
+                          if audit_tache == audit and tache["etat"] == ECHEC)
+
+    def fermer(self):
+        """
+        Rien à fermer : présente pour être interchangeable avec FrontiereSqlite.
+        """
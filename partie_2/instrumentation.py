@@ -0,0 +1,389 @@
+"""
+Mesure optionnelle des temps de l'audit, étape par étape.
+
+Quand les mesures sont activées (activer()), chaque étape instrumentée (téléchargement,
+extraction du texte, des attributs, comptage des mots, retrait des mots parasites,
+classification des liens) enregistre sa durée, rattachée à la page en cours de traitement
+par le thread. Les durées sont agrégées en percentiles et en histogrammes, affichables
+dans le rapport ou exportables en JSON. Un profil cProfile de l'audit peut aussi être capturé :
+un seul profileur est actif à la fois (depuis Python 3.12, cProfile refuse deux profileurs
+simultanés), il suit donc une page à la fois, les pages traitées en même temps n'étant pas profilées.
+
+Désactivées (par défaut), les mesures ne coûtent qu'un test par étape : etape() retourne
+alors un gestionnaire de contexte vide partagé.
+
+Limite : les pages analysées par un pool de processus (voir pipeline.PipelineAnalyse)
+ne remontent que leur durée totale et leur téléchargement, pas le détail de l'analyse.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import defaultdict
+import functools
+import json
+import threading
+import time
+###################################################################
+
+ETAPES = ["recuperer_html", "nettoyer_html", "extraire_attributs", "compter_occurrences",
+          "retirer_parasites", "rechercher_cibles", "classifier_par_domaine"]
+PERCENTILES = [50, 90, 95, 99]
+# Bornes supérieures (en millisecondes) des classes des histogrammes ; la dernière classe est ouverte.
+BORNES_HISTOGRAMME_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class _Inactif:
+    """
+    Gestionnaire de contexte vide, retourné quand les mesures sont désactivées.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_INACTIF = _Inactif()
+
+
+class _Chrono:
+    """
+    Chronomètre d'une étape, qui transmet sa durée aux mesures à la sortie du bloc.
+    """
+    __slots__ = ("mesures", "nom", "debut")
+
+    def __init__(self, mesures, nom):
+        self.mesures = mesures
+        self.nom = nom
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.mesures.enregistrer_duree(self.nom, time.perf_counter() - self.debut)
+        return False
+
+
+class _Page:
+    """
+    Contexte d'une page : les durées et les octets enregistrés par le thread y sont rattachés.
+    """
+    def __init__(self, mesures, url):
+        self.mesures = mesures
+        self.donnees = {"url": url, "duree": 0.0, "octets": 0, "etapes": defaultdict(float)}
+
+    def __enter__(self):
+        local = self.mesures._local
+        self._precedente = getattr(local, "page", None)
+        local.page = self.donnees
+        self._profilee = self.mesures._demarrer_profil()
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.donnees["duree"] = time.perf_counter() - self.debut
+        if self._profilee:
+            self.mesures._arreter_profil()
+        self.mesures._local.page = self._precedente
+        self.mesures.ajouter_page(self.donnees)
+        return False
+
+
+class Mesures:
+    """
+    Durées et volumes mesurés pendant un audit. Partageable entre threads.
+    """
+    def __init__(self, profil=False):
+        """
+        Args:
+            profil (bool): Si vrai, le traitement des pages est aussi profilé avec cProfile,
+                une page à la fois.
+        """
+        self.profil = profil
+        self.pages = []
+        self.durees = defaultdict(list)
+        self.nb_pages_profilees = 0
+        self._profileur = None
+        if profil:
+            # Import local : cProfile n'est chargé que pour un audit profilé.
+            import cProfile
+            self._profileur = cProfile.Profile()
+        self._verrou_profil = threading.Lock()
+        self._local = threading.local()
+        self._verrou = threading.Lock()
+
+    def _demarrer_profil(self):
+        """
+        Active le profileur pour la page du thread courant, s'il n'est pas déjà utilisé par une autre page.
+        Un échec du profileur (autre outil de profilage actif) ne fait jamais échouer la page.
+
+        Returns:
+            bool: Vrai si le profileur a été activé ; _arreter_profil() doit alors être appelée.
+        """
+        if self._profileur is None or not self._verrou_profil.acquire(blocking=False):
+            return False
+        try:
+            self._profileur.enable()
+        except Exception:
+            self._verrou_profil.release()
+            return False
+        return True
+
+    def _arreter_profil(self):
+        """
+        Désactive le profileur activé par _demarrer_profil() et le libère pour une autre page.
+        """
+        try:
+            self._profileur.disable()
+            with self._verrou:
+                self.nb_pages_profilees += 1
+        finally:
+            self._verrou_profil.release()
+
+    def etape(self, nom):
+        """
+        Args:
+            nom (str): Le nom de l'étape.
+
+        Returns:
+            _Chrono: Un gestionnaire de contexte qui mesure la durée du bloc.
+        """
+        return _Chrono(self, nom)
+
+    def page(self, url):
+        """
+        Args:
+            url (str): L'URL de la page.
+
+        Returns:
+            _Page: Un gestionnaire de contexte qui mesure le traitement complet de la page.
+        """
+        return _Page(self, url)
+
+    def enregistrer_duree(self, nom, duree):
+        """
+        Enregistre la durée d'une étape, et l'ajoute à la page en cours du thread s'il y en a une.
+
+        Args:
+            nom (str): Le nom de l'étape.
+            duree (float): La durée, en secondes.
+        """
+        with self._verrou:
+            self.durees[nom].append(duree)
+        page = getattr(self._local, "page", None)
+        if page is not None:
+            page["etapes"][nom] += duree
+
+    def ajouter_octets(self, nb_octets):
+        """
+        Ajoute des octets téléchargés à la page en cours du thread.
+
+        Args:
+            nb_octets (int): Le nombre d'octets reçus.
+        """
+        page = getattr(self._local, "page", None)
+        if page is not None:
+            page["octets"] += nb_octets
+
+    def ajouter_page(self, donnees):
+        """
+        Enregistre les mesures d'une page terminée.
+
+        Args:
+            donnees (dict): url, durée totale, octets téléchargés et durée de chaque étape.
+        """
+        with self._verrou:
+            self.pages.append(donnees)
+
+    @staticmethod
+    def statistiques(durees):
+        """
+        Calcule les statistiques d'une série de durées.
+
+        Args:
+            durees (list): Les durées, en secondes.
+
+        Returns:
+            dict: Nombre, total, moyenne, maximum et percentiles (en secondes), et histogramme
+                (nombre de durées par classe, les classes étant bornées par BORNES_HISTOGRAMME_MS).
+        """
+        triees = sorted(durees)
+        nb = len(triees)
+        statistiques = {
+            "nb": nb,
+            "total": sum(triees),
+            "moyenne": sum(triees) / nb if nb else 0,
+            "max": triees[-1] if nb else 0,
+        }
+        for percentile in PERCENTILES:
+            # Méthode du rang le plus proche.
+            statistiques[f"p{percentile}"] = triees[max(0, -(-percentile * nb // 100) - 1)] if nb else 0
+        histogramme = [0] * (len(BORNES_HISTOGRAMME_MS) + 1)
+        for duree in triees:
+            classe = 0
+            while classe < len(BORNES_HISTOGRAMME_MS) and duree * 1000 > BORNES_HISTOGRAMME_MS[classe]:
+                classe += 1
+            histogramme[classe] += 1
+        statistiques["histogramme"] = histogramme
+        return statistiques
+
+    def synthese(self):
+        """
+        Agrège les mesures de l'audit.
+
+        Returns:
+            dict: Nombre de pages, octets téléchargés, statistiques des durées par page,
+                par étape et des octets par page, et détail de chaque page.
+        """
+        with self._verrou:
+            pages = list(self.pages)
+            durees = {nom: list(valeurs) for nom, valeurs in self.durees.items()}
+        return {
+            "nb_pages": len(pages),
+            "nb_pages_profilees": self.nb_pages_profilees,
+            "octets": sum(page["octets"] for page in pages),
+            "bornes_histogramme_ms": BORNES_HISTOGRAMME_MS,
+            "pages": self.statistiques([page["duree"] for page in pages]),
+            "etapes": {nom: self.statistiques(durees[nom]) for nom in ETAPES + sorted(set(durees) - set(ETAPES))
+                       if nom in durees},
+            "detail": [dict(page, etapes=dict(page["etapes"])) for page in pages],
+        }
+
+    def rapport(self):
+        """
+        Construit la section du rapport d'audit présentant les mesures.
+
+        Returns:
+            str: Le tableau des durées par page et par étape (en millisecondes).
+        """
+        synthese = self.synthese()
+        lignes = [
+            f"Mesures : {synthese['nb_pages']} pages, {synthese['octets'] / 1_000_000:.2f} Mo téléchargés",
+            f"{'':<24}{'nb':>7}{'total':>10}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}",
+        ]
+        for nom, statistiques in [("page", synthese["pages"])] + list(synthese["etapes"].items()):
+            lignes.append(
+                f"{nom:<24}{statistiques['nb']:>7}{statistiques['total'] * 1000:>10.0f}"
+                + "".join(f"{statistiques[cle] * 1000:>9.1f}" for cle in ("p50", "p90", "p99", "max"))
+            )
+        return "\n".join(lignes) + "\n"
+
+    def ecrire_json(self, chemin):
+        """
+        Enregistre la synthèse des mesures en JSON.
+
+        Args:
+            chemin (str): Le chemin du fichier.
+        """
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(self.synthese(), f, indent=2, ensure_ascii=False)
+
+    def ecrire_profil(self, chemin):
+        """
+        Enregistre le profil cProfile des pages profilées, lisible avec pstats ou snakeviz.
+
+        Args:
+            chemin (str): Le chemin du fichier.
+
+        Returns:
+            bool: Faux si aucun profil n'a été capturé.
+        """
+        with self._verrou_profil:
+            if self._profileur is None or not self._profileur.getstats():
+                return False
+            import pstats
+            pstats.Stats(self._profileur).dump_stats(chemin)
+        return True
+
+
+_mesures = None
+
+
+def activer(profil=False):
+    """
+    Active les mesures pour les audits qui suivent, avec un nouveau jeu de mesures.
+
+    Args:
+        profil (bool): Si vrai, le traitement des pages est aussi profilé avec cProfile.
+
+    Returns:
+        Mesures: Les mesures qui seront remplies.
+    """
+    global _mesures
+    _mesures = Mesures(profil)
+    return _mesures
+
+
+def desactiver():
+    """
+    Désactive les mesures.
+
+    Returns:
+        Mesures: Les mesures collectées depuis activer(), ou None si elles n'étaient pas activées.
+    """
+    global _mesures
+    mesures, _mesures = _mesures, None
+    return mesures
+
+
+def etape(nom):
+    """
+    Mesure la durée d'un bloc : with instrumentation.etape("nettoyer_html"): ...
+
+    Args:
+        nom (str): Le nom de l'étape.
+
+    Returns:
+        Un gestionnaire de contexte, vide si les mesures sont désactivées.
+    """
+    mesures = _mesures
+    return _INACTIF if mesures is None else mesures.etape(nom)
+
+
+def page(url):
+    """
+    Mesure le traitement complet d'une page : with instrumentation.page(url): ...
+
+    Args:
+        url (str): L'URL de la page.
+
+    Returns:
+        Un gestionnaire de contexte, vide si les mesures sont désactivées.
+    """
+    mesures = _mesures
+    return _INACTIF if mesures is None else mesures.page(url)
+
+
+def ajouter_octets(nb_octets):
+    """
+    Ajoute des octets téléchargés à la page en cours, si les mesures sont activées.
+
+    Args:
+        nb_octets (int): Le nombre d'octets reçus.
+    """
+    mesures = _mesures
+    if mesures is not None:
+        mesures.ajouter_octets(nb_octets)
+
+
+def chronometre(nom):
+    """
+    Décorateur qui mesure chaque appel d'une fonction comme une étape.
+
+    Args:
+        nom (str): Le nom de l'étape.
+
+    Returns:
+        callable: Le décorateur.
+    """
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            mesures = _mesures
+            if mesures is None:
+                return fonction(*args, **kwargs)
+            with mesures.etape(nom):
+                return fonction(*args, **kwargs)
+        return enveloppe
+    return decorateur
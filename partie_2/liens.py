@@ -0,0 +1,229 @@
+"""
+Classification des liens d'une page en liens internes et externes.
+
+Un lien est interne s'il mène au même site que la page qui le contient. Chaque href est
+résolu par rapport à l'URL de la page (un lien relatif reste sur le même hôte), puis son
+hôte est comparé à celui de la page :
+- en portée "domaine" (par défaut), deux hôtes sont du même site s'ils ont le même domaine
+  enregistrable (www.exemple.fr et blog.exemple.fr, mais pas exemple.github.io et autre.github.io),
+  déterminé avec une table hors ligne des suffixes publics (suffixes_publics.dat) ;
+- en portée "hote", les hôtes doivent être identiques.
+
+Les liens mailto:, tel:, javascript: et data: ne mènent à aucune page : ils ne sont ni
+internes ni externes. Les décompositions d'URL sont mémorisées dans un cache borné, car les
+mêmes liens de navigation reviennent sur toutes les pages d'un site.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from functools import lru_cache
+import ipaddress
+import os
+import threading
+from urllib.parse import urlsplit
+###################################################################
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+FICHIER_SUFFIXES = os.path.join(DOSSIER, "suffixes_publics.dat")
+PORTEE_DOMAINE = "domaine"
+PORTEE_HOTE = "hote"
+SCHEMAS_IGNORES = {"mailto", "tel", "javascript", "data", "sms", "callto", "about"}
+# Nombre de href et d'hôtes distincts dont la décomposition est conservée.
+TAILLE_CACHE = 65536
+
+# Règles de la table des suffixes publics (voir lire_suffixes), chargées à la première utilisation.
+_table = None
+_verrou = threading.Lock()
+
+
+def lire_suffixes(chemin=FICHIER_SUFFIXES):
+    """
+    Lit une table de suffixes publics au format de la Public Suffix List.
+
+    Args:
+        chemin (str): Le chemin du fichier.
+
+    Returns:
+        tuple: Trois frozenset : les règles simples, les suffixes des règles génériques
+            ("ck" pour "*.ck") et les exceptions (sans le "!").
+    """
+    regles, generiques, exceptions = set(), set(), set()
+    with open(chemin, encoding="utf-8") as f:
+        for ligne in f:
+            regle = ligne.split(maxsplit=1)[0].lower() if ligne.strip() else ""
+            if not regle or regle.startswith("//"):
+                continue
+            if regle.startswith("!"):
+                exceptions.add(regle[1:])
+            elif regle.startswith("*."):
+                generiques.add(regle[2:])
+            else:
+                regles.add(regle)
+    return frozenset(regles), frozenset(generiques), frozenset(exceptions)
+
+
+def charger_suffixes(chemin=FICHIER_SUFFIXES):
+    """
+    Charge (ou recharge) la table des suffixes publics utilisée par domaine_enregistrable.
+
+    Args:
+        chemin (str): Le chemin du fichier.
+    """
+    global _table
+    with _verrou:
+        _table = lire_suffixes(chemin)
+        domaine_enregistrable.cache_clear()
+
+
+@lru_cache(maxsize=TAILLE_CACHE)
+def domaine_enregistrable(hote):
+    """
+    Retourne le domaine enregistrable d'un hôte : le suffixe public le plus long
+    qui le termine, précédé d'un niveau (www.exemple.co.uk -> exemple.co.uk).
+
+    Args:
+        hote (str): Le nom d'hôte, en minuscules et sans port.
+
+    Returns:
+        str: Le domaine enregistrable, ou l'hôte lui-même pour une adresse IP,
+            un nom sans point (localhost) ou un suffixe public.
+    """
+    if _table is None:
+        charger_suffixes()
+    regles, generiques, exceptions = _table
+    if "." not in hote or est_adresse_ip(hote):
+        return hote
+    niveaux = hote.split(".")
+    for i in range(len(niveaux)):
+        suffixe = ".".join(niveaux[i:])
+        if suffixe in exceptions:
+            # Une exception désigne un domaine enregistrable sous un suffixe générique.
+            return suffixe
+        if suffixe in regles or ".".join(niveaux[i + 1:]) in generiques:
+            return ".".join(niveaux[i - 1:]) if i > 0 else hote
+    # Règle par défaut : le domaine de premier niveau est un suffixe public.
+    return ".".join(niveaux[-2:])
+
+
+def est_adresse_ip(hote):
+    """
+    Args:
+        hote (str): Le nom d'hôte.
+
+    Returns:
+        bool: Vrai si l'hôte est une adresse IPv4 ou IPv6.
+    """
+    try:
+        ipaddress.ip_address(hote)
+    except ValueError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=TAILLE_CACHE)
+def decomposer_lien(href):
+    """
+    Décompose un href, tel qu'il est écrit dans la page.
+
+    Args:
+        href (str): La valeur de l'attribut href.
+
+    Returns:
+        str: L'hôte du lien en minuscules, "" pour un lien relatif (qui reste sur l'hôte
+            de la page), ou None pour un lien qui ne mène à aucune page (mailto:, tel:...).
+    """
+    try:
+        morceaux = urlsplit(href.strip())
+        hote = morceaux.hostname
+    except ValueError:
+        return None
+    if morceaux.scheme in SCHEMAS_IGNORES:
+        return None
+    if morceaux.netloc:
+        return (hote or "").rstrip(".") or None
+    # Un schéma sans hôte (news:, urn:...) ne désigne pas une page web.
+    return None if morceaux.scheme else ""
+
+
+class ClassifieurLiens:
+    """
+    Classification des liens d'une page, par rapport à l'hôte de cette page.
+    """
+    def __init__(self, url_page, portee=PORTEE_DOMAINE):
+        """
+        Args:
+            url_page (str): L'URL de la page qui contient les liens. Un nom d'hôte
+                seul ("exemple.fr") est aussi accepté.
+            portee (str): PORTEE_DOMAINE pour considérer les sous-domaines comme internes,
+                PORTEE_HOTE pour n'accepter que l'hôte de la page.
+        """
+        if "//" not in url_page:
+            url_page = "//" + url_page
+        self.hote = decomposer_lien(url_page) or ""
+        self.portee = portee
+        self.site = domaine_enregistrable(self.hote) if portee == PORTEE_DOMAINE else self.hote
+
+    def site_du_lien(self, href):
+        """
+        Args:
+            href (str): La valeur de l'attribut href.
+
+        Returns:
+            str: Le site du lien (domaine enregistrable ou hôte, selon la portée),
+                ou None si le lien est ignoré.
+        """
+        hote = decomposer_lien(href)
+        if not hote:
+            return self.site if hote == "" else None
+        return domaine_enregistrable(hote) if self.portee == PORTEE_DOMAINE else hote
+
+    def est_interne(self, href):
+        """
+        Args:
+            href (str): La valeur de l'attribut href.
+
+        Returns:
+            bool: Vrai si le lien est interne, faux s'il est externe, None s'il est ignoré.
+        """
+        site = self.site_du_lien(href)
+        return None if site is None else site == self.site
+
+    def classer(self, liens):
+        """
+        Classe tous les liens d'une page en une passe.
+
+        Args:
+            liens (iterable): Les href de la page.
+
+        Returns:
+            tuple: Deux listes, les liens internes et les liens externes ; les liens ignorés n'y figurent pas.
+        """
+        internes, externes = [], []
+        site_page = self.site
+        par_domaine = self.portee == PORTEE_DOMAINE
+        for lien in liens:
+            hote = decomposer_lien(lien)
+            if hote is None:
+                continue
+            if hote == "":
+                internes.append(lien)
+            elif (domaine_enregistrable(hote) if par_domaine else hote) == site_page:
+                internes.append(lien)
+            else:
+                externes.append(lien)
+        return internes, externes
+
+
+def classer_liens(url_page, liens, portee=PORTEE_DOMAINE):
+    """
+    Classe les liens d'une page en liens internes et externes (voir ClassifieurLiens).
+
+    Args:
+        url_page (str): L'URL (ou le nom d'hôte) de la page qui contient les liens.
+        liens (iterable): Les href de la page.
+        portee (str): PORTEE_DOMAINE ou PORTEE_HOTE.
+
+    Returns:
+        tuple: Deux listes, les liens internes et les liens externes.
+    """
+    return ClassifieurLiens(url_page, portee).classer(liens)
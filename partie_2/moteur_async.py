@@ -0,0 +1,341 @@
+"""
+Moteur de récupération asynchrone (asyncio + aiohttp).
+
+Une seule boucle asyncio, exécutée dans un thread dédié, garde des centaines de requêtes
+en vol avec quelques connexions par hôte : le Crawler lui confie toutes les pages d'un niveau
+à la fois (MoteurAsync.recuperer_plusieurs) et ne garde ses threads que pour leur analyse.
+Les autres appelants (interface, audit d'une page) utilisent la méthode synchrone
+MoteurAsync.recuperer, qui attend le résultat de la coroutine correspondante.
+
+- Le nombre de connexions simultanées est borné au total et par hôte.
+- Les réponses 429 et 5xx, les délais dépassés et les connexions perdues sont retentés
+  avec une attente exponentielle aléatoire (« full jitter »), ou l'attente demandée par
+  l'en-tête Retry-After, comme avec reseau.ClientHttp (voir reglages_reseau).
+- Les redirections sont suivies et l'URL finale est retournée, pour classifier les liens
+  de la page par rapport à son véritable hôte.
+- Un corps de réponse plus grand que la taille maximale interrompt le téléchargement.
+- Les pages passent par le même cache disque que reseau.ClientHttp.
+
+Nécessite aiohttp. Le client qui récupère les pages se choisit avec projet.configurer_reseau :
+par défaut ("auto") ce moteur si aiohttp est installé, sinon reseau.ClientHttp.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import asyncio
+import atexit
+from concurrent.futures import as_completed
+import re
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import aiohttp
+from cache import CacheHttp
+import instrumentation
+import reglages_reseau
+from reglages_reseau import (CACHE_PAR_DEFAUT, DELAI_BASE, DELAI_MAX, MAX_REDIRECTIONS, NB_TENTATIVES,
+                             STATUTS_RETENTES, TAILLE_BLOC, TAILLE_MAX, TIMEOUT_CONNEXION, TIMEOUT_LECTURE,
+                             USER_AGENT)
+from reponses import ErreurRecuperation, Reponse, ReponseTropGrande
+###################################################################
+
+# Nombre maximal de connexions ouvertes, tous hôtes confondus.
+NB_CONNEXIONS = 256
+# Nombre maximal de connexions simultanées vers un même hôte.
+NB_PAR_HOTE = 8
+MOTIF_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+class MoteurAsync:
+    """
+    Récupération de pages par une boucle asyncio dédiée, utilisable depuis n'importe quel thread.
+    """
+    def __init__(self, nb_connexions=NB_CONNEXIONS, nb_par_hote=NB_PAR_HOTE,
+                 timeout_connexion=TIMEOUT_CONNEXION, timeout_lecture=TIMEOUT_LECTURE,
+                 nb_tentatives=NB_TENTATIVES, delai_base=DELAI_BASE, delai_max=DELAI_MAX,
+                 taille_max=TAILLE_MAX, user_agent=USER_AGENT, cache=CACHE_PAR_DEFAUT):
+        """
+        Args:
+            nb_connexions (int): Nombre maximal de connexions ouvertes.
+            nb_par_hote (int): Nombre maximal de connexions simultanées vers un même hôte.
+            timeout_connexion (float): Délai maximal d'établissement de la connexion, en secondes.
+            timeout_lecture (float): Délai maximal entre deux octets reçus, en secondes.
+            nb_tentatives (int): Nombre total de tentatives pour une page.
+            delai_base (float): Attente de base entre deux tentatives, en secondes.
+            delai_max (float): Attente maximale entre deux tentatives, Retry-After compris.
+            taille_max (int): Taille maximale d'un corps de réponse, en octets.
+            user_agent (str): L'en-tête User-Agent envoyé avec chaque requête.
+            cache (CacheHttp, optional): Le cache des pages. Par défaut le cache disque
+                standard ; None pour désactiver le cache.
+        """
+        self.nb_connexions = nb_connexions
+        self.nb_par_hote = nb_par_hote
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout_connexion, sock_read=timeout_lecture)
+        self.nb_tentatives = nb_tentatives
+        self.delai_base = delai_base
+        self.delai_max = delai_max
+        self.taille_max = taille_max
+        self.user_agent = user_agent
+        self.cache = CacheHttp() if cache is CACHE_PAR_DEFAUT else cache
+        self._boucle = None
+        self._thread = None
+        self._session = None
+        self._verrou = threading.Lock()
+
+    def _demarrer(self):
+        """
+        Démarre la boucle asyncio dans son thread, à la première utilisation.
+
+        Returns:
+            asyncio.AbstractEventLoop: La boucle du moteur.
+        """
+        with self._verrou:
+            if self._boucle is None:
+                boucle = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=boucle.run_forever, name="moteur-async", daemon=True)
+                self._thread.start()
+                self._boucle = boucle
+            return self._boucle
+
+    def _ouvrir_session(self):
+        """
+        Retourne la session HTTP, créée dans la boucle du moteur à la première requête.
+
+        Returns:
+            aiohttp.ClientSession: La session partagée par toutes les requêtes.
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.nb_connexions, limit_per_host=self.nb_par_hote),
+                timeout=self.timeout,
+                headers={"User-Agent": self.user_agent},
+            )
+        return self._session
+
+    def attente(self, tentative, retry_after=None):
+        """
+        Calcule l'attente avant une nouvelle tentative (voir reglages_reseau.attente).
+
+        Args:
+            tentative (int): Le numéro de la tentative qui vient d'échouer (0 pour la première).
+            retry_after (str, optional): La valeur de l'en-tête Retry-After de la réponse.
+
+        Returns:
+            float: L'attente en secondes.
+        """
+        return reglages_reseau.attente(tentative, retry_after, self.delai_base, self.delai_max)
+
+    async def _lire_corps(self, url, response):
+        """
+        Lit le corps d'une réponse par blocs, en s'arrêtant dès qu'il dépasse la taille maximale.
+
+        Returns:
+            bytes: Le corps de la réponse.
+
+        Raises:
+            ReponseTropGrande: Si le corps (annoncé ou reçu) dépasse la taille maximale.
+        """
+        if response.content_length is not None and response.content_length > self.taille_max:
+            raise ReponseTropGrande(url, f"{response.content_length} octets annoncés (maximum {self.taille_max})",
+                                    response.status)
+        corps = bytearray()
+        async for bloc in response.content.iter_chunked(TAILLE_BLOC):
+            corps += bloc
+            if len(corps) > self.taille_max:
+                raise ReponseTropGrande(url, f"plus de {self.taille_max} octets reçus", response.status)
+        return bytes(corps)
+
+    @staticmethod
+    def decoder(corps, charset):
+        """
+        Décode le corps d'une page : charset de l'en-tête Content-Type, sinon balise
+        <meta charset> du début de la page, sinon UTF-8.
+
+        Args:
+            corps (bytes): Le corps de la réponse.
+            charset (str): Le charset de l'en-tête Content-Type, ou None.
+
+        Returns:
+            str: Le code HTML de la page.
+        """
+        if not charset:
+            trouve = MOTIF_CHARSET.search(corps, 0, 2048)
+            charset = trouve.group(1).decode("ascii") if trouve else "utf-8"
+        try:
+            return corps.decode(charset, errors="replace")
+        except LookupError:
+            return corps.decode("utf-8", errors="replace")
+
+    async def recuperer_async(self, url, utiliser_cache=True, rafraichir=False, delai=0):
+        """
+        Récupère une page, avec nouvelles tentatives, redirections et cache.
+
+        Args:
+            url (str): L'URL de la page web.
+            utiliser_cache (bool): Si faux, le cache n'est ni lu ni mis à jour.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition puis remise en cache.
+            delai (float): Attente avant la première requête, en secondes (limite de débit par hôte).
+
+        Returns:
+            Reponse: La page, avec son URL finale après redirections.
+
+        Raises:
+            ErreurRecuperation: Si la page n'a pas pu être récupérée après toutes les tentatives.
+        """
+        utiliser_cache = utiliser_cache and self.cache is not None
+        # Lecture et écriture du cache SQLite hors de la boucle : elles ne bloquent pas les autres pages.
+        entree = await asyncio.to_thread(self.cache.lire, url) if utiliser_cache and not rafraichir else None
+        entetes = {}
+        if entree is not None:
+            if entree.etag:
+                entetes["If-None-Match"] = entree.etag
+            if entree.last_modified:
+                entetes["If-Modified-Since"] = entree.last_modified
+        session = self._ouvrir_session()
+        if delai > 0:
+            await asyncio.sleep(delai)
+        for tentative in range(self.nb_tentatives):
+            derniere = tentative + 1 == self.nb_tentatives
+            try:
+                async with session.get(url, headers=entetes, max_redirects=MAX_REDIRECTIONS) as response:
+                    url_finale = str(response.url)
+                    if response.status == 304 and entree is not None:
+                        return Reponse(url, url_finale, 304, entree.corps, 0)
+                    if response.status in STATUTS_RETENTES and not derniere:
+                        attente = self.attente(tentative, response.headers.get("Retry-After"))
+                    elif response.status >= 400:
+                        raise ErreurRecuperation(url, f"HTTP {response.status} {response.reason}", response.status)
+                    else:
+                        corps = await self._lire_corps(url, response)
+                        html = self.decoder(corps, response.charset)
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        if (utiliser_cache and (etag or last_modified)
+                                and "no-store" not in response.headers.get("Cache-Control", "")):
+                            await asyncio.to_thread(self.cache.ecrire, url, etag, last_modified, html)
+                        return Reponse(url, url_finale, response.status, html, len(corps))
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+                if derniere:
+                    raise ErreurRecuperation(url, f"{type(e).__name__} {e}".strip()) from e
+                attente = self.attente(tentative)
+            except aiohttp.ClientError as e:
+                # Trop de redirections, URL invalide... : une nouvelle tentative n'y changerait rien.
+                raise ErreurRecuperation(url, f"{type(e).__name__} {e}".strip()) from e
+            await asyncio.sleep(attente)
+
+    def recuperer(self, url, utiliser_cache=True, rafraichir=False):
+        """
+        Récupère une page et attend le résultat. Utilisable depuis plusieurs threads à la fois,
+        mais pas depuis la boucle du moteur elle-même.
+
+        Args:
+            url (str): L'URL de la page web.
+            utiliser_cache (bool): Si faux, le cache n'est ni lu ni mis à jour.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition puis remise en cache.
+
+        Returns:
+            Reponse: La page, avec son URL finale après redirections.
+        """
+        futur = asyncio.run_coroutine_threadsafe(self.recuperer_async(url, utiliser_cache, rafraichir),
+                                                 self._demarrer())
+        reponse = futur.result()
+        # Les octets sont comptés ici : la page mesurée est celle du thread appelant (voir instrumentation).
+        instrumentation.ajouter_octets(reponse.octets)
+        return reponse
+
+    def recuperer_plusieurs(self, urls, utiliser_cache=True, rafraichir=False, nb_en_vol=2 * NB_CONNEXIONS,
+                            attente=None):
+        """
+        Récupère une liste de pages et les produit dans leur ordre d'arrivée.
+
+        Args:
+            urls (iterable): Les URL des pages.
+            utiliser_cache (bool): Si faux, le cache n'est ni lu ni mis à jour.
+            rafraichir (bool): Si vrai, les pages sont retéléchargées sans condition.
+            nb_en_vol (int): Nombre maximal de requêtes lancées et pas encore lues.
+            attente (callable, optional): Appelée avec chaque URL au lancement de sa requête, retourne
+                le délai en secondes avant de l'envoyer ; le délai s'écoule dans la boucle du moteur,
+                sans retenir les autres requêtes.
+
+        Yields:
+            tuple: L'URL demandée et sa Reponse, ou l'exception qui a empêché de la récupérer.
+        """
+        boucle = self._demarrer()
+        urls = iter(urls)
+        en_vol = {}
+        while True:
+            for url in urls:
+                delai = attente(url) if attente is not None else 0
+                coroutine = self.recuperer_async(url, utiliser_cache, rafraichir, delai)
+                en_vol[asyncio.run_coroutine_threadsafe(coroutine, boucle)] = url
+                if len(en_vol) >= nb_en_vol:
+                    break
+            if not en_vol:
+                return
+            futur = next(as_completed(en_vol))
+            url = en_vol.pop(futur)
+            erreur = futur.exception()
+            yield url, futur.result() if erreur is None else erreur
+
+    def fermer(self):
+        """
+        Ferme la session HTTP, arrête la boucle du moteur et ferme le cache.
+        """
+        with self._verrou:
+            boucle, self._boucle = self._boucle, None
+        if boucle is not None:
+            if self._session is not None:
+                asyncio.run_coroutine_threadsafe(self._session.close(), boucle).result()
+                self._session = None
+            boucle.call_soon_threadsafe(boucle.stop)
+            self._thread.join()
+            boucle.close()
+        if self.cache is not None:
+            self.cache.fermer()
+
+
+_moteur = None
+_verrou = threading.Lock()
+
+
+def moteur_partage():
+    """
+    Retourne le moteur partagé, en le créant à la première utilisation.
+
+    Returns:
+        MoteurAsync: Le moteur partagé par toute l'application.
+    """
+    global _moteur
+    if _moteur is None:
+        with _verrou:
+            if _moteur is None:
+                _moteur = MoteurAsync()
+    return _moteur
+
+
+def configurer(**options):
+    """
+    Remplace le moteur partagé par un moteur configuré différemment.
+
+    Args:
+        **options: Les paramètres de MoteurAsync (nb_par_hote, nb_tentatives, taille_max, cache...).
+
+    Returns:
+        MoteurAsync: Le nouveau moteur partagé.
+    """
+    global _moteur
+    with _verrou:
+        ancien, _moteur = _moteur, MoteurAsync(**options)
+    if ancien is not None:
+        ancien.fermer()
+    return _moteur
+
+
+@atexit.register
+def _fermer_moteur():
+    """
+    Ferme proprement le moteur partagé à la sortie du programme (sessions et connexions ouvertes).
+    """
+    if _moteur is not None:
+        _moteur.fermer()
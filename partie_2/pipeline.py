@@ -0,0 +1,223 @@
+"""
+Chaîne d'analyse multi-processus.
+
+Le parsing HTML, l'extraction du texte et le comptage des mots sont du Python pur limité
+par le GIL : avec des threads, l'analyse n'occupe qu'un cœur. La PipelineAnalyse garde les
+téléchargements dans les threads du Crawler (attente réseau) et envoie le code HTML, regroupé
+par lots, à un pool de processus qui exécute UrlAudit.analyser_html. Les processus ne renvoient
+que des résultats compacts (jamais d'arbre HTML), regroupés dans le processus parent au fil de
+l'eau par AgregatSite.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from projet import UrlAudit
+###################################################################
+
+TAILLE_LOT = 8
+# Délai (en secondes) au bout duquel un lot incomplet est tout de même envoyé.
+DELAI_LOT = 0.05
+
+# Paramètres de l'analyse, fixés une fois par processus du pool (voir _initialiser_processus).
+_parasites = frozenset()
+_avec_occurrences = False
+_detecteur = None
+
+
+def _initialiser_processus(parasites, avec_occurrences, detecteur):
+    """
+    Initialise un processus du pool : les mots parasites et l'automate des cibles
+    ne sont transmis qu'une fois par processus.
+    """
+    global _parasites, _avec_occurrences, _detecteur
+    _parasites = parasites
+    _avec_occurrences = avec_occurrences
+    _detecteur = detecteur
+
+
+def analyser_lot(lot):
+    """
+    Analyse un lot de pages dans un processus du pool.
+
+    Args:
+        lot (list): Couples (url, html).
+
+    Returns:
+        list: Les résultats compacts des pages, dans l'ordre du lot. Une page dont l'analyse
+            échoue a un résultat réduit à son url et au message d'erreur.
+    """
+    resultats = []
+    for url, html in lot:
+        try:
+            resultat = UrlAudit.analyser_html(url, html, _parasites, detecteur=_detecteur)
+        except Exception as e:
+            resultats.append({"url": url, "erreur": str(e)})
+            continue
+        if not _avec_occurrences:
+            del resultat["occurrences"]
+        resultats.append(resultat)
+    return resultats
+
+
+class PipelineAnalyse:
+    """
+    Analyse de pages par un pool de processus, alimenté par lots.
+    """
+    def __init__(self, parasites, nb_processus=None, taille_lot=TAILLE_LOT, delai_lot=DELAI_LOT,
+                 avec_occurrences=False, detecteur=None):
+        """
+        Args:
+            parasites (set): Un ensemble de mots à exclure des mots-clés.
+            nb_processus (int, optional): Nombre de processus d'analyse. Par défaut le nombre de cœurs.
+            taille_lot (int): Nombre de pages envoyées ensemble à un processus.
+            delai_lot (float): Délai au bout duquel un lot incomplet est envoyé, en secondes.
+            avec_occurrences (bool): Si vrai, les résultats contiennent toutes les occurrences
+                des mots (nécessaire pour corpus.CorpusSite), sinon seulement les mots-clés.
+            detecteur (cibles.DetecteurCibles, optional): Les cibles recherchées dans chaque page.
+        """
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.nb_processus,
+            initializer=_initialiser_processus,
+            initargs=(frozenset(parasites), avec_occurrences, detecteur)
+        )
+        self._lot = []
+        self._minuteur = None
+        self._verrou = threading.Lock()
+
+    def soumettre(self, url, html):
+        """
+        Ajoute une page au lot en cours. Le lot part dès qu'il est plein, ou au bout de delai_lot.
+
+        Args:
+            url (str): L'URL de la page.
+            html (str): Le code HTML de la page.
+
+        Returns:
+            concurrent.futures.Future: Le futur résultat compact de la page.
+        """
+        futur = Future()
+        with self._verrou:
+            self._lot.append((url, html, futur))
+            if len(self._lot) >= self.taille_lot:
+                self._envoyer_lot()
+            elif self._minuteur is None:
+                self._minuteur = threading.Timer(self.delai_lot, self.vider)
+                self._minuteur.daemon = True
+                self._minuteur.start()
+        return futur
+
+    def analyser(self, url, html):
+        """
+        Analyse une page et attend son résultat. Utilisable comme traitement du Crawler,
+        depuis plusieurs threads à la fois.
+
+        Args:
+            url (str): L'URL de la page.
+            html (str): Le code HTML de la page.
+
+        Returns:
+            dict: Le résultat compact de la page.
+        """
+        return self.soumettre(url, html).result()
+
+    def vider(self):
+        """
+        Envoie immédiatement le lot en cours, même incomplet.
+        """
+        with self._verrou:
+            self._envoyer_lot()
+
+    def _envoyer_lot(self):
+        """
+        Envoie le lot en cours au pool de processus. Doit être appelée verrou pris.
+        """
+        if self._minuteur is not None:
+            self._minuteur.cancel()
+            self._minuteur = None
+        if not self._lot:
+            return
+        lot, self._lot = self._lot, []
+        futurs = [futur for _, _, futur in lot]
+        envoi = self._executor.submit(analyser_lot, [(url, html) for url, html, _ in lot])
+
+        def distribuer(envoi):
+            if envoi.exception() is not None:
+                for futur in futurs:
+                    futur.set_exception(envoi.exception())
+                return
+            for futur, resultat in zip(futurs, envoi.result()):
+                futur.set_result(resultat)
+
+        envoi.add_done_callback(distribuer)
+
+    def fermer(self):
+        """
+        Envoie le dernier lot et arrête le pool de processus.
+        """
+        self.vider()
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+class AgregatSite:
+    """
+    Synthèse d'un site, mise à jour à chaque résultat de page reçu, depuis plusieurs threads.
+    """
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.nb_pages = 0
+        self.nb_echecs = 0
+        self.nb_liens = 0
+        self.somme_percent_alt = 0
+        self.mots_cles = Counter()
+
+    def ajouter(self, resultat):
+        """
+        Ajoute le résultat compact d'une page à la synthèse.
+
+        Args:
+            resultat (dict): Le résultat de la page.
+        """
+        with self._verrou:
+            if "erreur" in resultat:
+                self.nb_echecs += 1
+                return
+            self.nb_pages += 1
+            self.nb_liens += len(resultat["liens"])
+            self.somme_percent_alt += resultat["percent_alt"]
+            self.mots_cles.update(resultat["mots_cles"])
+
+    def synthese(self, k=3):
+        """
+        Retourne la synthèse du site.
+
+        Args:
+            k (int): Le nombre de mots-clés du site à retourner.
+
+        Returns:
+            dict: Nombre de pages (analysées, en échec), nombre moyen de liens par page,
+                pourcentage moyen d'images avec attribut alt et mots-clés les plus fréquents du site.
+        """
+        with self._verrou:
+            return {
+                "nb_pages": self.nb_pages,
+                "nb_echecs": self.nb_echecs,
+                "liens_par_page": self.nb_liens / self.nb_pages if self.nb_pages else 0,
+                "percent_alt_moyen": self.somme_percent_alt / self.nb_pages if self.nb_pages else 0,
+                "mots_cles": dict(self.mots_cles.most_common(k)),
+            }
@@ -18,67 +18,262 @@ Le script se compose de plusieurs étapes :
 # -*- coding:utf-8 -*-
 ###################################################################
 # IMPORTS STANDARDS
-from collections import Counter
-import csv
-import re
-import requests
+import importlib.util
 from urllib.parse import urlparse
 ###################################################################
 ###################################################################
 # IMPORT SPECIFIQUE
-from bs4 import BeautifulSoup
+from extraction import ExtracteurFlux
+import instrumentation
+from liens import classer_liens
+import reglages_reseau
+from registre_parasites import registre_partage
+from texte import MOTIF_MOT, TextAnalyser  # noqa: F401 (réexportés : projet.TextAnalyser reste utilisable)
 ###################################################################
 
-class TextAnalyser:
-    @staticmethod
-    def compter_occurrences(texte):
+# BeautifulSoup, requests et aiohttp ne sont importés qu'à leur première utilisation (voir
+# PageDocument et UrlAudit.recuperer_page) : importer ce module ne charge aucune dépendance externe.
+# Le backend lxml est seulement détecté ici, sans être importé.
+PARSER_PAR_DEFAUT = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Nombre de mots-clés conservés dans le résultat d'analyse d'une page.
+NB_MOTS_CLES = 10
+BALISES_INTERTITRES = ["h1", "h2", "h3", "h4", "h5", "h6"]
+
+# Client de récupération des pages (voir reglages_reseau.MOTEURS et configurer_reseau).
+_moteur = "auto"
+# Fonctions de récupération des pages, choisies à la première utilisation (voir recuperateur).
+_recuperer = None
+_recuperer_plusieurs = None
+
+
+def configurer_reseau(moteur=None, **options):
+    """
+    Choisit le client qui récupère les pages de l'audit et applique les mêmes réglages aux deux clients.
+
+    - "auto" (par défaut) : le moteur asynchrone (moteur_async.MoteurAsync) si aiohttp est installé,
+      sinon le client HTTP (reseau.ClientHttp) ;
+    - "async" : le moteur asynchrone, ImportError si aiohttp n'est pas installé ;
+    - "requests" : toujours le client HTTP, une page par thread.
+
+    Le client HTTP reste utilisé pour robots.txt et l'analyse en flux quel que soit le moteur :
+    les réglages lui sont donc toujours appliqués. Les deux clients ont les mêmes nouvelles
+    tentatives, délais, User-Agent et taille maximale (voir reglages_reseau) ; la taille des pools
+    de connexions se règle avec reseau.configurer et moteur_async.configurer.
+
+    Args:
+        moteur (str, optional): "auto", "async" ou "requests" ; par défaut le moteur reste inchangé.
+        **options: Les réglages communs (reglages_reseau.OPTIONS_COMMUNES : timeout_lecture,
+            user_agent, nb_tentatives, taille_max, cache...).
+
+    Raises:
+        ValueError: Si le moteur est inconnu.
+        TypeError: Si une option n'est pas commune aux deux clients.
+    """
+    global _moteur, _recuperer, _recuperer_plusieurs
+    if moteur is not None and moteur not in reglages_reseau.MOTEURS:
+        raise ValueError(f"Moteur inconnu : {moteur} (attendu : {', '.join(reglages_reseau.MOTEURS)})")
+    inconnues = set(options) - set(reglages_reseau.OPTIONS_COMMUNES)
+    if inconnues:
+        raise TypeError(f"Options non communes aux deux clients : {', '.join(sorted(inconnues))}")
+    if moteur is not None:
+        _moteur = moteur
+    _recuperer = _recuperer_plusieurs = None
+    import reseau
+    reseau.configurer(**options)
+    recuperer = recuperateur()
+    if _recuperer_plusieurs is not None:
+        import moteur_async
+        moteur_async.configurer(**options)
+    return recuperer
+
+
+def recuperateur():
+    """
+    Retourne la fonction de récupération des pages, en important la pile réseau à la première
+    utilisation : le moteur choisi avec configurer_reseau, par défaut le moteur asynchrone si
+    aiohttp est installé, sinon le client HTTP partagé.
+
+    Returns:
+        callable: Appelée avec (url, utiliser_cache, rafraichir), retourne une reponses.Reponse.
+
+    Raises:
+        ImportError: Si le moteur "async" a été choisi et qu'aiohttp n'est pas installé.
+    """
+    global _recuperer, _recuperer_plusieurs
+    if _recuperer is None:
+        moteur_async = None
+        if _moteur != "requests":
+            try:
+                import moteur_async
+            except ImportError:
+                if _moteur == "async":
+                    raise
+        if moteur_async is not None:
+            _recuperer = lambda *args: moteur_async.moteur_partage().recuperer(*args)
+            _recuperer_plusieurs = lambda urls, **options: moteur_async.moteur_partage().recuperer_plusieurs(urls, **options)
+        else:
+            import reseau
+            _recuperer = lambda *args: reseau.client_partage().recuperer_page(*args)
+    return _recuperer
+
+
+def recuperateur_plusieurs(utiliser_cache=True, rafraichir=False):
+    """
+    Retourne la fonction de récupération concurrente des pages, si le moteur asynchrone est utilisé
+    (voir moteur_async.MoteurAsync.recuperer_plusieurs) : à passer au Crawler, qui garde alors
+    toutes les pages d'un niveau en vol au lieu d'une par thread.
+
+    Args:
+        utiliser_cache (bool): Si faux, les pages sont téléchargées sans passer par le cache.
+        rafraichir (bool): Si vrai, les pages sont retéléchargées sans condition et remises en cache.
+
+    Returns:
+        callable: Appelée avec (urls, attente), produit des couples (url, Reponse ou exception) ;
+            None avec le client HTTP, qui récupère une page par thread.
+    """
+    recuperateur()
+    if _recuperer_plusieurs is None:
+        return None
+    return lambda urls, attente=None: _recuperer_plusieurs(urls, utiliser_cache=utiliser_cache,
+                                                            rafraichir=rafraichir, attente=attente)
+
+
+def precharger():
+    """
+    Importe l'analyseur HTML et la pile réseau, par exemple depuis un thread pendant que
+    l'interface s'affiche, pour que la première page analysée ne paie pas ces imports.
+    """
+    import bs4  # noqa: F401
+    if PARSER_PAR_DEFAUT == "lxml":
+        import lxml.etree  # noqa: F401
+    recuperateur()
+
+
+def formater_synthese(url, synthese):
+    """
+    Met en forme la synthèse d'un site (voir pipeline.AgregatSite.synthese) sur une ligne.
+
+    Args:
+        url (str): L'URL de départ du site.
+        synthese (dict): La synthèse du site.
+
+    Returns:
+        str: La ligne de synthèse.
+    """
+    return (
+        f"Synthèse de {url} : {synthese['nb_pages']} pages analysées, {synthese['nb_echecs']} en échec, "
+        f"{synthese['liens_par_page']:.1f} liens par page, "
+        f"{synthese['percent_alt_moyen']:.0f} % d'images avec balise alt en moyenne, "
+        f"mots-clés du site : {', '.join(synthese['mots_cles']) or 'aucun'}"
+    )
+
+
+class PageDocument:
+    """
+    Page HTML analysée une seule fois.
+
+    L'arbre BeautifulSoup est construit à la création de l'objet, puis le texte, 
+    les listes d'attributs, le nombre de balises et la couverture d'attributs 
+    sont tous calculés à partir de ce même arbre. Les recherches de balises 
+    sont mémorisées : deux appels sur la même balise ne parcourent l'arbre qu'une fois.
+    """
+    def __init__(self, html, parser=None):
+        """
+        Args:
+            html (str): Le code HTML de la page.
+            parser (str, optional): Le backend BeautifulSoup à utiliser 
+                ("lxml", "html.parser"...). Par défaut lxml s'il est installé.
+        """
+        from bs4 import BeautifulSoup
+        self.parser = parser or PARSER_PAR_DEFAUT
+        self.soup = BeautifulSoup(html, self.parser)
+        self._texte = None
+        self._balises = {}
+
+    @property
+    def texte(self):
+        """
+        str: Le texte visible de la page.
         """
-        Compte les occurrences de chaque mot dans un texte.
+        if self._texte is None:
+            self._texte = self.soup.get_text()
+        return self._texte
+
+    @property
+    def titre(self):
+        """
+        str: Le texte de la balise <title>, vide si la page n'en a pas.
+        """
+        titres = self.balises("title")
+        return titres[0].get_text() if titres else ""
+
+    @property
+    def intertitres(self):
+        """
+        list: Le texte de chaque intertitre (h1 à h6), dans l'ordre du document.
+        """
+        return [balise.get_text(" ") for balise in self.soup.find_all(BALISES_INTERTITRES)]
+
+    def balises(self, balise):
+        """
+        Retourne toutes les balises d'un type donné.
 
         Args:
-            texte (str): Le texte à analyser.
+            balise (str): Le type de balise HTML à rechercher.
 
         Returns:
-            dict: Un dictionnaire où les clés sont des mots et les valeurs sont le nombre d'occurrences de chaque mot.
+            list: Les balises trouvées, dans l'ordre du document.
         """
-        mots = re.findall(r'\b\w+\b', texte.lower())
-        occurrences = Counter(mots)
-        return dict(sorted(occurrences.items(), key=lambda item: item[1], reverse=True))
-
+        if balise not in self._balises:
+            self._balises[balise] = self.soup.find_all(balise)
+        return self._balises[balise]
 
-    @staticmethod
-    def retirer_parasites(occurrences, parasites):
+    def compter_balises(self, balise):
         """
-        Retire les mots parasites d'un dictionnaire d'occurrences.
+        Compte les balises d'un type donné.
 
         Args:
-            occurrences (dict): Un dictionnaire d'occurrences de mots.
-            parasites (set): Un ensemble de mots à exclure.
+            balise (str): Le type de balise HTML à rechercher.
 
         Returns:
-            dict: Un dictionnaire d'occurrences nettoyé des mots parasites.
+            int: Le nombre de balises trouvées.
         """
-        return {mot: occurrences[mot] for mot in occurrences if mot.lower() not in parasites}
+        return len(self.balises(balise))
 
+    def extraire_attributs(self, balise, attribut):
+        """
+        Extrait les valeurs d'un attribut spécifique de toutes les balises d'un type donné.
 
-    @staticmethod
-    def recuperer_parasites(fichier):
+        Args:
+            balise (str): Le type de balise HTML à rechercher.
+            attribut (str): L'attribut dont la valeur doit être extraite.
+
+        Returns:
+            list: Une liste des valeurs de l'attribut pour chaque balise trouvée.
         """
-        Récupère une liste de mots parasites à partir d'un fichier CSV.
+        return [tag[attribut] for tag in self.balises(balise) if tag.has_attr(attribut)]
+
+    def percent_attributs(self, balise, attribut):
+        """
+        Calcule le pourcentage de balises d'un type donné qui portent un attribut.
 
         Args:
-            fichier (str): Le chemin du fichier CSV contenant les mots parasites.
+            balise (str): Le type de balise HTML à rechercher.
+            attribut (str): L'attribut recherché.
 
         Returns:
-            set: Un ensemble de mots parasites.
+            float: Le pourcentage d'occurrence de l'attribut.
         """
-        with open(fichier, newline='', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            mots_parasites = {row[0].lower() for row in reader}
-        return mots_parasites
+        tags = self.balises(balise)
+        if not tags:
+            return 0
+        balises_with_attributs = sum(1 for tag in tags if tag.has_attr(attribut))
+        return balises_with_attributs / len(tags) * 100
 
 class HtmlAnalyser:
     @staticmethod
+    @instrumentation.chronometre("nettoyer_html")
     def nettoyer_html(html):
         """
         Nettoie le HTML pour ne conserver que le texte visible.
@@ -89,10 +284,10 @@ class HtmlAnalyser:
         Returns:
             str: Le texte nettoyé extrait du HTML.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        return soup.get_text()
+        return PageDocument(html).texte
 
     @staticmethod
+    @instrumentation.chronometre("extraire_attributs")
     def extraire_attributs(html, balise, attribut):
         """
         Extrait les valeurs d'un attribut spécifique de toutes les balises d'un type donné dans un HTML.
@@ -105,8 +300,7 @@ class HtmlAnalyser:
         Returns:
             list: Une liste des valeurs de l'attribut pour chaque balise trouvée.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        return [tag[attribut] for tag in soup.find_all(balise) if tag.has_attr(attribut)]
+        return PageDocument(html).extraire_attributs(balise, attribut)
 
     @staticmethod
     def percent_attributs(html, balise, attribut):
@@ -121,12 +315,7 @@ class HtmlAnalyser:
         Returns:
             float: Le pourcentage d'occurrence de l'attribut.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        all_balises = len(soup.find_all(balise))
-        if all_balises == 0:
-            return 0
-        balises_with_attributs = len([tag[attribut] for tag in soup.find_all(balise) if tag.has_attr(attribut)])
-        return int(balises_with_attributs) / int(all_balises) * 100
+        return PageDocument(html).percent_attributs(balise, attribut)
 
 class UrlAudit:
     @staticmethod
@@ -144,70 +333,276 @@ class UrlAudit:
 
 
     @staticmethod
+    @instrumentation.chronometre("classifier_par_domaine")
     def classifier_par_domaine(domaine, urls):
         """
-        Classifie les URLs en internes et externes par rapport à un domaine donné.
+        Classifie les URLs en internes et externes par rapport à un domaine donné. 
+        Les hôtes sont comparés après décomposition des URLs : les liens relatifs sont internes, 
+        les sous-domaines du même domaine enregistrable aussi, et les liens mailto:, tel: 
+        ou javascript: sont ignorés (voir liens.ClassifieurLiens).
 
         Args:
-            domaine (str): Le nom de domaine de référence.
+            domaine (str): Le nom de domaine de référence, ou l'URL de la page qui contient les liens.
             urls (list): Une liste d'URLs à classifier.
 
         Returns:
             tuple: Deux listes, la première contenant les URLs internes et la deuxième les URLs externes.
         """
-        internes, externes = [], []
-        for url in urls:
-            if domaine in url:
-                internes.append(url)
-            else:
-                externes.append(url)
-        return internes, externes
+        return classer_liens(domaine, urls)
 
 
     @staticmethod
-    def recuperer_html(url):
+    @instrumentation.chronometre("recuperer_html")
+    def recuperer_page(url, utiliser_cache=True, rafraichir=False):
         """
-        Récupère le code HTML d'une page web à partir de son URL.
+        Récupère une page web à partir de son URL, en suivant les redirections.
+        La page passe par le client choisi avec configurer_reseau : par défaut le moteur asynchrone
+        partagé si aiohttp est installé (voir moteur_async.MoteurAsync), sinon le client HTTP partagé
+        (voir reseau.ClientHttp). Les deux clients retentent les réponses 429/5xx, limitent la taille
+        des pages, réutilisent les connexions d'une page à l'autre et relisent les pages inchangées
+        depuis le cache disque.
 
         Args:
             url (str): L'URL de la page web.
+            utiliser_cache (bool): Si faux, la page est téléchargée sans passer par le cache.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition et remise en cache.
+
+        Returns:
+            reseau.Reponse: La page, avec son URL finale après redirections.
+
+        Raises:
+            reseau.ErreurRecuperation: Si la page n'a pas pu être récupérée.
+        """
+        return recuperateur()(url, utiliser_cache, rafraichir)
+
+
+    @staticmethod
+    def recuperer_html(url, utiliser_cache=True, rafraichir=False):
+        """
+        Récupère le code HTML d'une page web à partir de son URL (voir recuperer_page).
+
+        Args:
+            url (str): L'URL de la page web.
+            utiliser_cache (bool): Si faux, la page est téléchargée sans passer par le cache.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition et remise en cache.
 
         Returns:
             str: Le code HTML de la page.
         """
-        response = requests.get(url, timeout=5)
-        return response.text
+        return UrlAudit.recuperer_page(url, utiliser_cache, rafraichir).html
 
 
-    def audit_page(self, url):
+    @staticmethod
+    def analyser_html(url, html, parasites, magasin=None, empreinte_parasites=None, reutiliser=True, detecteur=None):
+        """
+        Analyse le code HTML d'une page et retourne son résultat d'audit. 
+        Si un magasin de résultats est fourni, une page dont le contenu n'a pas changé 
+        n'est pas reparsée : son résultat stocké est réutilisé, et seuls ses mots-clés 
+        sont recalculés si la liste de mots parasites a changé.
+
+        Args:
+            url (str): L'URL de la page.
+            html (str): Le code HTML de la page.
+            parasites (set): Un ensemble de mots à exclure des mots-clés.
+            magasin (MagasinResultats, optional): Le stockage des résultats précédents.
+            empreinte_parasites (str, optional): L'empreinte de parasites, à calculer une fois par audit.
+            reutiliser (bool): Si faux, la page est réanalysée même si son résultat est stocké.
+            detecteur (cibles.DetecteurCibles, optional): Les mots-clés et expressions ciblés par l'utilisateur, 
+                recherchés dans le texte, le titre et les intertitres de la page. Le texte n'étant pas stocké, 
+                une page inchangée est réanalysée si ses statistiques pour ces cibles ne sont pas dans le magasin.
+
+        Returns:
+            dict: Le résultat de la page (url, occurrences, liens, percent_alt, mots_cles, 
+                et cibles si un détecteur est fourni).
+        """
+        if magasin is None:
+            # Les étapes portent le nom des fonctions publiques équivalentes (voir instrumentation).
+            with instrumentation.etape("nettoyer_html"):
+                document = PageDocument(html)
+                texte = document.texte
+            with instrumentation.etape("compter_occurrences"):
+                occurrences = TextAnalyser.compter_mots(texte)
+            with instrumentation.etape("extraire_attributs"):
+                liens = document.extraire_attributs('a', 'href')
+                percent_alt = document.percent_attributs('img', 'alt')
+            with instrumentation.etape("retirer_parasites"):
+                mots_cles = TextAnalyser.selectionner_mots_cles(occurrences, parasites, NB_MOTS_CLES)
+            resultat = {
+                "url": url,
+                "occurrences": occurrences,
+                "liens": liens,
+                "percent_alt": percent_alt,
+                "mots_cles": mots_cles,
+            }
+            if detecteur is not None:
+                with instrumentation.etape("rechercher_cibles"):
+                    resultat["cibles"] = detecteur.analyser(texte, document.titre, document.intertitres)
+            return resultat
+        if empreinte_parasites is None:
+            empreinte_parasites = magasin.empreinte_parasites(parasites)
+        hash_contenu = magasin.hash_contenu(html)
+        resultat = magasin.lire(url, hash_contenu, empreinte_parasites) if reutiliser else None
+        if resultat is not None and detecteur is not None:
+            resultat["cibles"] = magasin.lire_cibles(url, hash_contenu, detecteur.empreinte)
+            if resultat["cibles"] is None:
+                resultat = None
+        if resultat is None:
+            resultat = UrlAudit.analyser_html(url, html, parasites, detecteur=detecteur)
+            magasin.ecrire_page(url, hash_contenu, resultat["occurrences"], resultat["liens"], resultat["percent_alt"])
+            if detecteur is not None:
+                magasin.ecrire_cibles(url, hash_contenu, detecteur.empreinte, resultat["cibles"])
+        elif resultat["mots_cles"] is not None:
+            return resultat
+        else:
+            with instrumentation.etape("retirer_parasites"):
+                resultat["mots_cles"] = TextAnalyser.selectionner_mots_cles(resultat["occurrences"], parasites, NB_MOTS_CLES)
+        magasin.ecrire_mots_cles(url, hash_contenu, empreinte_parasites, resultat["mots_cles"])
+        return resultat
+
+
+    @staticmethod
+    def resumer_page(resultat, mots_cles_utilisateur):
+        """
+        Résume le résultat d'une page sous la forme présentée dans les rapports d'audit.
+
+        Args:
+            resultat (dict): Le résultat de la page, produit par analyser_html.
+            mots_cles_utilisateur (set): Les mots-clés sur lesquels l'utilisateur veut être référencé.
+
+        Returns:
+            dict: url, nombre de liens internes et externes, pourcentage d'images avec attribut alt, 
+                3 premiers mots-clés, présence d'un mot-clé de l'utilisateur parmi ces 3 premiers mots-clés, 
+                nombre de cibles trouvées dans le texte de la page et statistiques de chacune (cibles, 
+                voir cibles.DetecteurCibles.analyser) ; ces deux derniers valent None si la page a été 
+                analysée sans détecteur.
+        """
+        url = resultat["url"]
+        liens_internes, liens_externes = UrlAudit.classifier_par_domaine(UrlAudit.extraire_nom_domaine(url),
+                                                                         resultat["liens"])
+        trois_premiers = list(resultat["mots_cles"])[:3]
+        cibles = resultat.get("cibles")
+        return {
+            "url": url,
+            "nb_liens_internes": len(liens_internes),
+            "nb_liens_externes": len(liens_externes),
+            "percent_alt": resultat["percent_alt"],
+            "mots_cles": trois_premiers,
+            "presence_mots_cles": any(mot in trois_premiers for mot in mots_cles_utilisateur),
+            "nb_cibles_trouvees": sum(1 for stats in cibles.values() if stats["occurrences"]) if cibles is not None else None,
+            "cibles": cibles,
+        }
+
+
+    def audit_page(self, url, flux=False, utiliser_cache=True, rafraichir=False):
         """
         Réalise un audit de contenu d'une page web à partir de son URL.
 
         Args:
             url (str): L'URL de la page web à analyser.
+            flux (bool): Si vrai, la page est analysée en flux pendant son téléchargement 
+                (ExtracteurFlux) au lieu d'être parsée en entier : à réserver aux pages très lourdes. 
+                Le mode flux ne passe pas par le cache.
+            utiliser_cache (bool): Si faux, la page est téléchargée sans passer par le cache.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition et remise en cache.
 
         Affiche:
             Les résultats de l'analyse, y compris les mots clés, les liens entrants et sortants, et les balises alt des images.
         """
-        html = self.recuperer_html(url)
-        texte = HtmlAnalyser.nettoyer_html(html)
-        occurrences = TextAnalyser.compter_occurrences(texte)
-        mots_parasites = TextAnalyser.recuperer_parasites("parasites.csv")
-        mots_cles = TextAnalyser.retirer_parasites(occurrences, mots_parasites)
+        mots_parasites = registre_partage().mots()
+        if flux:
+            document = ExtracteurFlux.depuis_url(url)
+            mots_cles = TextAnalyser.selectionner_mots_cles(document.occurrences, mots_parasites)
+        else:
+            reponse = self.recuperer_page(url, utiliser_cache, rafraichir)
+            # Les liens sont classés par rapport à la page réellement obtenue, après redirections.
+            url = reponse.url_finale
+            document = PageDocument(reponse.html)
+            mots_cles = TextAnalyser.extraire_mots_cles(document.texte, mots_parasites)
         
         print("Mots clés avec les 3 premières valeurs d'occurrences :")
-        for mot, occ in list(mots_cles.items())[:3]:
+        for mot, occ in mots_cles.items():
             print(f"{mot}: {occ}")
         
-        liens = extraire_attributs(html, 'a', 'href')
-        liens_entrants, liens_sortants = self.classifier_par_domaine(extraire_nom_domaine(url), liens)
+        liens = document.extraire_attributs('a', 'href')
+        liens_entrants, liens_sortants = self.classifier_par_domaine(self.extraire_nom_domaine(url), liens)
         
         print(f"Nombre de liens entrants: {len(liens_entrants)}")
         print(f"Nombre de liens sortants: {len(liens_sortants)}")
         
-        alts = extraire_attributs(html, 'img', 'alt')
+        alts = document.extraire_attributs('img', 'alt')
         print(f"Présence de balises alt: {alts if alts else 'Non'}")
 
+    def audit_site(self, url, profondeur_max=1, nb_pages_max=500, tfidf=False, nb_processus=None):
+        """
+        Réalise l'audit de toutes les pages d'un site trouvées en l'explorant 
+        à partir d'une page de départ (voir crawler.Crawler).
+
+        Args:
+            url (str): L'URL de la page de départ.
+            profondeur_max (int): Profondeur maximale de l'exploration.
+            nb_pages_max (int): Nombre maximal de pages auditées.
+            tfidf (bool): Si vrai, affiche en fin d'audit les mots-clés distinctifs de chaque page 
+                (classement TF-IDF sur tout le site, voir corpus.CorpusSite ; nécessite NumPy et SciPy).
+            nb_processus (int, optional): Si renseigné, l'analyse des pages est répartie sur ce nombre 
+                de processus (voir pipeline.PipelineAnalyse) au lieu d'être faite par les threads de téléchargement.
+
+        Affiche:
+            Pour chaque page, les 3 premiers mots clés, le nombre de liens entrants et sortants 
+            et le pourcentage d'images avec une balise alt, puis la synthèse du site (voir pipeline.AgregatSite).
+        """
+        # Imports locaux : crawler et pipeline dépendent eux-mêmes de ce module.
+        from crawler import Crawler
+        from pipeline import AgregatSite
+        agregat = AgregatSite()
+        mots_parasites = registre_partage().mots()
+        if tfidf:
+            from corpus import CorpusSite
+            corpus = CorpusSite(mots_parasites)
+        pipeline = None
+        if nb_processus:
+            from pipeline import PipelineAnalyse
+            pipeline = PipelineAnalyse(mots_parasites, nb_processus, avec_occurrences=tfidf)
+
+        def traiter(url_page, html, profondeur):
+            if pipeline is not None:
+                resultat = pipeline.analyser(url_page, html)
+            else:
+                resultat = self.analyser_html(url_page, html, mots_parasites)
+            if "erreur" in resultat:
+                raise ValueError(resultat["erreur"])
+            agregat.ajouter(resultat)
+            if tfidf:
+                corpus.ajouter(url_page, resultat["occurrences"])
+            liens_entrants, liens_sortants = self.classifier_par_domaine(self.extraire_nom_domaine(url_page), resultat["liens"])
+            # Un seul print par page : les pages sont traitées par plusieurs threads.
+            print(
+                f"{url_page} (niveau {profondeur})\n"
+                f"  Mots clés : {', '.join(f'{mot}: {occ}' for mot, occ in list(resultat['mots_cles'].items())[:3])}\n"
+                f"  Nombre de liens entrants: {len(liens_entrants)}\n"
+                f"  Nombre de liens sortants: {len(liens_sortants)}\n"
+                f"  Pourcentage d'images avec balise alt: {resultat['percent_alt']} %"
+            )
+            return resultat["liens"]
+
+        def echec(url_page, profondeur, erreur):
+            agregat.ajouter({"url": url_page, "erreur": str(erreur)})
+            print(f"{url_page} (niveau {profondeur}) : échec ({erreur})")
+
+        # Avec un pool de processus, plus de threads que de processus gardent le pool occupé pendant les téléchargements.
+        nb_workers = 2 * nb_processus if nb_processus else 8
+        try:
+            crawler = Crawler(profondeur_max=profondeur_max, nb_pages_max=nb_pages_max, nb_workers=nb_workers,
+                              recuperer_plusieurs=recuperateur_plusieurs())
+            crawler.parcourir(url, traiter, echec=echec)
+        finally:
+            if pipeline is not None:
+                pipeline.fermer()
+        print(formater_synthese(url, agregat.synthese()))
+        if tfidf:
+            print("Mots-clés distinctifs du site (TF-IDF) :")
+            for url_page, termes in corpus.meilleurs_termes(3).items():
+                print(f"{url_page} : {', '.join(terme for terme, _ in termes)}")
+
 # Exemple d'utilisation
 if __name__ == "__main__":
     test_etape4()
@@ -0,0 +1,349 @@
+"""
+Rapports d'audit persistants.
+
+Chaque audit (une exploration lancée depuis l'application) est enregistré dans une base
+SQLite, avec le résumé de chacune de ses pages (voir UrlAudit.resumer_page) au fur et à
+mesure de l'audit. Une même base conserve tous les audits : le rapport d'un audit passé
+peut être relu, paginé ou exporté sans être gardé en mémoire.
+
+- La base est en mode WAL : les lectures (affichage, export) ne bloquent pas les écritures.
+- Les pages sont écrites par lots, dans une transaction par lot.
+- Les exports CSV, JSON et HTML lisent les pages au fil d'un curseur, sur une connexion dédiée.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import csv
+import html
+import json
+import os
+import sqlite3
+import threading
+import time
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from cache import DOSSIER_CACHE
+from cibles import formater_cibles
+###################################################################
+
+# Nombre de pages écrites par transaction.
+TAILLE_LOT = 200
+# Délai (en secondes) au-delà duquel un lot incomplet est tout de même écrit.
+DELAI_LOT = 1.0
+# Nombre de lignes lues à la fois par les exports.
+TAILLE_LECTURE = 500
+
+COLONNES = ["url", "profondeur", "nb_liens_internes", "nb_liens_externes",
+            "percent_alt", "mots_cles", "presence_mots_cles", "nb_cibles_trouvees", "cibles"]
+# Colonnes ajoutées à la table pages après sa création : ajoutées aux bases existantes à l'ouverture.
+COLONNES_AJOUTEES = {"nb_cibles_trouvees": "INTEGER", "cibles": "TEXT"}
+
+
+class BaseRapports:
+    """
+    Base SQLite des rapports d'audit, partageable entre threads.
+    """
+    def __init__(self, chemin=None, taille_lot=TAILLE_LOT, delai_lot=DELAI_LOT):
+        """
+        Args:
+            chemin (str, optional): Le fichier SQLite des rapports. Par défaut dans le dossier du cache.
+            taille_lot (int): Nombre de pages écrites par transaction.
+            delai_lot (float): Délai au-delà duquel un lot incomplet est écrit, en secondes.
+        """
+        if chemin is None:
+            os.makedirs(DOSSIER_CACHE, exist_ok=True)
+            chemin = os.path.join(DOSSIER_CACHE, "rapports.sqlite")
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        self._lot = []
+        self._debut_lot = 0
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False, timeout=30)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        # En WAL, synchronous=NORMAL reste cohérent après un arrêt brutal et évite un fsync par transaction.
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        with self._connexion:
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS audits ("
+                "id INTEGER PRIMARY KEY, url_depart TEXT, mots_cles TEXT, debut REAL, fin REAL, statut TEXT)"
+            )
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "id INTEGER PRIMARY KEY, audit INTEGER REFERENCES audits(id), "
+                "url TEXT, profondeur INTEGER, nb_liens_internes INTEGER, nb_liens_externes INTEGER, "
+                "percent_alt REAL, mots_cles TEXT, presence_mots_cles INTEGER, "
+                "nb_cibles_trouvees INTEGER, cibles TEXT)"
+            )
+            existantes = {ligne[1] for ligne in self._connexion.execute("PRAGMA table_info(pages)")}
+            for colonne, type_colonne in COLONNES_AJOUTEES.items():
+                if colonne not in existantes:
+                    self._connexion.execute(f"ALTER TABLE pages ADD COLUMN {colonne} {type_colonne}")
+            self._connexion.execute("CREATE INDEX IF NOT EXISTS pages_audit ON pages (audit, id)")
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS sections ("
+                "id INTEGER PRIMARY KEY, audit INTEGER REFERENCES audits(id), "
+                "titre TEXT, contenu TEXT)"
+            )
+
+    def nouvel_audit(self, url_depart, mots_cles):
+        """
+        Enregistre le début d'un audit.
+
+        Args:
+            url_depart (str): L'URL de la page de départ.
+            mots_cles (iterable): Les mots-clés souhaités par l'utilisateur.
+
+        Returns:
+            int: L'identifiant de l'audit.
+        """
+        with self._verrou, self._connexion:
+            return self._connexion.execute(
+                "INSERT INTO audits (url_depart, mots_cles, debut, statut) VALUES (?, ?, ?, 'en cours')",
+                (url_depart, ", ".join(sorted(mot for mot in mots_cles if mot)), time.time())
+            ).lastrowid
+
+    def ajouter_page(self, audit, resume, profondeur):
+        """
+        Ajoute le résumé d'une page au lot en cours ; le lot est écrit quand il est plein
+        ou quand il attend depuis plus de delai_lot. Peut être appelée depuis plusieurs threads.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            resume (dict): Le résumé de la page, produit par UrlAudit.resumer_page.
+            profondeur (int): Le niveau de la page dans l'exploration.
+        """
+        ligne = (audit, resume["url"], profondeur, resume["nb_liens_internes"], resume["nb_liens_externes"],
+                 resume["percent_alt"], json.dumps(resume["mots_cles"], ensure_ascii=False),
+                 int(resume["presence_mots_cles"]), resume.get("nb_cibles_trouvees"),
+                 json.dumps(resume["cibles"], ensure_ascii=False) if resume.get("cibles") is not None else None)
+        with self._verrou:
+            if not self._lot:
+                self._debut_lot = time.monotonic()
+            self._lot.append(ligne)
+            if len(self._lot) >= self.taille_lot or time.monotonic() - self._debut_lot >= self.delai_lot:
+                self._ecrire_lot()
+
+    def _ecrire_lot(self):
+        """
+        Écrit le lot en cours dans une seule transaction. Doit être appelée verrou pris.
+        """
+        if not self._lot:
+            return
+        lot, self._lot = self._lot, []
+        with self._connexion:
+            self._connexion.executemany(
+                "INSERT INTO pages (audit, url, profondeur, nb_liens_internes, nb_liens_externes, "
+                "percent_alt, mots_cles, presence_mots_cles, nb_cibles_trouvees, cibles) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", lot
+            )
+
+    def valider(self):
+        """
+        Écrit immédiatement le lot en cours, même incomplet.
+        """
+        with self._verrou:
+            self._ecrire_lot()
+
+    def ajouter_section(self, audit, titre, contenu):
+        """
+        Ajoute au rapport une section de texte libre (classement TF-IDF, mesures...).
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            titre (str): Le titre de la section.
+            contenu (str): Le texte de la section.
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute("INSERT INTO sections (audit, titre, contenu) VALUES (?, ?, ?)",
+                                    (audit, titre, contenu))
+
+    def terminer_audit(self, audit, statut="terminé"):
+        """
+        Écrit les dernières pages d'un audit et enregistre sa fin.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            statut (str): "terminé", "annulé" ou "échec".
+        """
+        with self._verrou:
+            self._ecrire_lot()
+            with self._connexion:
+                self._connexion.execute("UPDATE audits SET fin = ?, statut = ? WHERE id = ?",
+                                        (time.time(), statut, audit))
+
+    def audits(self, audit=None):
+        """
+        Args:
+            audit (int, optional): L'identifiant d'un audit, pour ne retourner que celui-ci.
+
+        Returns:
+            list: Les audits enregistrés, du plus récent au plus ancien, sous forme de dictionnaires
+                (id, url_depart, mots_cles, debut, fin, statut, nb_pages).
+        """
+        self.valider()
+        with self._verrou:
+            curseur = self._connexion.execute(
+                "SELECT a.id, a.url_depart, a.mots_cles, a.debut, a.fin, a.statut, "
+                "(SELECT COUNT(*) FROM pages p WHERE p.audit = a.id) FROM audits a "
+                "WHERE ? IS NULL OR a.id = ? ORDER BY a.id DESC", (audit, audit)
+            )
+            noms = [description[0] for description in curseur.description[:-1]] + ["nb_pages"]
+            return [dict(zip(noms, ligne)) for ligne in curseur.fetchall()]
+
+    def compter_pages(self, audit):
+        """
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Returns:
+            int: Le nombre de pages enregistrées pour l'audit.
+        """
+        self.valider()
+        with self._verrou:
+            return self._connexion.execute("SELECT COUNT(*) FROM pages WHERE audit = ?", (audit,)).fetchone()[0]
+
+    def pages(self, audit, decalage=0, limite=50, tri=None, decroissant=False):
+        """
+        Retourne une page de résultats d'un audit, dans l'ordre d'arrivée ou triée sur une colonne.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            decalage (int): Le nombre de pages à sauter.
+            limite (int): Le nombre maximal de pages retournées.
+            tri (str, optional): La colonne de tri (voir COLONNES) ; par défaut l'ordre d'arrivée.
+            decroissant (bool): Si vrai, le tri est décroissant.
+
+        Returns:
+            list: Les résumés des pages (voir COLONNES).
+
+        Raises:
+            ValueError: Si la colonne de tri n'existe pas.
+        """
+        if tri is not None and tri not in COLONNES:
+            raise ValueError(f"Colonne de tri inconnue : {tri}")
+        ordre = f"{tri} {'DESC' if decroissant else 'ASC'}, id" if tri is not None else "id"
+        self.valider()
+        with self._verrou:
+            lignes = self._connexion.execute(
+                f"SELECT {', '.join(COLONNES)} FROM pages WHERE audit = ? ORDER BY {ordre} LIMIT ? OFFSET ?",
+                (audit, limite, decalage)
+            ).fetchall()
+        return [self._resume(ligne) for ligne in lignes]
+
+    def sections(self, audit):
+        """
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Returns:
+            list: Les sections de texte libre de l'audit, sous forme de couples (titre, contenu).
+        """
+        with self._verrou:
+            return self._connexion.execute(
+                "SELECT titre, contenu FROM sections WHERE audit = ? ORDER BY id", (audit,)
+            ).fetchall()
+
+    @staticmethod
+    def _resume(ligne):
+        """
+        Reconstitue le résumé d'une page à partir d'une ligne de la table pages.
+        """
+        resume = dict(zip(COLONNES, ligne))
+        resume["mots_cles"] = json.loads(resume["mots_cles"])
+        resume["presence_mots_cles"] = bool(resume["presence_mots_cles"])
+        resume["cibles"] = json.loads(resume["cibles"]) if resume["cibles"] is not None else None
+        return resume
+
+    def parcourir_pages(self, audit):
+        """
+        Parcourt toutes les pages d'un audit au fil d'un curseur, sur une connexion dédiée :
+        les écritures en cours ne sont pas bloquées et les pages ne sont jamais toutes en mémoire.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+
+        Yields:
+            dict: Le résumé de chaque page (voir COLONNES).
+        """
+        self.valider()
+        connexion = sqlite3.connect(self.chemin, timeout=30)
+        try:
+            curseur = connexion.execute(
+                f"SELECT {', '.join(COLONNES)} FROM pages WHERE audit = ? ORDER BY id", (audit,)
+            )
+            while True:
+                lignes = curseur.fetchmany(TAILLE_LECTURE)
+                if not lignes:
+                    break
+                for ligne in lignes:
+                    yield self._resume(ligne)
+        finally:
+            connexion.close()
+
+    def exporter_csv(self, audit, fichier):
+        """
+        Exporte les pages d'un audit au format CSV.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            fichier (file): Le fichier texte de sortie (ouvert avec newline="").
+        """
+        ecrivain = csv.DictWriter(fichier, fieldnames=COLONNES)
+        ecrivain.writeheader()
+        for resume in self.parcourir_pages(audit):
+            ecrivain.writerow(dict(resume, mots_cles=", ".join(resume["mots_cles"]),
+                                   cibles=json.dumps(resume["cibles"], ensure_ascii=False) if resume["cibles"] else ""))
+
+    def exporter_json(self, audit, fichier):
+        """
+        Exporte un audit au format JSON : ses informations, ses pages et ses sections.
+        Le tableau des pages est écrit élément par élément.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            fichier (file): Le fichier texte de sortie.
+        """
+        informations = (self.audits(audit) or [{"id": audit}])[0]
+        fichier.write(json.dumps(informations, ensure_ascii=False)[:-1] + ', "pages": [')
+        for i, resume in enumerate(self.parcourir_pages(audit)):
+            fichier.write(("," if i else "") + "\n  " + json.dumps(resume, ensure_ascii=False))
+        sections = [{"titre": titre, "contenu": contenu} for titre, contenu in self.sections(audit)]
+        fichier.write('\n], "sections": ' + json.dumps(sections, ensure_ascii=False) + "}\n")
+
+    def exporter_html(self, audit, fichier):
+        """
+        Exporte un audit sous forme de page HTML autonome, avec un tableau des pages.
+
+        Args:
+            audit (int): L'identifiant de l'audit.
+            fichier (file): Le fichier texte de sortie.
+        """
+        informations = (self.audits(audit) or [{"url_depart": "", "mots_cles": ""}])[0]
+        fichier.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>Audit de {html.escape(informations['url_depart'])}</title>"
+            "<style>table { border-collapse: collapse; } td, th { border: 1px solid #999; padding: 2px 6px; }</style>"
+            f"</head><body>\n<h1>Audit de {html.escape(informations['url_depart'])}</h1>\n"
+            f"<p>Mots-clés souhaités : {html.escape(informations['mots_cles'])}</p>\n<table>\n<tr>"
+            + "".join(f"<th>{colonne}</th>" for colonne in COLONNES) + "</tr>\n"
+        )
+        for resume in self.parcourir_pages(audit):
+            valeurs = dict(resume, mots_cles=", ".join(resume["mots_cles"]),
+                           presence_mots_cles="Oui" if resume["presence_mots_cles"] else "Non",
+                           nb_cibles_trouvees="" if resume["nb_cibles_trouvees"] is None else resume["nb_cibles_trouvees"],
+                           cibles=formater_cibles(resume["cibles"]) if resume["cibles"] else "")
+            fichier.write("<tr>" + "".join(f"<td>{html.escape(str(valeurs[colonne]))}</td>"
+                                           for colonne in COLONNES) + "</tr>\n")
+        fichier.write("</table>\n")
+        for titre, contenu in self.sections(audit):
+            fichier.write(f"<h2>{html.escape(titre)}</h2>\n<pre>{html.escape(contenu)}</pre>\n")
+        fichier.write("</body></html>\n")
+
+    def fermer(self):
+        """
+        Écrit le lot en cours et ferme la base des rapports.
+        """
+        self.valider()
+        self._connexion.close()
@@ -0,0 +1,168 @@
+"""
+Registre en mémoire des listes de mots parasites.
+
+Les listes sont lues une seule fois puis conservées sous forme de frozenset ; un fichier
+n'est relu que si sa date de modification a changé, et cette date n'est vérifiée qu'à
+intervalle régulier : un audit en lot ne touche donc plus le disque pour les mots parasites.
+
+Plusieurs listes nommées peuvent être enregistrées pour une même langue (mots outils,
+vocabulaire de navigation...) : elles sont fusionnées au chargement.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import csv
+import os
+import threading
+import time
+###################################################################
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+FICHIER_PAR_DEFAUT = os.path.join(DOSSIER, "parasites.csv")
+LANGUE_PAR_DEFAUT = "fr"
+# Intervalle minimal (en secondes) entre deux vérifications de la date de modification des fichiers.
+INTERVALLE_VERIFICATION = 5
+
+
+class RegistreParasites:
+    """
+    Listes de mots parasites nommées, par langue, rechargées à chaud.
+    """
+    def __init__(self, intervalle_verification=INTERVALLE_VERIFICATION):
+        """
+        Args:
+            intervalle_verification (float): Intervalle minimal entre deux vérifications des fichiers.
+        """
+        self.intervalle_verification = intervalle_verification
+        self._listes = {}
+        self._fusions = {}
+        self._derniere_verification = 0
+        self._verrou = threading.Lock()
+
+    @staticmethod
+    def lire_fichier(chemin):
+        """
+        Lit une liste de mots parasites (première colonne d'un fichier CSV),
+        en ignorant les lignes vides.
+
+        Args:
+            chemin (str): Le chemin du fichier CSV.
+
+        Returns:
+            frozenset: Les mots parasites, en minuscules.
+        """
+        with open(chemin, newline='', encoding='utf-8') as f:
+            return frozenset(row[0].strip().lower() for row in csv.reader(f) if row and row[0].strip())
+
+    def enregistrer(self, nom, chemin, langue=LANGUE_PAR_DEFAUT):
+        """
+        Ajoute (ou remplace) une liste nommée et la charge immédiatement.
+
+        Args:
+            nom (str): Le nom de la liste.
+            chemin (str): Le chemin du fichier CSV de la liste.
+            langue (str): La langue de la liste.
+        """
+        with self._verrou:
+            self._listes[nom] = {
+                "chemin": chemin,
+                "langue": langue,
+                "mtime": os.stat(chemin).st_mtime_ns,
+                "mots": self.lire_fichier(chemin),
+            }
+            self._fusions.pop(langue, None)
+            self._fusions.pop(None, None)
+
+    def chemin(self, nom):
+        """
+        Retourne le chemin du fichier d'une liste nommée.
+
+        Args:
+            nom (str): Le nom de la liste.
+
+        Returns:
+            str: Le chemin du fichier CSV.
+        """
+        return self._listes[nom]["chemin"]
+
+    def _recharger_si_modifie(self):
+        """
+        Relit les fichiers dont la date de modification a changé.
+        Doit être appelée verrou pris.
+        """
+        maintenant = time.monotonic()
+        if maintenant - self._derniere_verification < self.intervalle_verification:
+            return
+        self._derniere_verification = maintenant
+        for liste in self._listes.values():
+            try:
+                mtime = os.stat(liste["chemin"]).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if mtime != liste["mtime"]:
+                liste["mtime"] = mtime
+                liste["mots"] = self.lire_fichier(liste["chemin"])
+                self._fusions.pop(liste["langue"], None)
+                self._fusions.pop(None, None)
+
+    def mots(self, langue=LANGUE_PAR_DEFAUT):
+        """
+        Retourne les mots parasites d'une langue, toutes listes confondues.
+
+        Args:
+            langue (str): La langue voulue, ou None pour fusionner toutes les langues.
+
+        Returns:
+            frozenset: Les mots parasites.
+        """
+        with self._verrou:
+            self._recharger_si_modifie()
+            fusion = self._fusions.get(langue)
+            if fusion is None:
+                fusion = frozenset().union(*(
+                    liste["mots"] for liste in self._listes.values()
+                    if langue is None or liste["langue"] == langue
+                ))
+                self._fusions[langue] = fusion
+            return fusion
+
+    def mettre_a_jour(self, nom, mots):
+        """
+        Remplace le contenu d'une liste nommée, dans le registre et dans son fichier.
+
+        Args:
+            nom (str): Le nom de la liste.
+            mots (iterable): Les nouveaux mots parasites.
+        """
+        mots = [mot.strip() for mot in mots if mot.strip()]
+        with self._verrou:
+            liste = self._listes[nom]
+            with open(liste["chemin"], 'w', encoding='utf-8') as f:
+                for mot in mots:
+                    f.write(mot + "\n")
+            liste["mtime"] = os.stat(liste["chemin"]).st_mtime_ns
+            liste["mots"] = frozenset(mot.lower() for mot in mots)
+            self._fusions.pop(liste["langue"], None)
+            self._fusions.pop(None, None)
+
+
+_registre = None
+_verrou = threading.Lock()
+
+
+def registre_partage():
+    """
+    Retourne le registre partagé, créé à la première utilisation avec la liste
+    "parasites" (fichier parasites.csv à côté de ce module).
+
+    Returns:
+        RegistreParasites: Le registre partagé par toute l'application.
+    """
+    global _registre
+    if _registre is None:
+        with _verrou:
+            if _registre is None:
+                registre = RegistreParasites()
+                registre.enregistrer("parasites", FICHIER_PAR_DEFAUT)
+                _registre = registre
+    return _registre
@@ -0,0 +1,86 @@
+"""
+Réglages communs aux deux clients HTTP de l'audit (reseau.ClientHttp et moteur_async.MoteurAsync).
+
+Les deux clients lisent ici leurs valeurs par défaut (délais, User-Agent, taille maximale,
+nouvelles tentatives) et appliquent la même politique de nouvelles tentatives : les réponses
+429 et 5xx, les délais dépassés et les connexions perdues sont retentés avec une attente
+exponentielle aléatoire (« full jitter »), ou l'attente demandée par l'en-tête Retry-After.
+
+Ce module ne dépend que de la bibliothèque standard : le moteur asynchrone l'importe sans
+charger requests. Le choix du client utilisé pour récupérer les pages (MOTEURS) et la
+configuration des deux clients à la fois se font avec projet.configurer_reseau.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+###################################################################
+
+USER_AGENT = "AuditWebsites/1.0 (+audit SEO)"
+TIMEOUT_CONNEXION = 3.05
+TIMEOUT_LECTURE = 5
+# Taille maximale d'un corps de réponse, en octets : au-delà, le téléchargement est interrompu.
+TAILLE_MAX = 10 * 1024 * 1024
+TAILLE_BLOC = 64 * 1024
+NB_TENTATIVES = 4
+# Attente maximale avant la nouvelle tentative n (en secondes) : min(DELAI_MAX, DELAI_BASE * 2 ** n).
+DELAI_BASE = 0.5
+DELAI_MAX = 30
+STATUTS_RETENTES = {429, 500, 502, 503, 504}
+MAX_REDIRECTIONS = 10
+# Valeur par défaut du paramètre cache des clients : utilise le cache disque par défaut.
+CACHE_PAR_DEFAUT = object()
+
+# Clients de récupération des pages : "auto" utilise le moteur asynchrone si aiohttp est installé,
+# "async" l'exige, "requests" utilise toujours reseau.ClientHttp (une page par thread).
+MOTEURS = ("auto", "async", "requests")
+# Paramètres acceptés par les deux clients, avec le même sens (voir projet.configurer_reseau).
+OPTIONS_COMMUNES = ("timeout_connexion", "timeout_lecture", "user_agent", "taille_max",
+                    "nb_tentatives", "delai_base", "delai_max", "cache")
+
+
+def lire_retry_after(valeur):
+    """
+    Lit un en-tête Retry-After, exprimé en secondes ou sous forme de date HTTP.
+
+    Args:
+        valeur (str): La valeur de l'en-tête.
+
+    Returns:
+        float: L'attente demandée en secondes, ou None si l'en-tête est absent ou illisible.
+    """
+    if not valeur:
+        return None
+    try:
+        return max(0.0, float(valeur))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(valeur)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+def attente(tentative, retry_after=None, delai_base=DELAI_BASE, delai_max=DELAI_MAX):
+    """
+    Calcule l'attente avant une nouvelle tentative.
+
+    Args:
+        tentative (int): Le numéro de la tentative qui vient d'échouer (0 pour la première).
+        retry_after (str, optional): La valeur de l'en-tête Retry-After de la réponse.
+        delai_base (float): Attente de base entre deux tentatives, en secondes.
+        delai_max (float): Attente maximale entre deux tentatives, Retry-After compris.
+
+    Returns:
+        float: L'attente en secondes : celle demandée par Retry-After si elle est lisible,
+            sinon un tirage uniforme entre 0 et min(delai_max, delai_base * 2 ** tentative).
+    """
+    demandee = lire_retry_after(retry_after)
+    if demandee is not None:
+        return min(demandee, delai_max)
+    return random.uniform(0, min(delai_max, delai_base * 2 ** tentative))
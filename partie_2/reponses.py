@@ -0,0 +1,38 @@
+"""
+Types partagés par les clients HTTP (reseau, moteur_async) et par leurs utilisateurs.
+
+Ce module ne dépend que de la bibliothèque standard : les modules qui ont seulement besoin
+de reconnaître une réponse ou une erreur de récupération (distribue...) peuvent l'importer
+sans charger requests ni aiohttp.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import namedtuple
+###################################################################
+
+# Page récupérée : URL demandée, URL finale après redirections, statut HTTP,
+# code HTML et nombre d'octets reçus (0 si le corps vient du cache).
+Reponse = namedtuple("Reponse", ["url", "url_finale", "statut", "html", "octets"])
+
+
+class ErreurRecuperation(Exception):
+    """
+    Échec définitif de la récupération d'une page (statut d'erreur, délai dépassé...).
+    """
+    def __init__(self, url, message, statut=None):
+        """
+        Args:
+            url (str): L'URL demandée.
+            message (str): La cause de l'échec.
+            statut (int, optional): Le statut HTTP de la dernière réponse, s'il y en a eu une.
+        """
+        super().__init__(message)
+        self.url = url
+        self.statut = statut
+
+
+class ReponseTropGrande(ErreurRecuperation):
+    """
+    Téléchargement interrompu : le corps de la réponse dépasse la taille maximale.
+    """
@@ -0,0 +1,254 @@
+"""
+Accès réseau partagé pour l'audit.
+
+Ce module fournit un client HTTP basé sur une requests.Session unique, dont les
+connexions sont conservées (keep-alive) dans un pool par hôte : toutes les pages
+d'un même site réutilisent les mêmes connexions TCP/TLS au lieu de payer une
+nouvelle poignée de main à chaque page.
+
+Les pages peuvent être conservées dans un cache disque (voir cache.CacheHttp) et
+revalidées par requête conditionnelle : une page inchangée ne coûte qu'une réponse 304.
+Le corps des réponses est lu en flux et le téléchargement est interrompu au-delà de
+TAILLE_MAX octets (ReponseTropGrande), et les réponses 429 et 5xx, les délais dépassés et
+les connexions perdues sont retentés, comme dans le moteur asynchrone : les deux clients
+partagent leurs réglages et leur politique de nouvelles tentatives (voir reglages_reseau).
+
+Le client partagé est créé à la première utilisation et peut être reconfiguré
+(taille du pool, délais, User-Agent, cache) avec configurer(). Il sert toujours à lire
+robots.txt et les pages analysées en flux ; il ne récupère les pages de l'audit qu'avec
+le moteur "requests" (ou "auto" sans aiohttp) : pour régler le client qui récupère les
+pages, quel qu'il soit, utiliser projet.configurer_reseau.
+
+Reponse et ErreurRecuperation sont définies dans reponses, sans dépendance externe, et
+partagées avec le moteur asynchrone (voir moteur_async) ; elles restent accessibles ici.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import threading
+import time
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import requests
+from requests.adapters import HTTPAdapter
+from cache import CacheHttp
+import instrumentation
+import reglages_reseau
+from reglages_reseau import (CACHE_PAR_DEFAUT, DELAI_BASE, DELAI_MAX, MAX_REDIRECTIONS, NB_TENTATIVES,  # noqa: F401
+                             STATUTS_RETENTES, TAILLE_BLOC, TAILLE_MAX, TIMEOUT_CONNEXION, TIMEOUT_LECTURE,
+                             USER_AGENT)
+from reponses import ErreurRecuperation, Reponse, ReponseTropGrande  # noqa: F401 (réexportées)
+try:
+    import brotli  # noqa: F401 (urllib3 décode "br" s'il est installé)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+###################################################################
+
+# Nombre d'hôtes distincts dont le pool est conservé.
+NB_HOTES = 10
+# Nombre de connexions conservées par hôte : au moins le nombre de threads d'analyse.
+TAILLE_POOL = 16
+# Erreurs de transport retentées, comme asyncio.TimeoutError et les connexions perdues du moteur asynchrone.
+ERREURS_RETENTEES = (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError)
+
+class ClientHttp:
+    """
+    Client HTTP à connexions persistantes, partageable entre threads.
+    """
+    def __init__(self, taille_pool=TAILLE_POOL, nb_hotes=NB_HOTES, timeout_connexion=TIMEOUT_CONNEXION,
+                 timeout_lecture=TIMEOUT_LECTURE, user_agent=USER_AGENT, cache=CACHE_PAR_DEFAUT,
+                 taille_max=TAILLE_MAX, nb_tentatives=NB_TENTATIVES, delai_base=DELAI_BASE, delai_max=DELAI_MAX):
+        """
+        Args:
+            taille_pool (int): Nombre de connexions conservées par hôte.
+            nb_hotes (int): Nombre d'hôtes dont le pool de connexions est conservé.
+            timeout_connexion (float): Délai maximal d'établissement de la connexion, en secondes.
+            timeout_lecture (float): Délai maximal entre deux octets reçus, en secondes.
+            user_agent (str): L'en-tête User-Agent envoyé avec chaque requête.
+            cache (CacheHttp, optional): Le cache des pages. Par défaut le cache disque 
+                standard ; None pour désactiver le cache.
+            taille_max (int): Taille maximale d'un corps de réponse, en octets.
+            nb_tentatives (int): Nombre total de tentatives pour une page.
+            delai_base (float): Attente de base entre deux tentatives, en secondes.
+            delai_max (float): Attente maximale entre deux tentatives, Retry-After compris.
+        """
+        self.cache = CacheHttp() if cache is CACHE_PAR_DEFAUT else cache
+        self.taille_max = taille_max
+        self.nb_tentatives = nb_tentatives
+        self.delai_base = delai_base
+        self.delai_max = delai_max
+        self.timeout = (timeout_connexion, timeout_lecture)
+        self.session = requests.Session()
+        self.session.max_redirects = MAX_REDIRECTIONS
+        # pool_block : au-delà de taille_pool, un thread attend une connexion libre
+        # plutôt que d'en ouvrir une nouvelle qui serait jetée après usage.
+        adaptateur = HTTPAdapter(pool_connections=nb_hotes, pool_maxsize=taille_pool, pool_block=True)
+        self.session.mount("http://", adaptateur)
+        self.session.mount("https://", adaptateur)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+
+    def get(self, url, **kwargs):
+        """
+        Envoie une requête GET en réutilisant les connexions du pool.
+
+        Args:
+            url (str): L'URL demandée.
+            **kwargs: Options supplémentaires transmises à requests (stream, headers...).
+
+        Returns:
+            requests.Response: La réponse HTTP.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def _lire_corps(self, url, response):
+        """
+        Lit le corps d'une réponse reçue en flux, en s'arrêtant dès qu'il dépasse la taille maximale.
+
+        Returns:
+            bytes: Le corps de la réponse (décompressé).
+
+        Raises:
+            ReponseTropGrande: Si le corps (annoncé ou reçu) dépasse la taille maximale.
+        """
+        annonce = response.headers.get("Content-Length", "")
+        if annonce.isdigit() and int(annonce) > self.taille_max:
+            raise ReponseTropGrande(url, f"{annonce} octets annoncés (maximum {self.taille_max})",
+                                    response.status_code)
+        corps = bytearray()
+        for bloc in response.iter_content(TAILLE_BLOC):
+            corps += bloc
+            if len(corps) > self.taille_max:
+                raise ReponseTropGrande(url, f"plus de {self.taille_max} octets reçus", response.status_code)
+        return bytes(corps)
+
+    def recuperer_page(self, url, utiliser_cache=True, rafraichir=False):
+        """
+        Récupère une page web, en passant par le cache si possible. 
+        Si la page est en cache, elle est revalidée par une requête conditionnelle 
+        (If-None-Match / If-Modified-Since) et le corps en cache est réutilisé en cas de 304.
+        Les réponses 429 et 5xx et les erreurs de transport sont retentées après une attente
+        (voir reglages_reseau.attente), qui occupe le thread appelant.
+
+        Args:
+            url (str): L'URL de la page web.
+            utiliser_cache (bool): Si faux, le cache n'est ni lu ni mis à jour.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition puis remise en cache.
+
+        Returns:
+            Reponse: La page, avec son URL finale après redirections.
+
+        Raises:
+            ErreurRecuperation: Si le serveur répond par un statut d'erreur (4xx, 5xx) ou si la page
+                n'a pas pu être récupérée après toutes les tentatives.
+            ReponseTropGrande: Si le corps de la page dépasse la taille maximale.
+        """
+        utiliser_cache = utiliser_cache and self.cache is not None
+        entree = self.cache.lire(url) if utiliser_cache and not rafraichir else None
+        entetes = {}
+        if entree is not None:
+            if entree.etag:
+                entetes["If-None-Match"] = entree.etag
+            if entree.last_modified:
+                entetes["If-Modified-Since"] = entree.last_modified
+        for tentative in range(self.nb_tentatives):
+            derniere = tentative + 1 == self.nb_tentatives
+            try:
+                # Corps lu en flux : le téléchargement s'arrête dès que la taille maximale est dépassée.
+                with self.get(url, headers=entetes, stream=True) as response:
+                    if response.status_code == 304 and entree is not None:
+                        return Reponse(url, response.url, 304, entree.corps, 0)
+                    if response.status_code in STATUTS_RETENTES and not derniere:
+                        attente = reglages_reseau.attente(tentative, response.headers.get("Retry-After"),
+                                                          self.delai_base, self.delai_max)
+                    elif response.status_code >= 400:
+                        raise ErreurRecuperation(url, f"HTTP {response.status_code} {response.reason}",
+                                                 response.status_code)
+                    else:
+                        corps = self._lire_corps(url, response)
+                        break
+            except ERREURS_RETENTEES as e:
+                if derniere:
+                    raise ErreurRecuperation(url, f"{type(e).__name__} {e}".strip()) from e
+                attente = reglages_reseau.attente(tentative, None, self.delai_base, self.delai_max)
+            except requests.RequestException as e:
+                # Trop de redirections, URL invalide... : une nouvelle tentative n'y changerait rien.
+                raise ErreurRecuperation(url, f"{type(e).__name__} {e}".strip()) from e
+            time.sleep(attente)
+        instrumentation.ajouter_octets(len(corps))
+        try:
+            html = corps.decode(response.encoding or "utf-8", errors="replace")
+        except LookupError:
+            html = corps.decode("utf-8", errors="replace")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        # Sans validateur la page ne pourrait pas être revalidée : inutile de la stocker.
+        if utiliser_cache and (etag or last_modified) and "no-store" not in response.headers.get("Cache-Control", ""):
+            self.cache.ecrire(url, etag, last_modified, html)
+        return Reponse(url, response.url, response.status_code, html, len(corps))
+
+    def recuperer_html(self, url, utiliser_cache=True, rafraichir=False):
+        """
+        Récupère le code HTML d'une page web (voir recuperer_page).
+
+        Args:
+            url (str): L'URL de la page web.
+            utiliser_cache (bool): Si faux, le cache n'est ni lu ni mis à jour.
+            rafraichir (bool): Si vrai, la page est retéléchargée sans condition puis remise en cache.
+
+        Returns:
+            str: Le code HTML de la page.
+        """
+        return self.recuperer_page(url, utiliser_cache, rafraichir).html
+
+    def fermer(self):
+        """
+        Ferme toutes les connexions conservées et le cache.
+        """
+        self.session.close()
+        if self.cache is not None:
+            self.cache.fermer()
+
+
+_client = None
+_verrou = threading.Lock()
+
+
+def client_partage():
+    """
+    Retourne le client HTTP partagé, en le créant à la première utilisation.
+
+    Returns:
+        ClientHttp: Le client partagé par toute l'application.
+    """
+    global _client
+    if _client is None:
+        with _verrou:
+            if _client is None:
+                _client = ClientHttp()
+    return _client
+
+
+def configurer(**options):
+    """
+    Remplace le client partagé par un client configuré différemment. Avec le moteur asynchrone,
+    les pages de l'audit ne passent pas par ce client : voir projet.configurer_reseau.
+
+    Args:
+        **options: Les paramètres de ClientHttp (taille_pool, timeout_lecture, user_agent, cache...).
+
+    Returns:
+        ClientHttp: Le nouveau client partagé.
+    """
+    global _client
+    with _verrou:
+        ancien, _client = _client, ClientHttp(**options)
+    if ancien is not None:
+        ancien.fermer()
+    return _client
@@ -0,0 +1,187 @@
+"""
+Stockage persistant des résultats d'audit, pour les ré-audits incrémentaux.
+
+Chaque page analysée est enregistrée avec l'empreinte (SHA-256) de son code HTML :
+- la partie indépendante des mots parasites (occurrences des mots, liens, couverture alt)
+  est valable tant que le contenu de la page ne change pas ;
+- la partie mots-clés est en plus associée à l'empreinte de la liste des mots parasites :
+  une modification de parasites.csv n'invalide que cette partie, qui est alors recalculée
+  à partir des occurrences stockées, sans reparser la page ;
+- les statistiques des mots-clés ciblés par l'utilisateur (voir cibles) sont associées à
+  l'empreinte de la liste des cibles.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+from cache import DOSSIER_CACHE
+###################################################################
+
+
+class MagasinResultats:
+    """
+    Base SQLite des résultats d'analyse par page, partageable entre threads.
+    """
+    def __init__(self, chemin=None):
+        """
+        Args:
+            chemin (str, optional): Le fichier SQLite des résultats. Par défaut dans le dossier du cache.
+        """
+        if chemin is None:
+            os.makedirs(DOSSIER_CACHE, exist_ok=True)
+            chemin = os.path.join(DOSSIER_CACHE, "resultats.sqlite")
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False, timeout=30)
+        with self._connexion:
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, hash_contenu TEXT, occurrences TEXT, liens TEXT, percent_alt REAL)"
+            )
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS mots_cles ("
+                "url TEXT PRIMARY KEY, hash_contenu TEXT, empreinte_parasites TEXT, mots_cles TEXT)"
+            )
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS cibles ("
+                "url TEXT PRIMARY KEY, hash_contenu TEXT, empreinte_cibles TEXT, cibles TEXT)"
+            )
+
+    @staticmethod
+    def hash_contenu(html):
+        """
+        Calcule l'empreinte du code HTML d'une page.
+
+        Args:
+            html (str): Le code HTML de la page.
+
+        Returns:
+            str: L'empreinte SHA-256 du contenu.
+        """
+        return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def empreinte_parasites(parasites):
+        """
+        Calcule l'empreinte d'une liste de mots parasites, indépendante de l'ordre des mots.
+
+        Args:
+            parasites (set): L'ensemble des mots parasites.
+
+        Returns:
+            str: L'empreinte SHA-256 de la liste.
+        """
+        return hashlib.sha256("\n".join(sorted(parasites)).encode("utf-8")).hexdigest()
+
+    def lire(self, url, hash_contenu, empreinte_parasites):
+        """
+        Retourne le résultat stocké d'une page si son contenu n'a pas changé.
+
+        Args:
+            url (str): L'URL de la page.
+            hash_contenu (str): L'empreinte du code HTML actuel de la page.
+            empreinte_parasites (str): L'empreinte de la liste de mots parasites actuelle.
+
+        Returns:
+            dict: Le résultat stocké, dont la clé "mots_cles" vaut None si la liste de mots
+                parasites a changé depuis l'enregistrement ; None si la page est inconnue ou modifiée.
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT p.occurrences, p.liens, p.percent_alt, m.mots_cles FROM pages p "
+                "LEFT JOIN mots_cles m ON m.url = p.url AND m.hash_contenu = p.hash_contenu "
+                "AND m.empreinte_parasites = ? WHERE p.url = ? AND p.hash_contenu = ?",
+                (empreinte_parasites, url, hash_contenu)
+            ).fetchone()
+        if ligne is None:
+            return None
+        occurrences, liens, percent_alt, mots_cles = ligne
+        return {
+            "url": url,
+            "occurrences": json.loads(occurrences),
+            "liens": json.loads(liens),
+            "percent_alt": percent_alt,
+            "mots_cles": json.loads(mots_cles) if mots_cles is not None else None,
+        }
+
+    def ecrire_page(self, url, hash_contenu, occurrences, liens, percent_alt):
+        """
+        Enregistre la partie d'un résultat qui ne dépend que du contenu de la page.
+
+        Args:
+            url (str): L'URL de la page.
+            hash_contenu (str): L'empreinte du code HTML de la page.
+            occurrences (dict): Les occurrences des mots de la page.
+            liens (list): Les valeurs des attributs href des liens.
+            percent_alt (float): Le pourcentage d'images avec attribut alt.
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, hash_contenu, json.dumps(occurrences, ensure_ascii=False),
+                 json.dumps(liens, ensure_ascii=False), percent_alt)
+            )
+
+    def ecrire_mots_cles(self, url, hash_contenu, empreinte_parasites, mots_cles):
+        """
+        Enregistre la partie mots-clés d'un résultat.
+
+        Args:
+            url (str): L'URL de la page.
+            hash_contenu (str): L'empreinte du code HTML de la page.
+            empreinte_parasites (str): L'empreinte de la liste de mots parasites utilisée.
+            mots_cles (dict): Les mots-clés retenus et leur nombre d'occurrences.
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO mots_cles VALUES (?, ?, ?, ?)",
+                (url, hash_contenu, empreinte_parasites, json.dumps(mots_cles, ensure_ascii=False))
+            )
+
+    def lire_cibles(self, url, hash_contenu, empreinte_cibles):
+        """
+        Retourne les statistiques stockées des cibles d'une page.
+
+        Args:
+            url (str): L'URL de la page.
+            hash_contenu (str): L'empreinte du code HTML actuel de la page.
+            empreinte_cibles (str): L'empreinte de la liste des cibles (DetecteurCibles.empreinte).
+
+        Returns:
+            dict: Les statistiques de chaque cible, ou None si la page ou les cibles ont changé.
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT cibles FROM cibles WHERE url = ? AND hash_contenu = ? AND empreinte_cibles = ?",
+                (url, hash_contenu, empreinte_cibles)
+            ).fetchone()
+        return json.loads(ligne[0]) if ligne is not None else None
+
+    def ecrire_cibles(self, url, hash_contenu, empreinte_cibles, cibles):
+        """
+        Enregistre les statistiques des cibles d'une page.
+
+        Args:
+            url (str): L'URL de la page.
+            hash_contenu (str): L'empreinte du code HTML de la page.
+            empreinte_cibles (str): L'empreinte de la liste des cibles utilisée.
+            cibles (dict): Les statistiques de chaque cible (voir DetecteurCibles.analyser).
+        """
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO cibles VALUES (?, ?, ?, ?)",
+                (url, hash_contenu, empreinte_cibles, json.dumps(cibles, ensure_ascii=False))
+            )
+
+    def fermer(self):
+        """
+        Ferme la base des résultats.
+        """
+        self._connexion.close()
@@ -0,0 +1,86 @@
+"""
+Les modules du projet sont importés par leur nom (import crawler, import frontiere...),
+comme lorsque l'application est lancée depuis ce dossier.
+
+La fixture serveur_http sert des réponses scénarisées sur 127.0.0.1, pour tester les clients HTTP.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import sys
+import threading
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+###################################################################
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ServeurScenario:
+    """
+    Serveur HTTP local dont chaque chemin répond selon un scénario : une liste de réponses
+    (statut, en-têtes, corps) servies dans l'ordre, la dernière étant répétée.
+    Content-Length est ajouté s'il n'est pas dans les en-têtes.
+    """
+    def __init__(self, scenarios):
+        """
+        Args:
+            scenarios (dict): La liste des réponses de chaque chemin.
+        """
+        self.scenarios = {chemin: list(reponses) for chemin, reponses in scenarios.items()}
+        self.nb_requetes = {chemin: 0 for chemin in scenarios}
+        serveur = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                reponses = serveur.scenarios.get(self.path, [(404, {}, b"")])
+                serveur.nb_requetes[self.path] = serveur.nb_requetes.get(self.path, 0) + 1
+                statut, entetes, corps = reponses.pop(0) if len(reponses) > 1 else reponses[0]
+                self.send_response(statut)
+                for nom, valeur in entetes.items():
+                    # Une valeur None retire l'en-tête (Content-Length : corps lu jusqu'à la fermeture).
+                    if valeur is not None:
+                        self.send_header(nom, valeur)
+                if "Content-Length" not in entetes:
+                    self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._serveur = ThreadingHTTPServer(("127.0.0.1", 0), Gestionnaire)
+        self._serveur.daemon_threads = True
+        self._thread = threading.Thread(target=self._serveur.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, chemin):
+        hote, port = self._serveur.server_address[:2]
+        return f"http://{hote}:{port}{chemin}"
+
+    def arreter(self):
+        self._serveur.shutdown()
+        self._serveur.server_close()
+        self._thread.join()
+
+
+@pytest.fixture
+def serveur_http():
+    """
+    Fabrique de serveurs à scénario (voir ServeurScenario), arrêtés à la fin du test.
+    """
+    serveurs = []
+
+    def demarrer(scenarios):
+        serveurs.append(ServeurScenario(scenarios))
+        return serveurs[-1]
+
+    yield demarrer
+    for serveur in serveurs:
+        serveur.arreter()
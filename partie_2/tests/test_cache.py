@@ -0,0 +1,38 @@
+"""
+Tests du cache HTTP : taille totale et éviction LRU partagées entre plusieurs connexions.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+from cache import CacheHttp
+###################################################################
+
+
+def test_taille_partagee_entre_processus(tmp_path):
+    chemin = str(tmp_path / "http.sqlite")
+    # Deux instances sur le même fichier, comme deux processus d'analyse.
+    premier, second = CacheHttp(chemin, taille_max=250), CacheHttp(chemin, taille_max=250)
+    premier.ecrire("https://exemple.fr/a", "a", None, "a" * 100)
+    second.ecrire("https://exemple.fr/b", "b", None, "b" * 100)
+    assert premier.taille_totale() == second.taille_totale() == 200
+    # Le premier voit les écritures du second : la borne est dépassée et l'entrée la plus ancienne évincée.
+    premier.ecrire("https://exemple.fr/c", "c", None, "c" * 100)
+    assert second.taille_totale() == 200
+    assert second.lire("https://exemple.fr/a") is None
+    assert second.lire("https://exemple.fr/b").corps == "b" * 100
+    premier.fermer()
+    second.fermer()
+
+
+def test_remplacement_et_vidage(tmp_path):
+    chemin = str(tmp_path / "http.sqlite")
+    cache = CacheHttp(chemin)
+    cache.ecrire("https://exemple.fr/a", "1", None, "a" * 100)
+    cache.ecrire("https://exemple.fr/a", "2", None, "a" * 40)
+    assert cache.taille_totale() == 40
+    cache.fermer()
+    cache = CacheHttp(chemin)
+    assert cache.taille_totale() == 40
+    cache.vider()
+    assert cache.taille_totale() == 0
+    cache.fermer()
@@ -0,0 +1,54 @@
+"""
+Tests de la recherche des cibles (cibles.DetecteurCibles) : l'automate d'Aho-Corasick trouve
+les mêmes occurrences qu'une recherche naïve de chaque cible, position par position.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import random
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from cibles import DetecteurCibles
+###################################################################
+
+VOCABULAIRE = ["audit", "seo", "site", "web", "référencement", "naturel"]
+# Cibles qui se chevauchent, s'emboîtent ou se répètent.
+CIBLES = ["audit", "audit seo", "seo", "audit audit", "audit seo audit", "site web seo",
+          "référencement naturel", "naturel référencement naturel", "Audit  SEO !"]
+
+
+def recherche_naive(mots, cible):
+    """
+    Returns:
+        list: La position du premier mot de chaque occurrence de la cible, chevauchements compris.
+    """
+    n = len(cible)
+    return [i for i in range(len(mots) - n + 1) if mots[i:i + n] == cible]
+
+
+@pytest.mark.parametrize("graine", range(20))
+def test_identique_a_la_recherche_naive(graine):
+    generateur = random.Random(graine)
+    mots = [generateur.choice(VOCABULAIRE) for _ in range(generateur.randint(0, 300))]
+    detecteur = DetecteurCibles(CIBLES)
+    # "Audit  SEO !" est normalisée en "audit seo", déjà présente : elle n'est comptée qu'une fois.
+    assert detecteur.cibles == [" ".join(cible.split()) for cible in CIBLES[:-1]]
+    resultats = detecteur.analyser(" ".join(mots).upper())
+    for cible in detecteur.cibles:
+        positions = recherche_naive(mots, cible.split())
+        assert resultats[cible]["occurrences"] == len(positions), cible
+        assert resultats[cible]["premiere_position"] == (positions[0] if positions else None), cible
+
+
+def test_titre_et_intertitres():
+    detecteur = DetecteurCibles(["audit seo", "site"])
+    resultats = detecteur.analyser("un site", titre="L'audit SEO du site", intertitres=["audit", "seo"])
+    assert resultats["audit seo"]["dans_titre"] is True
+    # Une expression ne commence pas dans un intertitre pour finir dans le suivant.
+    assert resultats["audit seo"]["dans_intertitres"] is False
+    assert resultats["audit seo"]["occurrences"] == 0
+    assert resultats["site"] == {"occurrences": 1, "densite": 50.0, "premiere_position": 1,
+                                 "dans_titre": True, "dans_intertitres": False}
@@ -0,0 +1,110 @@
+"""
+Tests des codes de sortie de la ligne de commande, sur un site servi en local.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import importlib.util
+import json
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+import cache
+import cli
+import projet
+###################################################################
+
+ENTETES = {"Content-Type": "text/html; charset=utf-8"}
+ACCUEIL = '<html><body><p>accueil</p><a href="/a">a</a>{lien}</body></html>'
+PAGE_A = "<html><body><p>audit python python</p></body></html>"
+
+
+@pytest.fixture
+def reseau_isole(monkeypatch, tmp_path):
+    """
+    Clients HTTP neufs, fermés à la fin du test, avec leur cache dans un dossier temporaire.
+    """
+    reseau = pytest.importorskip("reseau")
+    monkeypatch.setattr(cache, "DOSSIER_CACHE", str(tmp_path))
+    monkeypatch.setattr(projet, "_moteur", projet._moteur)
+    monkeypatch.setattr(projet, "_recuperer", None)
+    monkeypatch.setattr(projet, "_recuperer_plusieurs", None)
+    monkeypatch.setattr(reseau, "_client", None)
+    moteur_async = None
+    if importlib.util.find_spec("aiohttp") is not None:
+        import moteur_async
+        monkeypatch.setattr(moteur_async, "_moteur", None)
+    yield
+    for client in (reseau._client, moteur_async._moteur if moteur_async is not None else None):
+        if client is not None:
+            client.fermer()
+
+
+@pytest.fixture(params=["requests", "async"])
+def moteur(request, reseau_isole):
+    """
+    Moteur de récupération des pages passé à --moteur.
+    """
+    pytest.importorskip("bs4")
+    if request.param == "async" and importlib.util.find_spec("aiohttp") is None:
+        pytest.skip("aiohttp n'est pas installé")
+    return request.param
+
+
+def lancer(serveur, tmp_path, moteur, *options):
+    urls = tmp_path / "sites.txt"
+    urls.write_text(f"# sites audités\n{serveur.url('/')}\n", encoding="utf-8")
+    sortie = tmp_path / "rapport.jsonl"
+    code = cli.main([str(urls), "--sortie", str(sortie), "--moteur", moteur, "--sans-cache", *options])
+    with open(sortie, encoding="utf-8") as fichier:
+        return code, [json.loads(ligne) for ligne in fichier]
+
+
+def test_toutes_les_pages(serveur_http, tmp_path, moteur, capsys):
+    serveur = serveur_http({"/": [(200, ENTETES, ACCUEIL.format(lien="").encode())],
+                            "/a": [(200, ENTETES, PAGE_A.encode())]})
+    code, enregistrements = lancer(serveur, tmp_path, moteur, "--mots-cles", "audit")
+    assert code == cli.CODE_OK
+    assert [enregistrement["url"] for enregistrement in enregistrements] == [serveur.url("/a")]
+    assert enregistrements[0]["cibles"]["audit"]["occurrences"] == 1
+    assert f"Synthèse de {serveur.url('/')} : 2 pages analysées, 0 en échec" in capsys.readouterr().err
+
+
+def test_echecs_partiels(serveur_http, tmp_path, moteur):
+    serveur = serveur_http({"/": [(200, ENTETES, ACCUEIL.format(lien='<a href="/absente">b</a>').encode())],
+                            "/a": [(200, ENTETES, PAGE_A.encode())]})
+    code, enregistrements = lancer(serveur, tmp_path, moteur, "--inclure-depart")
+    assert code == cli.CODE_ECHECS_PARTIELS
+    assert sorted(enregistrement["url"] for enregistrement in enregistrements) == [serveur.url("/"), serveur.url("/a")]
+
+
+def test_depart_inaccessible(serveur_http, tmp_path, moteur):
+    serveur = serveur_http({})
+    code, enregistrements = lancer(serveur, tmp_path, moteur)
+    assert code == cli.CODE_ECHEC_TOTAL
+    assert enregistrements == []
+
+
+@pytest.mark.usefixtures("reseau_isole")
+def test_arguments(tmp_path):
+    vide = tmp_path / "vide.txt"
+    vide.write_text("# aucune URL\n", encoding="utf-8")
+    assert cli.main([str(vide), "--sortie", str(tmp_path / "rapport.jsonl"), "--moteur", "requests", "--sans-cache"]) \
+        == cli.CODE_ARGUMENTS
+    with pytest.raises(SystemExit) as sortie:
+        cli.main([str(vide), "--concurrence", "0"])
+    assert sortie.value.code == cli.CODE_ARGUMENTS
+
+
+@pytest.mark.usefixtures("reseau_isole")
+def test_interruption(tmp_path, monkeypatch):
+    def interrompre(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli, "auditer", interrompre)
+    urls = tmp_path / "sites.txt"
+    urls.write_text("https://exemple.fr/\n", encoding="utf-8")
+    assert cli.main([str(urls), "--sortie", str(tmp_path / "rapport.jsonl"), "--moteur", "requests", "--sans-cache"]) \
+        == cli.CODE_INTERRUPTION
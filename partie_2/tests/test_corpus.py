@@ -0,0 +1,38 @@
+"""
+Tests du classement TF-IDF des pages d'un site.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from corpus import CorpusSite
+###################################################################
+
+
+def test_pages_normalisees():
+    corpus = CorpusSite()
+    corpus.ajouter("https://exemple.fr/a", {"python": 3, "site": 1})
+    corpus.ajouter("https://exemple.fr/b", {"tkinter": 2, "site": 1})
+    normes = np.sqrt(np.asarray(corpus.tfidf().multiply(corpus.tfidf()).sum(axis=1)).ravel())
+    assert normes == pytest.approx([1, 1])
+
+
+def test_derniere_page_vide():
+    corpus = CorpusSite(parasites={"le", "la"})
+    corpus.ajouter("https://exemple.fr/a", {"python": 3, "site": 1})
+    corpus.ajouter("https://exemple.fr/vide", {})
+    corpus.ajouter("https://exemple.fr/parasites", {"le": 4, "la": 2})
+    meilleurs = corpus.meilleurs_termes(3)
+    assert [terme for terme, _ in meilleurs["https://exemple.fr/a"]] == ["python", "site"]
+    assert meilleurs["https://exemple.fr/vide"] == []
+    assert meilleurs["https://exemple.fr/parasites"] == []
+
+
+def test_corpus_sans_terme():
+    corpus = CorpusSite()
+    corpus.ajouter("https://exemple.fr/vide", {})
+    assert corpus.meilleurs_termes() == {"https://exemple.fr/vide": []}
@@ -0,0 +1,73 @@
+"""
+Tests de l'exploration d'un site par niveaux et des règles robots.txt.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from concurrent.futures import ThreadPoolExecutor
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from crawler import TAILLE_MAX_ROBOTS, Crawler, RobotsTxt
+from reponses import ErreurRecuperation, Reponse
+###################################################################
+
+SITE = {
+    "https://exemple.fr/": ["/a", "/b", "/c"],
+    "https://exemple.fr/a": ["/d"],
+    "https://exemple.fr/b": ["https://ailleurs.fr/"],
+    "https://exemple.fr/d": [],
+}
+
+
+def test_niveaux_recuperes_d_un_coup():
+    lots = []
+
+    def recuperer_plusieurs(urls, attente=None):
+        # Toutes les URL du niveau sont demandées avant la première réponse.
+        urls = list(urls)
+        lots.append(urls)
+        for url in reversed(urls):
+            if url in SITE:
+                yield url, Reponse(url, url, 200, "", 0)
+            else:
+                yield url, ErreurRecuperation(url, "HTTP 404 Not Found", 404)
+
+    traitees, echecs = [], []
+
+    def traiter(url, html, profondeur):
+        traitees.append((url, profondeur))
+        return SITE[url]
+
+    crawler = Crawler(profondeur_max=2, nb_pages_max=10, nb_workers=2, respecter_robots=False,
+                      recuperer=lambda url: None, recuperer_plusieurs=recuperer_plusieurs)
+    nb_planifiees = crawler.parcourir("https://exemple.fr/", traiter,
+                                      echec=lambda url, profondeur, erreur: echecs.append((url, profondeur)))
+
+    assert [sorted(lot) for lot in lots] == [
+        ["https://exemple.fr/"],
+        ["https://exemple.fr/a", "https://exemple.fr/b", "https://exemple.fr/c"],
+        ["https://exemple.fr/d"],
+    ]
+    assert nb_planifiees == 5
+    assert sorted(traitees) == [("https://exemple.fr/", 0), ("https://exemple.fr/a", 1),
+                                ("https://exemple.fr/b", 1), ("https://exemple.fr/d", 2)]
+    assert echecs == [("https://exemple.fr/c", 1)]
+
+
+def test_robots_txt_tronque_et_telecharge_une_fois(serveur_http, monkeypatch):
+    reseau = pytest.importorskip("reseau")
+    monkeypatch.setattr(reseau, "_client", reseau.ClientHttp(cache=None))
+    # La règle /tard est au-delà de la taille lue : elle est ignorée.
+    debut = b"User-agent: *\nDisallow: /prive\n"
+    remplissage = b"# " + b"x" * TAILLE_MAX_ROBOTS + b"\n"
+    serveur = serveur_http({"/robots.txt": [(200, {"Content-Type": "text/plain"},
+                                            debut + remplissage + b"Disallow: /tard\n")]})
+    robots = RobotsTxt()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        autorisations = list(executor.map(robots.autorise, [serveur.url("/prive/page")] * 8))
+    assert autorisations == [False] * 8
+    assert robots.autorise(serveur.url("/tard"))
+    assert serveur.nb_requetes["/robots.txt"] == 1
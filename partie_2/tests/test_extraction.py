@@ -0,0 +1,49 @@
+"""
+Tests de l'analyse HTML en flux (extraction.ExtracteurFlux) : mêmes résultats que BeautifulSoup
+(backend html.parser) quel que soit le découpage de la page en blocs.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from extraction import ExtracteurFlux
+from reponses import ErreurRecuperation
+from texte import TextAnalyser
+###################################################################
+
+PAGES = [
+    # Mot coupé par des balises, entités, texte de script et de style ignoré.
+    "<html><head><title>Été</title><style>p { color: red }</style></head>"
+    "<body><p>ré<b>fé</b>rence&nbsp;naturel &eacute;t&eacute;</p>"
+    "<script>var mot = 'caché';</script><p>suite du texte</p></body></html>",
+    # Attributs dupliqués, sans valeur, balises auto-fermantes et images sans alt.
+    '<p>liens</p><a href="/a">un</a><a href="/b" href="/c">deux</a><a>trois</a>'
+    '<img src="x.png" alt><img src="y.png"/><img alt="logo du site" src="z.png">',
+    # Commentaires, majuscules, chiffres et apostrophes.
+    "<div>L'audit <!-- commentaire ignoré --> SEO2024 d'un SITE<br>web</div><template>modèle</template>fin",
+]
+TAILLES_BLOCS = [1, 2, 3, 7, 16, 10 ** 6]
+
+
+@pytest.mark.parametrize("statut", [404, 503])
+def test_depuis_url_statut_d_erreur(serveur_http, monkeypatch, statut):
+    reseau = pytest.importorskip("reseau")
+    monkeypatch.setattr(reseau, "_client", reseau.ClientHttp(cache=None))
+    serveur = serveur_http({"/": [(statut, {"Content-Type": "text/html"}, b"<p>page d'erreur</p>")]})
+    with pytest.raises(ErreurRecuperation) as erreur:
+        ExtracteurFlux.depuis_url(serveur.url("/"))
+    assert erreur.value.statut == statut
+
+
+@pytest.mark.parametrize("html", PAGES)
+@pytest.mark.parametrize("taille_bloc", TAILLES_BLOCS)
+def test_equivalent_a_beautifulsoup(html, taille_bloc):
+    pytest.importorskip("bs4")
+    from projet import PageDocument
+    document = PageDocument(html, parser="html.parser")
+    extracteur = ExtracteurFlux().alimenter(html[i:i + taille_bloc] for i in range(0, len(html), taille_bloc))
+    assert extracteur.occurrences == TextAnalyser.compter_mots(document.texte)
+    for balise, attribut in (("a", "href"), ("img", "alt")):
+        assert extracteur.extraire_attributs(balise, attribut) == document.extraire_attributs(balise, attribut)
+        assert extracteur.percent_attributs(balise, attribut) == document.percent_attributs(balise, attribut)
@@ -0,0 +1,137 @@
+"""
+Tests des deux frontières d'exploration : baux, tentatives, bornes de l'audit.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from frontiere import A_FAIRE, ECHEC, EN_COURS, ERREUR_BAIL, FAIT, FrontiereMemoire, FrontiereSqlite
+###################################################################
+
+DEPART = "https://exemple.fr/"
+# Un bail négatif est déjà expiré à la réservation suivante.
+BAIL_EXPIRE = -1
+
+
+@pytest.fixture(params=["memoire", "sqlite"])
+def creer_frontiere(request, tmp_path):
+    frontieres = []
+
+    def creer(nb_tentatives=3):
+        if request.param == "memoire":
+            frontiere = FrontiereMemoire(nb_tentatives)
+        else:
+            frontiere = FrontiereSqlite(str(tmp_path / f"frontiere{len(frontieres)}.sqlite"), nb_tentatives)
+        frontieres.append(frontiere)
+        return frontiere
+
+    yield creer
+    for frontiere in frontieres:
+        frontiere.fermer()
+
+
+def test_reservation_exclusive(creer_frontiere):
+    frontiere = creer_frontiere()
+    audit = frontiere.creer_audit(DEPART)
+    [tache] = frontiere.reserver("a")
+    assert tache.url == DEPART and tache.profondeur == 0 and tache.tentative == 1
+    assert frontiere.reserver("b") == []
+    assert frontiere.etat(audit)[EN_COURS] == 1
+
+
+def test_bail_expire_repris(creer_frontiere):
+    frontiere = creer_frontiere()
+    audit = frontiere.creer_audit(DEPART)
+    [perdue] = frontiere.reserver("a", duree_bail=BAIL_EXPIRE)
+    [reprise] = frontiere.reserver("b")
+    assert reprise.url == perdue.url and reprise.tentative == 2
+    assert frontiere.terminer(reprise, "b", {"url": DEPART}, [])
+    assert frontiere.etat(audit)[FAIT] == 1
+    assert [travailleur for _, _, travailleur, _ in frontiere.resultats(audit)] == ["b"]
+
+
+def test_travailleur_perime_sans_effet(creer_frontiere):
+    frontiere = creer_frontiere()
+    audit = frontiere.creer_audit(DEPART, profondeur_max=1, nb_pages_max=10)
+    [perdue] = frontiere.reserver("a", duree_bail=BAIL_EXPIRE)
+    [reprise] = frontiere.reserver("b")
+    # L'ancien détenteur ne peut ni renouveler, ni terminer, ni faire échouer la page.
+    assert not frontiere.renouveler(perdue, "a")
+    assert not frontiere.terminer(perdue, "a", {"url": "ancien"}, [DEPART + "ancien"])
+    assert not frontiere.echouer(perdue, "a", "erreur", definitif=True)
+    assert frontiere.etat(audit) == {A_FAIRE: 0, EN_COURS: 1, FAIT: 0, ECHEC: 0}
+    assert list(frontiere.resultats(audit)) == []
+    assert frontiere.terminer(reprise, "b", {"url": DEPART}, [DEPART + "page"])
+    assert frontiere.etat(audit) == {A_FAIRE: 1, EN_COURS: 0, FAIT: 1, ECHEC: 0}
+
+
+def test_meme_nom_autre_tentative(creer_frontiere):
+    frontiere = creer_frontiere()
+    audit = frontiere.creer_audit(DEPART)
+    # Même nom de travailleur (un autre thread du même processus) : la tentative distingue les baux.
+    [perdue] = frontiere.reserver("a", duree_bail=BAIL_EXPIRE)
+    [reprise] = frontiere.reserver("a")
+    assert not frontiere.terminer(perdue, "a", {"url": "ancien"}, [])
+    assert frontiere.terminer(reprise, "a", {"url": DEPART}, [])
+    assert [resume for _, _, _, resume in frontiere.resultats(audit)] == [{"url": DEPART}]
+
+
+def test_renouvellement(creer_frontiere):
+    frontiere = creer_frontiere()
+    frontiere.creer_audit(DEPART)
+    [tache] = frontiere.reserver("a", duree_bail=BAIL_EXPIRE)
+    assert frontiere.renouveler(tache, "a", duree_bail=60)
+    assert frontiere.reserver("b") == []
+    assert frontiere.terminer(tache, "a", {"url": DEPART}, [])
+    assert not frontiere.renouveler(tache, "a")
+
+
+def test_echec_retente_puis_definitif(creer_frontiere):
+    frontiere = creer_frontiere(nb_tentatives=2)
+    audit = frontiere.creer_audit(DEPART)
+    [tache] = frontiere.reserver("a")
+    assert frontiere.echouer(tache, "a", "503")
+    assert frontiere.etat(audit)[A_FAIRE] == 1
+    [tache] = frontiere.reserver("a")
+    assert frontiere.echouer(tache, "a", "503")
+    assert frontiere.etat(audit)[ECHEC] == 1
+    assert frontiere.reserver("a") == []
+    assert frontiere.echecs(audit) == [(DEPART, "503")]
+    assert not frontiere.en_attente(audit)
+
+
+def test_echec_definitif(creer_frontiere):
+    frontiere = creer_frontiere()
+    audit = frontiere.creer_audit(DEPART)
+    [tache] = frontiere.reserver("a")
+    assert frontiere.echouer(tache, "a", "404", definitif=True)
+    assert frontiere.echecs(audit) == [(DEPART, "404")]
+
+
+def test_baux_expires_epuisent_les_tentatives(creer_frontiere):
+    frontiere = creer_frontiere(nb_tentatives=2)
+    audit = frontiere.creer_audit(DEPART)
+    frontiere.reserver("a", duree_bail=BAIL_EXPIRE)
+    frontiere.reserver("b", duree_bail=BAIL_EXPIRE)
+    assert frontiere.reserver("c") == []
+    assert frontiere.echecs(audit) == [(DEPART, ERREUR_BAIL)]
+
+
+def test_bornes_profondeur_et_pages(creer_frontiere):
+    frontiere = creer_frontiere()
+    audit = frontiere.creer_audit(DEPART, profondeur_max=1, nb_pages_max=3)
+    [depart] = frontiere.reserver("a")
+    liens = [f"{DEPART}page{i}" for i in range(5)]
+    assert frontiere.terminer(depart, "a", {"url": DEPART}, [DEPART] + liens, domaine="exemple.fr")
+    # La page de départ, déjà connue, n'est pas replanifiée ; seules 2 pages de plus tiennent dans la limite.
+    assert frontiere.audit(audit)["nb_planifiees"] == 3
+    assert frontiere.audit(audit)["domaine"] == "exemple.fr"
+    taches = frontiere.reserver("a", nb=10)
+    assert sorted(tache.url for tache in taches) == liens[:2]
+    assert all(tache.profondeur == 1 and tache.domaine == "exemple.fr" for tache in taches)
+    # Au niveau de la profondeur maximale, les liens ne sont plus suivis.
+    for tache in taches:
+        assert frontiere.terminer(tache, "a", {"url": tache.url}, [DEPART + "profonde"])
+    assert frontiere.etat(audit) == {A_FAIRE: 0, EN_COURS: 0, FAIT: 3, ECHEC: 0}
+    assert not frontiere.en_attente(audit)
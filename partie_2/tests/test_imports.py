@@ -0,0 +1,42 @@
+"""
+Les points d'entrée de l'application ne chargent aucune dépendance lourde à l'import :
+requests, BeautifulSoup, aiohttp, NumPy/SciPy et le profileur ne sont importés qu'à leur première utilisation.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import importlib.util
+import os
+import subprocess
+import sys
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+###################################################################
+
+DOSSIER_APPLICATION = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# cProfile et pstats ne servent qu'aux audits profilés (voir instrumentation.Mesures).
+MODULES_LOURDS = ["requests", "bs4", "lxml", "aiohttp", "numpy", "scipy", "cProfile", "pstats"]
+POINTS_ENTREE = ["projet", "crawler", "cli", "appui", "distribue", "frontiere", "reponses", "reglages_reseau"]
+
+
+@pytest.mark.parametrize("module", POINTS_ENTREE)
+def test_import_sans_dependance_lourde(module):
+    if module == "appui" and importlib.util.find_spec("tkinter") is None:
+        pytest.skip("tkinter n'est pas installé")
+    # Un interpréteur neuf par module : les imports des autres tests ne faussent pas le résultat.
+    code = (f"import sys; import {module}; "
+            f"print(','.join(nom for nom in {MODULES_LOURDS!r} if nom in sys.modules))")
+    execution = subprocess.run([sys.executable, "-c", code], cwd=DOSSIER_APPLICATION,
+                               capture_output=True, text=True, check=True)
+    assert execution.stdout.strip() == ""
+
+
+def test_moteur_async_sans_requests():
+    pytest.importorskip("aiohttp")
+    # Le moteur asynchrone lit ses réglages dans reglages_reseau, sans charger le client requests.
+    code = "import sys; import moteur_async; print('requests' in sys.modules)"
+    execution = subprocess.run([sys.executable, "-c", code], cwd=DOSSIER_APPLICATION,
+                               capture_output=True, text=True, check=True)
+    assert execution.stdout.strip() == "False"
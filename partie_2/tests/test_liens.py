@@ -0,0 +1,64 @@
+"""
+Tests de la classification des liens : domaine enregistrable d'après la table des suffixes
+publics, sous-domaines et hôtes qui imitent celui de la page.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from liens import PORTEE_HOTE, classer_liens, domaine_enregistrable
+###################################################################
+
+
+@pytest.mark.parametrize("hote, domaine", [
+    ("www.exemple.fr", "exemple.fr"),
+    ("exemple.fr", "exemple.fr"),
+    ("a.b.exemple.fr", "exemple.fr"),
+    # Suffixe public à deux niveaux.
+    ("www.exemple.co.uk", "exemple.co.uk"),
+    ("co.uk", "co.uk"),
+    # Suffixes privés : chaque sous-domaine est un site distinct.
+    ("moi.github.io", "moi.github.io"),
+    ("blog.moi.github.io", "moi.github.io"),
+    ("github.io", "github.io"),
+    # Règle générique *.ck et son exception !www.ck.
+    ("site.exemple.ck", "site.exemple.ck"),
+    ("www.ck", "www.ck"),
+    ("a.www.ck", "www.ck"),
+    # Domaine de premier niveau absent de la table : règle par défaut.
+    ("www.exemple.inconnu", "exemple.inconnu"),
+    ("127.0.0.1", "127.0.0.1"),
+    ("::1", "::1"),
+    ("localhost", "localhost"),
+])
+def test_domaine_enregistrable(hote, domaine):
+    assert domaine_enregistrable(hote) == domaine
+
+
+def test_sous_domaines_et_imitations():
+    internes, externes = classer_liens("https://www.exemple.fr/page", [
+        "/a",
+        "contact.html",
+        "https://blog.exemple.fr/x",
+        "HTTPS://WWW.EXEMPLE.FR./majuscules",
+        "//exemple.fr:8080/port",
+        "https://exemple.fr.autre.com/",
+        "https://autreexemple.fr/",
+        "https://exemple.fr@autre.com/",
+        "https://exemple.co.uk/",
+        "mailto:contact@exemple.fr",
+        "javascript:void(0)",
+    ])
+    assert internes == ["/a", "contact.html", "https://blog.exemple.fr/x",
+                        "HTTPS://WWW.EXEMPLE.FR./majuscules", "//exemple.fr:8080/port"]
+    assert externes == ["https://exemple.fr.autre.com/", "https://autreexemple.fr/",
+                        "https://exemple.fr@autre.com/", "https://exemple.co.uk/"]
+
+
+def test_suffixe_prive_et_portee_hote():
+    liens = ["https://moi.github.io/a", "https://autre.github.io/", "https://blog.moi.github.io/"]
+    assert classer_liens("https://moi.github.io/", liens) == (
+        ["https://moi.github.io/a", "https://blog.moi.github.io/"], ["https://autre.github.io/"])
+    assert classer_liens("https://moi.github.io/", liens, portee=PORTEE_HOTE) == (
+        ["https://moi.github.io/a"], ["https://autre.github.io/", "https://blog.moi.github.io/"])
@@ -0,0 +1,91 @@
+"""
+Tests du moteur asynchrone : nouvelles tentatives, en-tête Retry-After, taille maximale des pages
+et récupération de plusieurs pages à la fois. La politique d'attente est testée sans aiohttp.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import time
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+import reglages_reseau
+from reponses import ErreurRecuperation, ReponseTropGrande
+###################################################################
+
+PAGE = (200, {"Content-Type": "text/html; charset=utf-8"}, "<p>été</p>".encode("utf-8"))
+
+
+@pytest.fixture
+def moteur():
+    moteur_async = pytest.importorskip("moteur_async")
+    moteur = moteur_async.MoteurAsync(cache=None, delai_base=0.01, delai_max=5)
+    yield moteur
+    moteur.fermer()
+
+
+def test_attente_retry_after():
+    assert reglages_reseau.attente(0, "2", delai_max=30) == 2
+    # L'attente demandée est bornée par delai_max.
+    assert reglages_reseau.attente(0, "3600", delai_max=30) == 30
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+    assert 15 <= reglages_reseau.attente(0, date, delai_max=30) <= 20
+    # Sans en-tête lisible : tirage entre 0 et delai_base * 2 ** tentative.
+    for tentative in range(4):
+        assert 0 <= reglages_reseau.attente(tentative, "illisible", delai_base=0.5, delai_max=30) <= 0.5 * 2 ** tentative
+    assert reglages_reseau.attente(20, None, delai_base=0.5, delai_max=30) <= 30
+
+
+def test_retry_after_respecte(moteur, serveur_http):
+    serveur = serveur_http({"/": [(429, {"Retry-After": "0.3"}, b""), (503, {"Retry-After": "0"}, b""), PAGE]})
+    debut = time.monotonic()
+    reponse = moteur.recuperer(serveur.url("/"))
+    assert time.monotonic() - debut >= 0.3
+    assert (reponse.statut, reponse.html) == (200, "<p>été</p>")
+    assert serveur.nb_requetes["/"] == 3
+
+
+def test_echec_apres_toutes_les_tentatives(moteur, serveur_http):
+    serveur = serveur_http({"/": [(503, {"Retry-After": "0"}, b"")], "/absente": [(404, {}, b"")]})
+    with pytest.raises(ErreurRecuperation) as erreur:
+        moteur.recuperer(serveur.url("/"))
+    assert erreur.value.statut == 503
+    assert serveur.nb_requetes["/"] == moteur.nb_tentatives
+    # Une erreur 4xx (hors 429) n'est pas retentée.
+    with pytest.raises(ErreurRecuperation):
+        moteur.recuperer(serveur.url("/absente"))
+    assert serveur.nb_requetes["/absente"] == 1
+
+
+def test_taille_maximale(serveur_http):
+    moteur_async = pytest.importorskip("moteur_async")
+    moteur = moteur_async.MoteurAsync(cache=None, taille_max=10)
+    serveur = serveur_http({"/annoncee": [(200, {}, b"x" * 100)],
+                            "/recue": [(200, {"Content-Length": None, "Connection": "close"}, b"x" * 100)]})
+    try:
+        for chemin in ("/annoncee", "/recue"):
+            with pytest.raises(ReponseTropGrande):
+                moteur.recuperer(serveur.url(chemin))
+            assert serveur.nb_requetes[chemin] == 1
+    finally:
+        moteur.fermer()
+
+
+def test_recuperer_plusieurs(moteur, serveur_http):
+    serveur = serveur_http({f"/{i}": [PAGE] for i in range(20)})
+    urls = [serveur.url(f"/{i}") for i in range(20)] + [serveur.url("/absente")]
+    demandees = []
+
+    def attente(url):
+        demandees.append(url)
+        return 0.01
+
+    resultats = dict(moteur.recuperer_plusieurs(urls, attente=attente))
+    assert sorted(demandees) == sorted(urls)
+    assert set(resultats) == set(urls)
+    assert isinstance(resultats.pop(serveur.url("/absente")), ErreurRecuperation)
+    assert all(reponse.html == "<p>été</p>" for reponse in resultats.values())
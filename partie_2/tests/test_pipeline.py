@@ -0,0 +1,50 @@
+"""
+Tests de la synthèse d'un site, regroupée au fil des résultats de pages (pipeline.AgregatSite).
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+import projet
+from pipeline import AgregatSite
+###################################################################
+
+ACCUEIL = '<html><body><p>python python site</p><a href="/a">a</a><a href="/absente">b</a></body></html>'
+PAGE_A = '<html><body><p>python tkinter</p><img src="x.png" alt="x"></body></html>'
+
+
+def test_synthese():
+    agregat = AgregatSite()
+    agregat.ajouter({"url": "a", "liens": ["/b", "/c"], "percent_alt": 100, "mots_cles": {"python": 2, "site": 1}})
+    agregat.ajouter({"url": "b", "liens": [], "percent_alt": 50, "mots_cles": {"python": 1, "tkinter": 3}})
+    agregat.ajouter({"url": "c", "erreur": "HTTP 404"})
+    assert agregat.synthese(k=2) == {
+        "nb_pages": 2,
+        "nb_echecs": 1,
+        "liens_par_page": 1,
+        "percent_alt_moyen": 75,
+        "mots_cles": {"python": 3, "tkinter": 3},
+    }
+
+
+@pytest.fixture
+def client_requests_sans_cache(monkeypatch):
+    reseau = pytest.importorskip("reseau")
+    pytest.importorskip("bs4")
+    monkeypatch.setattr(projet, "_moteur", projet._moteur)
+    monkeypatch.setattr(projet, "_recuperer", None)
+    monkeypatch.setattr(projet, "_recuperer_plusieurs", None)
+    monkeypatch.setattr(reseau, "_client", None)
+    projet.configurer_reseau("requests", cache=None, nb_tentatives=1)
+
+
+@pytest.mark.usefixtures("client_requests_sans_cache")
+@pytest.mark.parametrize("nb_processus", [None, 2])
+def test_audit_site_affiche_la_synthese(serveur_http, capsys, nb_processus):
+    entetes = {"Content-Type": "text/html; charset=utf-8"}
+    serveur = serveur_http({"/": [(200, entetes, ACCUEIL.encode())], "/a": [(200, entetes, PAGE_A.encode())]})
+    projet.UrlAudit().audit_site(serveur.url("/"), profondeur_max=1, nb_processus=nb_processus)
+    sortie = capsys.readouterr().out
+    assert f"Synthèse de {serveur.url('/')} : 2 pages analysées, 1 en échec" in sortie
+    assert "mots-clés du site : python" in sortie
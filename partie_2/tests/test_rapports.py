@@ -0,0 +1,87 @@
+"""
+Tests de la base des rapports : lecture paginée et triée d'un audit, statistiques des cibles par page.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import io
+import json
+import sqlite3
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from cibles import DetecteurCibles
+from projet import UrlAudit
+from rapports import BaseRapports
+###################################################################
+
+
+def resume(url, nb_liens_internes):
+    return {"url": url, "nb_liens_internes": nb_liens_internes, "nb_liens_externes": 0, "percent_alt": 100.0,
+            "mots_cles": ["python"], "presence_mots_cles": False}
+
+
+@pytest.fixture
+def rapports(tmp_path):
+    base = BaseRapports(str(tmp_path / "rapports.sqlite"))
+    yield base
+    base.fermer()
+
+
+def test_pages_paginees_et_triees(rapports):
+    audit = rapports.nouvel_audit("https://exemple.fr/", {"python"})
+    for i, nb in enumerate([3, 1, 2, 1]):
+        rapports.ajouter_page(audit, resume(f"https://exemple.fr/{i}", nb), 1)
+    assert [page["url"][-1] for page in rapports.pages(audit, 1, 2)] == ["1", "2"]
+    # À valeur égale, l'ordre d'arrivée est conservé.
+    assert [page["url"][-1] for page in rapports.pages(audit, 0, 10, tri="nb_liens_internes")] == ["1", "3", "2", "0"]
+    assert [page["url"][-1] for page in rapports.pages(audit, 0, 2, tri="nb_liens_internes", decroissant=True)] \
+        == ["0", "2"]
+    with pytest.raises(ValueError):
+        rapports.pages(audit, tri="url; DROP TABLE pages")
+
+
+def test_cibles_enregistrees_et_exportees(rapports):
+    detecteur = DetecteurCibles(["audit seo", "python"])
+    resultat = {"url": "https://exemple.fr/a", "liens": [], "percent_alt": 0,
+                "mots_cles": {"site": 4, "web": 3, "page": 2, "python": 1},
+                "cibles": detecteur.analyser("un audit seo du site web", titre="Audit SEO")}
+    resume_page = UrlAudit.resumer_page(resultat, {"python"})
+    # La présence reste celle d'un mot-clé de l'utilisateur parmi les 3 premiers mots-clés.
+    assert resume_page["presence_mots_cles"] is False
+    assert resume_page["nb_cibles_trouvees"] == 1
+    audit = rapports.nouvel_audit("https://exemple.fr/", {"python"})
+    rapports.ajouter_page(audit, resume_page, 1)
+    page, = rapports.pages(audit)
+    assert page["nb_cibles_trouvees"] == 1
+    assert page["cibles"] == resume_page["cibles"]
+    assert page["cibles"]["audit seo"]["dans_titre"] is True
+    csv, html = io.StringIO(), io.StringIO()
+    rapports.exporter_csv(audit, csv)
+    rapports.exporter_html(audit, html)
+    assert '""occurrences"": 1' in csv.getvalue()
+    assert "audit seo : 1 (33.33 %) (titre)" in html.getvalue()
+    export = io.StringIO()
+    rapports.exporter_json(audit, export)
+    assert json.loads(export.getvalue())["pages"][0]["cibles"]["python"]["occurrences"] == 0
+
+
+def test_base_existante_completee(tmp_path):
+    chemin = str(tmp_path / "ancienne.sqlite")
+    with sqlite3.connect(chemin) as connexion:
+        connexion.execute(
+            "CREATE TABLE pages (id INTEGER PRIMARY KEY, audit INTEGER, url TEXT, profondeur INTEGER, "
+            "nb_liens_internes INTEGER, nb_liens_externes INTEGER, percent_alt REAL, mots_cles TEXT, "
+            "presence_mots_cles INTEGER)"
+        )
+        connexion.execute("INSERT INTO pages (audit, url, mots_cles, presence_mots_cles) VALUES (1, 'a', '[]', 1)")
+    connexion.close()
+    base = BaseRapports(chemin)
+    try:
+        page, = base.pages(1)
+        assert page["presence_mots_cles"] is True
+        assert page["nb_cibles_trouvees"] is None and page["cibles"] is None
+    finally:
+        base.fermer()
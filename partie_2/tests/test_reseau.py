@@ -0,0 +1,68 @@
+"""
+Tests du client HTTP requests (nouvelles tentatives, taille maximale) et du choix du client des pages.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+pytest.importorskip("requests")
+
+import projet
+import reseau
+from reponses import ErreurRecuperation, ReponseTropGrande
+###################################################################
+
+PAGE = (200, {"Content-Type": "text/html; charset=utf-8"}, "<p>été</p>".encode("utf-8"))
+INDISPONIBLE = (503, {"Retry-After": "0"}, b"")
+
+
+def creer_client(**options):
+    return reseau.ClientHttp(cache=None, delai_base=0.01, **options)
+
+
+def test_503_retente_puis_page(serveur_http):
+    serveur = serveur_http({"/": [INDISPONIBLE, INDISPONIBLE, PAGE]})
+    reponse = creer_client().recuperer_page(serveur.url("/"))
+    assert reponse.html == "<p>été</p>"
+    assert serveur.nb_requetes["/"] == 3
+
+
+def test_echec_apres_toutes_les_tentatives(serveur_http):
+    serveur = serveur_http({"/": [INDISPONIBLE]})
+    with pytest.raises(ErreurRecuperation) as erreur:
+        creer_client(nb_tentatives=2).recuperer_page(serveur.url("/"))
+    assert erreur.value.statut == 503
+    assert serveur.nb_requetes["/"] == 2
+
+
+def test_404_sans_nouvelle_tentative(serveur_http):
+    serveur = serveur_http({})
+    with pytest.raises(ErreurRecuperation):
+        creer_client().recuperer_page(serveur.url("/absente"))
+    assert serveur.nb_requetes["/absente"] == 1
+
+
+def test_taille_maximale(serveur_http):
+    # Taille annoncée par Content-Length, puis corps sans taille annoncée lu jusqu'à la fermeture.
+    serveur = serveur_http({"/annoncee": [(200, {}, b"x" * 100)],
+                            "/recue": [(200, {"Content-Length": None, "Connection": "close"}, b"x" * 100)]})
+    client = creer_client(taille_max=10)
+    for chemin in ("/annoncee", "/recue"):
+        with pytest.raises(ReponseTropGrande):
+            client.recuperer_page(serveur.url(chemin))
+        assert serveur.nb_requetes[chemin] == 1
+
+
+def test_choix_du_moteur(monkeypatch):
+    monkeypatch.setattr(projet, "_moteur", projet._moteur)
+    monkeypatch.setattr(projet, "_recuperer", None)
+    monkeypatch.setattr(projet, "_recuperer_plusieurs", None)
+    monkeypatch.setattr(reseau, "_client", None)
+    with pytest.raises(ValueError):
+        projet.configurer_reseau("curl")
+    with pytest.raises(TypeError):
+        projet.configurer_reseau("requests", taille_pool=4)
+    projet.configurer_reseau("requests", cache=None, nb_tentatives=2)
+    assert projet.recuperateur_plusieurs() is None
+    assert reseau.client_partage().nb_tentatives == 2
@@ -0,0 +1,44 @@
+"""
+Tests de la sélection des mots-clés par tas (texte.TextAnalyser.selectionner_mots_cles) :
+mêmes mots-clés, dans le même ordre, que le tri complet des occurrences, égalités comprises.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+import random
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import pytest
+
+from texte import TextAnalyser
+###################################################################
+
+PARASITES = {"le", "la", "de"}
+
+
+def tri_complet(texte, parasites, k):
+    """
+    Sélection d'origine : tri de toutes les occurrences, retrait des parasites puis k premiers mots.
+    """
+    occurrences = TextAnalyser.retirer_parasites(TextAnalyser.compter_occurrences(texte), parasites)
+    return dict(list(occurrences.items())[:k])
+
+
+@pytest.mark.parametrize("graine", range(20))
+@pytest.mark.parametrize("k", [1, 3, 10, 100])
+def test_identique_au_tri_complet(graine, k):
+    generateur = random.Random(graine)
+    # Peu de mots distincts et des fréquences proches : beaucoup d'égalités.
+    vocabulaire = [f"mot{i}" for i in range(generateur.randint(1, 30))] + sorted(PARASITES)
+    texte = " ".join(generateur.choice(vocabulaire) for _ in range(generateur.randint(0, 200)))
+    attendu = tri_complet(texte, PARASITES, k)
+    assert list(TextAnalyser.extraire_mots_cles(texte, PARASITES, k).items()) == list(attendu.items())
+    occurrences = TextAnalyser.compter_occurrences(texte)
+    assert list(TextAnalyser.selectionner_mots_cles(occurrences, PARASITES, k).items()) == list(attendu.items())
+
+
+def test_egalites_dans_l_ordre_d_apparition():
+    texte = "zèbre avion le le le zèbre avion maison"
+    assert list(TextAnalyser.extraire_mots_cles(texte, PARASITES, 2)) == ["zèbre", "avion"]
+    assert list(TextAnalyser.selectionner_mots_cles({"b": 1, "a": 1, "c": 2}, k=3)) == ["c", "b", "a"]
@@ -0,0 +1,127 @@
+"""
+Analyse du texte des pages : comptage des mots et sélection des mots-clés.
+
+Module léger, sans dépendance externe : il peut être importé (ligne de commande, tests,
+processus d'analyse) sans charger requests ni l'analyseur HTML (voir projet).
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from collections import Counter
+import csv
+import heapq
+from itertools import filterfalse
+from operator import itemgetter
+import re
+###################################################################
+###################################################################
+# IMPORT SPECIFIQUE
+import instrumentation
+###################################################################
+
+# Découpage du texte en mots, partagé par toutes les analyses (projet, extraction, cibles).
+MOTIF_MOT = re.compile(r'\b\w+\b')
+
+
+class TextAnalyser:
+    @staticmethod
+    def compter_mots(texte, parasites=frozenset()):
+        """
+        Compte les occurrences de chaque mot dans un texte, sans les trier. 
+        Les mots parasites sont écartés dès le découpage du texte.
+
+        Args:
+            texte (str): Le texte à analyser.
+            parasites (set): Un ensemble de mots (en minuscules) à ne pas compter.
+
+        Returns:
+            Counter: Le nombre d'occurrences de chaque mot.
+        """
+        mots = MOTIF_MOT.findall(texte.lower())
+        if parasites:
+            return Counter(filterfalse(parasites.__contains__, mots))
+        return Counter(mots)
+
+
+    @staticmethod
+    def selectionner_mots_cles(occurrences, parasites=frozenset(), k=3):
+        """
+        Retourne les k mots les plus fréquents d'un dictionnaire d'occurrences, hors mots parasites. 
+        Sélection partielle par tas : le dictionnaire complet n'est jamais trié. 
+        À nombre d'occurrences égal, l'ordre du dictionnaire est conservé, 
+        comme avec compter_occurrences puis retirer_parasites.
+
+        Args:
+            occurrences (dict): Un dictionnaire d'occurrences de mots.
+            parasites (set): Un ensemble de mots à exclure.
+            k (int): Le nombre de mots-clés à retourner.
+
+        Returns:
+            dict: Les k mots-clés et leur nombre d'occurrences, du plus fréquent au moins fréquent.
+        """
+        candidats = ((mot, nb) for mot, nb in occurrences.items() if mot not in parasites)
+        return dict(heapq.nlargest(k, candidats, key=itemgetter(1)))
+
+
+    @staticmethod
+    def extraire_mots_cles(texte, parasites, k=3):
+        """
+        Retourne les k mots-clés les plus fréquents d'un texte, hors mots parasites.
+
+        Args:
+            texte (str): Le texte à analyser.
+            parasites (set): Un ensemble de mots (en minuscules) à exclure.
+            k (int): Le nombre de mots-clés à retourner.
+
+        Returns:
+            dict: Les k mots-clés et leur nombre d'occurrences, du plus fréquent au moins fréquent.
+        """
+        return TextAnalyser.selectionner_mots_cles(TextAnalyser.compter_mots(texte, parasites), k=k)
+
+
+    @staticmethod
+    @instrumentation.chronometre("compter_occurrences")
+    def compter_occurrences(texte):
+        """
+        Compte les occurrences de chaque mot dans un texte.
+
+        Args:
+            texte (str): Le texte à analyser.
+
+        Returns:
+            dict: Un dictionnaire où les clés sont des mots et les valeurs sont le nombre d'occurrences de chaque mot.
+        """
+        return dict(TextAnalyser.compter_mots(texte).most_common())
+
+
+    @staticmethod
+    @instrumentation.chronometre("retirer_parasites")
+    def retirer_parasites(occurrences, parasites):
+        """
+        Retire les mots parasites d'un dictionnaire d'occurrences.
+
+        Args:
+            occurrences (dict): Un dictionnaire d'occurrences de mots (en minuscules).
+            parasites (set): Un ensemble de mots à exclure.
+
+        Returns:
+            dict: Un dictionnaire d'occurrences nettoyé des mots parasites.
+        """
+        return {mot: nb for mot, nb in occurrences.items() if mot not in parasites}
+
+
+    @staticmethod
+    def recuperer_parasites(fichier):
+        """
+        Récupère une liste de mots parasites à partir d'un fichier CSV.
+
+        Args:
+            fichier (str): Le chemin du fichier CSV contenant les mots parasites.
+
+        Returns:
+            set: Un ensemble de mots parasites.
+        """
+        with open(fichier, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            mots_parasites = {row[0].lower() for row in reader if row}
+        return mots_parasites
@@ -0,0 +1,37 @@
+"""
+Outils de manipulation d'URL partagés par le cache HTTP et l'audit.
+"""
+# -*- coding:utf-8 -*-
+###################################################################
+# IMPORTS STANDARDS
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+###################################################################
+
+PORTS_PAR_DEFAUT = {"http": 80, "https": 443}
+
+
+def normaliser_url(url):
+    """
+    Met une URL sous une forme canonique pour pouvoir la comparer ou l'utiliser comme clé :
+    schéma et hôte en minuscules, port par défaut retiré, chemin vide remplacé par "/",
+    fragment supprimé et paramètres de requête triés.
+
+    Args:
+        url (str): L'URL absolue à normaliser.
+
+    Returns:
+        str: L'URL normalisée.
+    """
+    morceaux = urlsplit(url.strip())
+    schema = morceaux.scheme.lower()
+    hote = (morceaux.hostname or "").rstrip(".")
+    if ":" in hote:
+        hote = f"[{hote}]"
+    if morceaux.port and morceaux.port != PORTS_PAR_DEFAUT.get(schema):
+        hote = f"{hote}:{morceaux.port}"
+    if morceaux.username:
+        identifiants = morceaux.username + (f":{morceaux.password}" if morceaux.password else "")
+        hote = f"{identifiants}@{hote}"
+    chemin = morceaux.path or "/"
+    requete = urlencode(sorted(parse_qsl(morceaux.query, keep_blank_values=True)))
+    return urlunsplit((schema, hote, chemin, requete, ""))